@@ -10,6 +10,8 @@ from discord.ext import commands
 from discord import app_commands
 from internal import utils
 from internal import command_router
+from internal import lazy_import
+from internal import http_client
 
 # Copyright (c) 2026 Dennis Plischke.
 # All rights reserved.
@@ -72,6 +74,9 @@ def run_discord_bot():
     except Exception as e:
         logging.warning(f"Failed to setup slash commands: {e}")
     
+    # Keeps references to fire-and-forget tasks started from events
+    background_tasks: set[asyncio.Task] = set()
+
     # Component Tests
     async def run_component_tests():
         try:
@@ -98,6 +103,9 @@ def run_discord_bot():
         except Exception as e:
             logging.error(f"Error running component tests: {e}", exc_info=True)
             print("⚠️ Component tests failed\n")
+        finally:
+            # The tests run in their own event loop, the bot creates a new session later
+            await http_client.close()
     
     try:
         asyncio.run(run_component_tests())
@@ -138,11 +146,58 @@ def run_discord_bot():
         except discord.InteractionResponded:
             pass
 
+    # Import a module in a thread so the event loop keeps running meanwhile
+    async def load_module(name: str):
+        return await asyncio.to_thread(lazy_import.load, name)
+
+    # Background services started after on_ready; their modules are imported off the event loop
+    async def start_background_services():
+        # Start calculator worker processes (imports sympy in the background)
+        try:
+            calculator_sandbox = await load_module("internal.command_modules.calculator_sandbox")
+            calculator_sandbox.start_pool()
+        except Exception as e:
+            logging.error(f"Failed to start calculator pool: {e}")
+
+        # Start voice supervisor (idle disconnect and ffmpeg reaper)
+        try:
+            player = await load_module("internal.command_modules.music.player")
+            player.start_supervisor(bot)
+        except Exception as e:
+            logging.error(f"Failed to start voice supervisor: {e}")
+
+        # Keep the local exoplanet snapshot current (downloads it on first start)
+        try:
+            exoplanet_catalog = await load_module("internal.command_modules.exoplanet_catalog")
+            exoplanet_catalog.start_refresh()
+        except Exception as e:
+            logging.error(f"Failed to start exoplanet catalogue refresh: {e}")
+
+        # Prefetch the daily NASA content so the first request of the day is answered from cache
+        try:
+            sciencecific_commands = await load_module("internal.command_modules.sciencecific_commands")
+            sciencecific_commands.start_prefetch()
+        except Exception as e:
+            logging.error(f"Failed to start NASA prefetch: {e}")
+
+        # Import the remaining command modules and heavy dependencies in the background
+        try:
+            await command_router.warm_up()
+        except Exception as e:
+            logging.error(f"Module warm-up failed: {e}")
+
+        # Component tests of the modules that were not loaded yet at startup
+        try:
+            await command_router.deferred_component_tests()
+        except Exception as e:
+            logging.error(f"Deferred component tests failed: {e}")
+
     @bot.event
     async def on_ready():
         try:
             duration = time.perf_counter() - start
             logging.info(f"Bot ready after {duration:.2f} seconds.")
+            logging.info(f"Startup imports: {lazy_import.format_import_report()}")
             print()
             logging.info(f'{bot.user} is now running!')
             print()
@@ -218,6 +273,20 @@ def run_discord_bot():
         except Exception as e:
             logging.error(f"Error loading bot status: {e}")
 
+        # Open the shared HTTP session (keep-alive connections for all API calls)
+        try:
+            await http_client.start()
+        except Exception as e:
+            logging.error(f"Failed to open shared HTTP session: {e}")
+
+        # Start the background services and the module warm-up without blocking on their imports
+        try:
+            services_task = asyncio.create_task(start_background_services())
+            background_tasks.add(services_task)
+            services_task.add_done_callback(background_tasks.discard)
+        except Exception as e:
+            logging.error(f"Failed to start background services: {e}")
+
     @bot.event
     async def on_message(message):
         # Check to prevent bot responding to itself
@@ -0,0 +1,172 @@
+import sys
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Cache.py
+# Description: Small in-memory caches shared by the command modules
+# ================================================================
+
+# ----------------------------------------------------------------
+# LRU Cache
+# ----------------------------------------------------------------
+
+_MISSING = object()
+
+def _default_sizeof(key: Any, value: Any) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+class LRUCache:
+    # Least-recently-used cache bounded by entry count and (approximate) bytes
+    def __init__(self, max_entries: int, max_bytes: int | None = None, ttl: float | None = None,
+                 sizeof: Callable[[Any, Any], int] = _default_sizeof):
+        # max_entries: Maximum number of cached entries
+        # max_bytes: Maximum total size of all entries (None = unbounded)
+        # ttl: Seconds an entry stays valid (None = until evicted)
+        # sizeof: Returns the size of a (key, value) pair in bytes
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+
+        self._data: OrderedDict[Hashable, tuple[Any, int, float | None]] = OrderedDict()  # key -> (value, size, expires), oldest first
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._data.pop(key)
+        self.total_bytes -= size
+
+    def _evict(self):
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            _, (_, size, _) = self._data.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, _, expires = entry
+            if expires is not None and time.monotonic() >= expires:
+                self._remove(key)
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        size = self.sizeof(key, value)
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            # Entries larger than the whole budget are not cached at all
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, size, expires)
+            self.total_bytes += size
+            self._evict()
+
+    # Value without counting a hit or miss or changing the LRU order (expired entries count as missing)
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or (entry[2] is not None and time.monotonic() >= entry[2]):
+                return default
+            return entry[0]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.total_bytes = 0
+
+    # Snapshot of all entries that have not expired, oldest first
+    def items(self) -> list[tuple[Hashable, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, _, expires) in self._data.items()
+                if expires is None or now < expires
+            ]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and (entry[2] is None or time.monotonic() < entry[2])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # Cache statistics for component tests and logs
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+# ----------------------------------------------------------------
+# Request Coalescing
+# ----------------------------------------------------------------
+
+class SingleFlight:
+    # Concurrent calls for the same key share one running request (asyncio, event loop only)
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+        else:
+            self.calls += 1
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        # Shielded: one cancelled caller must not cancel the request for the others
+        return await asyncio.shield(future)
+
+    def _finished(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
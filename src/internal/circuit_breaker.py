@@ -0,0 +1,225 @@
+import time
+import asyncio
+import logging
+import aiohttp
+from collections import deque
+from typing import Any
+from internal import utils
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Circuit_breaker.py
+# Description: Circuit breakers for the external APIs (closed / open / half-open)
+# A failing API is skipped right away instead of every command waiting for its timeout
+# ================================================================
+
+# ----------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------
+
+# Optional "circuit_breaker" section in config.json
+BREAKER_CONFIG = utils.get_config_value("circuit_breaker", default={}) or {}
+
+FAILURE_WINDOW = float(BREAKER_CONFIG.get("window", 60))  # Seconds of request outcomes that are considered
+MIN_REQUESTS = int(BREAKER_CONFIG.get("min_requests", 3))  # Fewer requests in the window never open the circuit
+FAILURE_RATE = float(BREAKER_CONFIG.get("failure_rate", 0.5))  # Share of failed requests that opens the circuit
+OPEN_SECONDS = float(BREAKER_CONFIG.get("open_seconds", 30))  # First pause before a test request
+MAX_OPEN_SECONDS = float(BREAKER_CONFIG.get("max_open_seconds", 600))  # Pause doubles per failed test request up to this
+
+# Hostname -> API name shown in messages and /api-status
+SERVICES = {
+    "api.nasa.gov": "NASA API",
+    "exoplanetarchive.ipac.caltech.edu": "NASA Exoplanet Archive",
+    "api.openweathermap.org": "OpenWeatherMap",
+    "catfact.ninja": "catfact.ninja",
+    "api.dictionaryapi.dev": "dictionaryapi.dev",
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# ----------------------------------------------------------------
+# Circuit Breaker
+# ----------------------------------------------------------------
+
+# Raised instead of sending a request while the circuit is open
+# A ClientConnectionError, so existing aiohttp error handling covers it
+class CircuitOpen(aiohttp.ClientConnectionError):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is currently unavailable, retrying in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    # Opens when the failure rate within the window is too high; after a pause one test
+    # request is let through (half-open) and decides whether the circuit closes again
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.outcomes: deque[tuple[float, bool]] = deque()  # (time, succeeded), oldest first
+        self.opened_at = 0.0
+        self.open_seconds = OPEN_SECONDS
+        self.probe_running = False
+        self.rejected = 0
+        self.last_error = ""
+
+    def _trim(self, now: float):
+        while self.outcomes and now - self.outcomes[0][0] > FAILURE_WINDOW:
+            self.outcomes.popleft()
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    # Called before every request; raises CircuitOpen when it must not be sent
+    def before_request(self):
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN and self.retry_after() <= 0:
+            self.state = HALF_OPEN
+            self.probe_running = False
+            logging.info(f"Circuit for {self.name} half-open, sending a test request")
+        if self.state == HALF_OPEN and not self.probe_running:
+            self.probe_running = True
+            return
+        self.rejected += 1
+        raise CircuitOpen(self.name, self.retry_after())
+
+    def record_success(self):
+        now = time.monotonic()
+        if self.state != CLOSED:
+            logging.info(f"Circuit for {self.name} closed, API is responding again")
+            self.state = CLOSED
+            self.open_seconds = OPEN_SECONDS
+            self.outcomes.clear()
+            self.probe_running = False
+        self.outcomes.append((now, True))
+        self._trim(now)
+
+    def record_failure(self, error: str):
+        now = time.monotonic()
+        self.last_error = error
+        if self.state == HALF_OPEN:
+            # Test request failed: stay away longer
+            self.open_seconds = min(self.open_seconds * 2, MAX_OPEN_SECONDS)
+            self._open(now)
+            return
+        if self.state == OPEN:
+            return
+        self.outcomes.append((now, False))
+        self._trim(now)
+        failures = sum(1 for _, succeeded in self.outcomes if not succeeded)
+        if len(self.outcomes) >= MIN_REQUESTS and failures / len(self.outcomes) >= FAILURE_RATE:
+            self._open(now)
+
+    # Request ended without a result (cancelled); let the next request test the API
+    def record_cancelled(self):
+        if self.state == HALF_OPEN:
+            self.probe_running = False
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.probe_running = False
+        logging.warning(f"Circuit for {self.name} opened for {self.open_seconds:.0f}s ({self.last_error})")
+
+    def stats(self) -> dict[str, Any]:
+        self._trim(time.monotonic())
+        failures = sum(1 for _, succeeded in self.outcomes if not succeeded)
+        return {
+            "state": self.state,
+            "requests": len(self.outcomes),
+            "failures": failures,
+            "rejected": self.rejected,
+            "retry_after": self.retry_after() if self.state == OPEN else 0.0,
+            "last_error": self.last_error,
+        }
+
+# ----------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------
+
+BREAKERS: dict[str, CircuitBreaker] = {}
+
+def get_breaker(name: str) -> CircuitBreaker:
+    breaker = BREAKERS.get(name)
+    if breaker is None:
+        breaker = BREAKERS[name] = CircuitBreaker(name)
+    return breaker
+
+# Breaker of a request's host (None for hosts that are not tracked, e.g. Discord's CDN)
+def breaker_for_host(host: str | None) -> CircuitBreaker | None:
+    name = SERVICES.get(host or "")
+    return get_breaker(name) if name else None
+
+# ----------------------------------------------------------------
+# aiohttp Integration
+# ----------------------------------------------------------------
+
+# Request hooks for the shared HTTP session: every API call is checked and recorded
+async def _on_request_start(session, context, params: aiohttp.TraceRequestStartParams):
+    breaker = breaker_for_host(params.url.host)
+    context.breaker = breaker
+    if breaker is not None:
+        breaker.before_request()
+
+async def _on_request_end(session, context, params: aiohttp.TraceRequestEndParams):
+    breaker = getattr(context, "breaker", None)
+    if breaker is None:
+        return
+    # Client errors (401, 404, ...) mean the API itself is up
+    if params.response.status >= 500:
+        breaker.record_failure(f"HTTP {params.response.status}")
+    else:
+        breaker.record_success()
+
+async def _on_request_exception(session, context, params: aiohttp.TraceRequestExceptionParams):
+    breaker = getattr(context, "breaker", None)
+    if breaker is None or isinstance(params.exception, CircuitOpen):
+        return
+    # Cancelled requests (e.g. the !sun deadline or shutdown) say nothing about the API
+    if isinstance(params.exception, asyncio.CancelledError):
+        breaker.record_cancelled()
+        return
+    breaker.record_failure(type(params.exception).__name__)
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+    return trace_config
+
+# ----------------------------------------------------------------
+# Status Report
+# ----------------------------------------------------------------
+
+STATE_ICONS = {CLOSED: "🟢", HALF_OPEN: "🟡", OPEN: "🔴"}
+
+# One line per API, also for APIs that have not been used yet
+def format_status() -> list[tuple[str, str]]:
+    lines = []
+    for name in SERVICES.values():
+        stats = get_breaker(name).stats()
+        text = f"{STATE_ICONS[stats['state']]} {stats['state']} | {stats['failures']}/{stats['requests']} failed in the last {FAILURE_WINDOW:.0f}s"
+        if stats["state"] == OPEN:
+            text += f" | retry in {stats['retry_after']:.0f}s"
+        if stats["rejected"]:
+            text += f" | {stats['rejected']} request(s) skipped"
+        if stats["last_error"] and stats["state"] != CLOSED:
+            text += f" | last error: {stats['last_error']}"
+        lines.append((name, text))
+    return lines
+
+def component_test() -> dict[str, str]:
+    states = [get_breaker(name).state for name in SERVICES.values()]
+    if OPEN in states:
+        status = "🟥"
+    elif HALF_OPEN in states:
+        status = "🟨"
+    else:
+        status = "🟩"
+    summary = ", ".join(f"{name}: {get_breaker(name).state}" for name in SERVICES.values())
+    return {"status": status, "msg": f"Circuit breakers: {summary}"}
@@ -1,13 +1,17 @@
 import discord
 import math
+import operator
 import re
+import io
+import csv
+import string
 import logging
-import sympy
 import asyncio
 import time
-from sympy import solve, symbols, parse_expr, sympify, Number
-from typing import Tuple, Optional, Dict, Any
-from internal import rate_limiter
+from typing import Tuple, Optional, Dict, Any, NamedTuple, Callable
+from internal import rate_limiter, utils, lazy_import
+from internal.cache import LRUCache
+from internal.command_modules import calculator_sandbox, calculator_plot
 
 # Copyright (c) 2026 Dennis Plischke.
 # All rights reserved.
@@ -28,6 +32,26 @@ CALCULATION_TIMEOUT = 5.0  # Seconds
 MAX_VARIABLES_IN_EQUATION = 10
 MAX_EQUATION_COMPLEXITY = 100  # Maximum number of operations
 
+# Optional "calculator" section in config.json
+CALC_CONFIG = utils.get_config_value("calculator", default={}) or {}
+
+# Results of repeated expressions (homework answers, unit conversions, ...)
+RESULT_CACHE = LRUCache(
+    max_entries=int(CALC_CONFIG.get("result_cache_entries", 1024)),
+    max_bytes=int(CALC_CONFIG.get("result_cache_bytes", 262144)),
+)
+
+# Rendered plots (PNG bytes) by normalised expression and range
+PLOT_CACHE = LRUCache(
+    max_entries=int(CALC_CONFIG.get("plot_cache_entries", 64)),
+    max_bytes=int(CALC_CONFIG.get("plot_cache_bytes", 8388608)),
+)
+
+# sympy takes 1-2 s to import on the Pi, so it is loaded on first use
+# (the worker processes import it while starting, see calculator_sandbox)
+def _sympy():
+    return lazy_import.load("sympy")
+
 # Custom calculator exception
 class CalculatorError(Exception):
     pass
@@ -44,6 +68,22 @@ def component_test():
     status = "🟩"
     messages = ["Calculator module loaded."]
     
+    # Calculator process pool
+    stats = calculator_sandbox.get_pool_stats()
+    if stats["started"]:
+        messages.append(f"Worker pool: {stats['workers']}/{calculator_sandbox.POOL_SIZE} processes, {stats['timeouts']} timeout(s), {stats['rejected']} rejected")
+        if stats["workers"] < calculator_sandbox.POOL_SIZE:
+            status = "🟧"
+    else:
+        messages.append("Worker pool not started yet.")
+    
+    # Result cache
+    cache_stats = RESULT_CACHE.stats()
+    messages.append(f"Result cache: {cache_stats['entries']} entries, {cache_stats['hit_rate']:.0%} hit rate")
+    plot_stats = PLOT_CACHE.stats()
+    messages.append(f"Plot cache: {plot_stats['entries']} plots, {plot_stats['bytes'] / 1048576:.1f} MB")
+    messages.append(f"'ans' store: {len(LAST_RESULT)}/{ANS_MAX_USERS} users")
+    
     return {"status": status, "msg": " | ".join(messages)}
 
 # ----------------------------------------------------------------
@@ -51,94 +91,258 @@ def component_test():
 # ----------------------------------------------------------------
 
 # Store last result for 'ans' functionality
-LAST_RESULT: Dict[int, Any] = {}
+# Bounded and expiring; results are kept as short strings, optionally persisted across restarts
+ANS_TTL = float(CALC_CONFIG.get("ans_ttl", 86400))
+ANS_MAX_USERS = int(CALC_CONFIG.get("ans_max_users", 5000))
+ANS_MAX_LENGTH = 200  # Longer results (large symbolic expressions) are not kept
+ANS_PERSIST = bool(CALC_CONFIG.get("ans_persist", False))
+ANS_FILE = "calculator_ans.json"
+ANS_SAVE_INTERVAL = 60.0
 
-# Check expression complexity to prevent DoS
-def check_expression_complexity(expression: str) -> Tuple[bool, str]:
-    try:
-        # Check nesting depth (parentheses, brackets, braces)
-        max_depth = 0
-        current_depth = 0
-        for char in expression:
-            if char in '([{':
-                current_depth += 1
-                max_depth = max(max_depth, current_depth)
-            elif char in ')]}':
-                current_depth -= 1
-        
-        MAX_NESTING_DEPTH = 10
-        if max_depth > MAX_NESTING_DEPTH:
-            logging.warning(f"Expression nesting too deep: {max_depth} (max {MAX_NESTING_DEPTH})")
-            return False, f"Expression nesting too deep (max {MAX_NESTING_DEPTH} levels)"
-        
-        # Count operations to prevent DoS
-        operation_count = (
-            expression.count('+') + expression.count('-') +
-            expression.count('*') + expression.count('/') +
-            expression.count('^') + expression.count('**') +
-            expression.count('(') + expression.count('[')
-        )
-        
-        MAX_OPERATIONS = 50
-        if operation_count > MAX_OPERATIONS:
-            logging.warning(f"Too many operations: {operation_count} (max {MAX_OPERATIONS})")
-            return False, f"Expression too complex (max {MAX_OPERATIONS} operations)"
-        
-        return True, ""
-    
-    except Exception as e:
-        logging.error(f"Error in check_expression_complexity: {str(e)}")
-        return False, "Could not validate expression complexity"
+LAST_RESULT = LRUCache(max_entries=ANS_MAX_USERS, ttl=ANS_TTL)  # user id -> (result, stored at wall-clock time)
+_ans_loaded = False
+_ans_dirty = False
+_ans_last_save = 0.0
 
-# Validate variable names against whitelist
-def validate_variable_names(expression: str) -> Tuple[bool, str]:
-    try:
-        # Extract all identifiers (variable/function names)
-        # Pattern: word characters, but exclude numbers at start
-        identifier_pattern = r'\b([a-zA-Z_]\w*)\b'
-        found_identifiers = set(re.findall(identifier_pattern, expression))
-        
-        # Remove known safe identifiers
-        safe_identifiers = set(SAFE_FUNCTIONS.keys()) | {'ans', 'x', 'y', 'z', 'n', 'i', 'j', 'k'}
-        
-        # Check for unknown identifiers
-        unknown_identifiers = found_identifiers - safe_identifiers
-        
-        if unknown_identifiers:
-            logging.warning(f"Unknown identifiers detected: {unknown_identifiers}")
-            return False, f"Unknown identifiers: {', '.join(list(unknown_identifiers)[:3])}"
-        
-        return True, ""
-    
-    except Exception as e:
-        logging.error(f"Error in validate_variable_names: {str(e)}")
-        return False, "Could not validate variable names"
+_ans_load_lock = asyncio.Lock()
+
+# Read persisted results that are still valid (runs in a thread): [(user id, entry, ttl)]
+def _read_last_results() -> list[tuple[int, tuple[str, float], float]]:
+    now = time.time()
+    entries = []
+    for user_id, entry in utils.load_json_file(ANS_FILE).items():
+        try:
+            result, stored_at = str(entry[0]), float(entry[1])
+            remaining = ANS_TTL - (now - stored_at)
+            if remaining > 0:
+                entries.append((int(user_id), (result, stored_at), remaining))
+        except (TypeError, ValueError, IndexError):
+            continue
+    return entries
+
+# Restore persisted results (lazily, so calculator workers never read the file)
+# The file is read in a thread, LAST_RESULT is only filled on the event loop (not thread-safe)
+async def _load_last_results():
+    global _ans_loaded
+    async with _ans_load_lock:
+        if _ans_loaded:
+            return
+        entries = await asyncio.to_thread(_read_last_results) if ANS_PERSIST else []
+        for user_id, entry, ttl in entries:
+            LAST_RESULT.set(user_id, entry, ttl=ttl)
+        _ans_loaded = True
+    logging.debug(f"Restored {len(entries)} 'ans' result(s)")
+
+async def get_last_result(user_id: int) -> Optional[str]:
+    if not _ans_loaded:
+        await _load_last_results()
+    entry = LAST_RESULT.get(user_id)
+    return entry[0] if entry else None
+
+async def set_last_result(user_id: int, result: Any):
+    global _ans_dirty
+    if not _ans_loaded:
+        await _load_last_results()
+
+    text = str(result)
+    if len(text) > ANS_MAX_LENGTH:
+        # Do not let 'ans' silently refer to an older result
+        LAST_RESULT.pop(user_id)
+    else:
+        LAST_RESULT.set(user_id, (text, time.time()))
+    _ans_dirty = True
+    await _save_last_results_async()
 
-# Validate function calls against whitelist
-def validate_function_calls(expression: str) -> Tuple[bool, str]:
+def _ans_snapshot() -> dict:
+    return {str(user_id): [result, stored_at] for user_id, (result, stored_at) in LAST_RESULT.items()}
+
+def _write_last_results(data: dict) -> bool:
     try:
-        # Extract function calls: identifier followed by (
-        function_pattern = r'([a-zA-Z_]\w*)\s*\('
-        found_functions = set(re.findall(function_pattern, expression))
-        
-        # Get allowed functions from SAFE_FUNCTIONS
-        allowed_functions = set(SAFE_FUNCTIONS.keys())
-        
-        # Check for disallowed functions
-        disallowed = found_functions - allowed_functions
-        
-        if disallowed:
-            logging.warning(f"Disallowed functions detected: {disallowed}")
-            return False, f"Function(s) not allowed: {', '.join(list(disallowed)[:3])}"
-        
-        return True, ""
-    
+        utils.save_json_file(data, ANS_FILE)
+        return True
     except Exception as e:
-        logging.error(f"Error in validate_function_calls: {str(e)}")
-        return False, "Could not validate function calls"
+        logging.error(f"Failed to save 'ans' results: {e}")
+        return False
+
+# Write results to disk synchronously (shutdown and restart)
+def save_last_results(force: bool = False):
+    global _ans_dirty, _ans_last_save
+    if not ANS_PERSIST or not _ans_dirty:
+        return
+    now = time.monotonic()
+    if not force and now - _ans_last_save < ANS_SAVE_INTERVAL:
+        return
+    if _write_last_results(_ans_snapshot()):
+        _ans_dirty = False
+        _ans_last_save = now
+
+# Write results at most every ANS_SAVE_INTERVAL seconds; the snapshot is taken on the
+# event loop, the JSON is written in a thread
+async def _save_last_results_async():
+    global _ans_dirty, _ans_last_save
+    now = time.monotonic()
+    if not ANS_PERSIST or not _ans_dirty or now - _ans_last_save < ANS_SAVE_INTERVAL:
+        return
+    _ans_last_save = now
+    _ans_dirty = False  # Results stored during the write mark it dirty again
+    if not await asyncio.to_thread(_write_last_results, _ans_snapshot()):
+        _ans_dirty = True
+
+# Persist 'ans' results and stop the worker pool (shutdown/restart)
+def shutdown_calculator():
+    save_last_results(force=True)
+    calculator_sandbox.shutdown_pool()
+
+# Cache key for an expression (whitespace differences do not change the result)
+def normalize_expression(expression: str) -> str:
+    return ' '.join(expression.split())
+
+# Limits enforced while tokenizing (they also bound the size of the parsed expression)
+MAX_NESTING_DEPTH = 10
+MAX_OPERATIONS = 50
+
+# Token produced by tokenize_expression
+class Token(NamedTuple):
+    kind: str  # num, name, str, op, open, close, comma
+    value: str
+
+DIGITS = frozenset("0123456789")  # str.isdigit() would also accept '²'
+IDENT_START = frozenset(string.ascii_letters + "_")
+IDENT_CHARS = IDENT_START | DIGITS
+WHITESPACE = frozenset(" \t\r\n")
+QUOTES = frozenset("'\"")
+
+TWO_CHAR_OPERATORS = frozenset({"**", "==", "!=", "<=", ">="})
+ONE_CHAR_OPERATORS = frozenset("+-*/^%=<>!×·÷±∓²³⁴⁵⁶⁷⁸⁹")
+# Operators counted towards MAX_OPERATIONS (together with opening brackets)
+COUNTED_OPERATORS = frozenset({"+", "-", "*", "/", "^", "**", "×", "·", "÷", "±", "∓"})
+# Unicode symbols that replace_special_characters turns into names (√ -> sqrt, π -> pi, ...)
+SYMBOL_NAMES = frozenset("√∛∜πτ∞ℯ∑∏∆")
+
+BRACKETS = {"(": ")", "[": "]", "{": "}"}
+CLOSING_BRACKETS = {")": "(", "]": "[", "}": "{"}
+BRACKET_NAMES = {"(": "parentheses", "[": "brackets", "{": "braces"}
+
+# Names that may be used as plain variables besides SAFE_FUNCTIONS
+ALLOWED_VARIABLES = frozenset({'ans', 'x', 'y', 'z', 'n', 'i', 'j', 'k'})
+
+# Check a name against the whitelist (function calls must be SAFE_FUNCTIONS)
+def _check_name(name: str, is_call: bool):
+    if is_call:
+        if name not in SAFE_FUNCTIONS:
+            raise SecurityError(f"Function not allowed: {name[:30]}")
+    elif name not in SAFE_FUNCTIONS and name not in ALLOWED_VARIABLES:
+        raise SecurityError(f"Unknown identifier: {name[:30]}")
+
+# Single-pass lexer: splits the expression into tokens and enforces the character and
+# name whitelist, bracket balance, nesting depth and operation count in one scan.
+# validate=False skips the name whitelist (used on already validated, replaced expressions)
+def tokenize_expression(expression: str, validate: bool = True, in_string: bool = False) -> list[Token]:
+    tokens: list[Token] = []
+    stack: list[str] = []
+    operations = 0
+    length = len(expression)
+    i = 0
+
+    while i < length:
+        ch = expression[i]
+
+        if ch in WHITESPACE:
+            i += 1
+
+        # Numbers: 12, 1.5, .5, 1e-3, 1_000
+        elif ch in DIGITS or (ch == "." and i + 1 < length and expression[i + 1] in DIGITS):
+            start = i
+            while i < length and (expression[i] in DIGITS or (expression[i] == "_" and i + 1 < length and expression[i + 1] in DIGITS)):
+                i += 1
+            if i < length and expression[i] == ".":
+                i += 1
+                while i < length and expression[i] in DIGITS:
+                    i += 1
+            if i < length and expression[i] in "eE":
+                j = i + 1
+                if j < length and expression[j] in "+-":
+                    j += 1
+                if j < length and expression[j] in DIGITS:
+                    i = j
+                    while i < length and expression[i] in DIGITS:
+                        i += 1
+            tokens.append(Token("num", expression[start:i]))
+
+        # Names: functions, constants and variables
+        elif ch in IDENT_START:
+            start = i
+            while i < length and expression[i] in IDENT_CHARS:
+                i += 1
+            name = expression[start:i]
+            if validate:
+                j = i
+                while j < length and expression[j] in WHITESPACE:
+                    j += 1
+                _check_name(name, j < length and expression[j] == "(")
+            tokens.append(Token("name", name))
+
+        elif ch in SYMBOL_NAMES:
+            tokens.append(Token("name", ch))
+            i += 1
 
+        # Strings are parsed by sympy as well (sum('n**2', 1, 5)), so their content follows the same rules
+        elif ch in QUOTES:
+            if in_string:
+                raise SecurityError("Nested strings are not allowed")
+            end = expression.find(ch, i + 1)
+            if end == -1:
+                raise SecurityError("Unterminated string")
+            content = expression[i + 1:end]
+            inner = tokenize_expression(content, validate=validate, in_string=True)
+            operations += sum(1 for token in inner if token.kind == "open" or (token.kind == "op" and token.value in COUNTED_OPERATORS))
+            if operations > MAX_OPERATIONS:
+                raise SecurityError(f"Expression too complex (max {MAX_OPERATIONS} operations)")
+            tokens.append(Token("str", content))
+            i = end + 1
 
-# Replaces special characters with Python-compatible ones and check for invalid patterns
+        elif ch in BRACKETS:
+            stack.append(ch)
+            if len(stack) > MAX_NESTING_DEPTH:
+                raise SecurityError(f"Expression nesting too deep (max {MAX_NESTING_DEPTH} levels)")
+            operations += 1
+            if operations > MAX_OPERATIONS:
+                raise SecurityError(f"Expression too complex (max {MAX_OPERATIONS} operations)")
+            tokens.append(Token("open", ch))
+            i += 1
+
+        elif ch in CLOSING_BRACKETS:
+            opening = CLOSING_BRACKETS[ch]
+            if not stack or stack[-1] != opening:
+                raise SecurityError(f"Unbalanced {BRACKET_NAMES[opening]}")
+            stack.pop()
+            tokens.append(Token("close", ch))
+            i += 1
+
+        elif ch == ",":
+            tokens.append(Token("comma", ch))
+            i += 1
+
+        elif expression[i:i + 2] in TWO_CHAR_OPERATORS or ch in ONE_CHAR_OPERATORS:
+            op = expression[i:i + 2] if expression[i:i + 2] in TWO_CHAR_OPERATORS else ch
+            if op in COUNTED_OPERATORS:
+                operations += 1
+                if operations > MAX_OPERATIONS:
+                    raise SecurityError(f"Expression too complex (max {MAX_OPERATIONS} operations)")
+            tokens.append(Token("op", op))
+            i += len(op)
+
+        elif ch == ".":
+            raise SecurityError("Attribute access is not allowed")
+
+        else:
+            raise SecurityError(f"Character not allowed: {ch!r}")
+
+    if stack:
+        raise SecurityError(f"Unbalanced {BRACKET_NAMES[stack[-1]]}")
+    return tokens
+
+# Checks length and null bytes, then validates the expression with the tokenizer
 def is_safe_expression(expression: str) -> Tuple[bool, str]:
     if not expression or len(expression) == 0:
         return False, "Expression cannot be empty"
@@ -150,131 +354,349 @@ def is_safe_expression(expression: str) -> Tuple[bool, str]:
     if '\x00' in expression:
         return False, "Expression contains null bytes"
     
-    # Normalize whitespace and convert to lowercase for pattern matching
-    normalized = ' '.join(expression.split()).lower()
-    
-    # ========== LAYER 1: BLACKLIST DANGEROUS PATTERNS ==========
-    dangerous_patterns = [
-        # Code execution
-        r'\b__import__\b',
-        r'\beval\b',
-        r'\bexec\b',
-        r'\bcompile\b',
-        r'\bglobals\b',
-        r'\blocals\b',
-        r'\bvars\b',
-        r'\bdir\b',
-        r'\bgetattr\b',
-        r'\bsetattr\b',
-        r'\bhasattr\b',
-        r'\bdelattr\b',
-        
-        # Module imports
-        r'\bimport\s',
-        r'\bfrom\s',
-        
-        # File/System operations
-        r'\bopen\b',
-        r'\bfile\b',
-        r'\bos\.',
-        r'\bsys\.',
-        r'\bsubprocess\b',
-        r'\bpathlib\b',
-        
-        # Object/Class manipulation
-        r'__[a-z]+__',  # Dunder methods
-        r'\.__bases__',
-        r'\.__class__',
-        r'\.__dict__',
-        r'\.__code__',
-        r'\.__globals__',
-        
-        # Dangerous builtins
-        r'\bexecfile\b',
-        r'\binput\b',
-        r'\braw_input\b',
-        r'\breload\b',
-        
-        # Lambda abuse
-        r'lambda\s+.*:.*import',
-    ]
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, normalized):
-            logging.warning(f"Dangerous pattern detected: {pattern}")
-            return False, "Expression contains forbidden keywords or patterns"
-    
-    # Check for suspicious character sequences
-    suspicious_sequences = [
-        '\\\\',  # Escaped backslashes
-        '\\x',   # Hex escapes
-        '\\u',   # Unicode escapes
-    ]
-    
-    for sequence in suspicious_sequences:
-        if sequence in expression:
-            logging.warning(f"Suspicious sequence detected: {sequence}")
-            return False, "Expression contains suspicious escape sequences"
-    
-    # ========== LAYER 2: CHECK COMPLEXITY ==========
-    is_valid, error_msg = check_expression_complexity(expression)
-    if not is_valid:
-        return False, error_msg
-    
-    # ========== LAYER 3: VALIDATE FUNCTION CALLS (WHITELIST) ==========
-    is_valid, error_msg = validate_function_calls(expression)
-    if not is_valid:
-        return False, error_msg
-    
-    # ========== LAYER 4: VALIDATE VARIABLE NAMES (WHITELIST) ==========
-    is_valid, error_msg = validate_variable_names(expression)
-    if not is_valid:
-        return False, error_msg
-    
-    # ========== LAYER 5: CHECK BALANCED BRACKETS ==========
-    if expression.count('(') != expression.count(')'):
-        return False, "Unbalanced parentheses"
-    
-    if expression.count('[') != expression.count(']'):
-        return False, "Unbalanced brackets"
-    
-    if expression.count('{') != expression.count('}'):
-        return False, "Unbalanced braces"
+    try:
+        tokenize_expression(expression)
+    except SecurityError as e:
+        logging.warning(f"Expression rejected: {e}")
+        return False, str(e)
     
     return True, ""
 
-# Calculate with timeout protection
-async def calculate_with_timeout(expression: str) -> str:
+# ----------------------------------------------------------------
+# FAST PATH EVALUATOR
+# ----------------------------------------------------------------
+
+# Plain arithmetic and math.* calls are evaluated here in microseconds; anything
+# else (symbols, strings, solvers, exact arithmetic) is left to sympy in the worker pool
+MAX_AST_NODES = 256
+MAX_FAST_INT_BITS = 4096  # Larger integer powers are left to sympy
+MAX_FAST_FUNCTION_ARG = 1000  # Bigger factorial/comb/perm/gamma arguments are left to sympy
+
+# Functions that need sympy (symbolic or string arguments) or return text
+SYMPY_ONLY_FUNCTIONS = frozenset({'sum', 'prod', 'solve', 'solve_system', 'pq', 'quad'})
+GUARDED_FUNCTIONS = frozenset({'factorial', 'comb', 'perm', 'gamma'})
+
+# Raised when an expression cannot be handled by the fast path
+class FastPathUnsupported(CalculatorError):
+    pass
+
+def _safe_pow(base, exponent):
+    # Exact integer powers grow without bound, refuse before computing them
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if max(base.bit_length(), 1) * exponent > MAX_FAST_INT_BITS:
+            raise FastPathUnsupported("Integer power too large")
+    return base ** exponent
+
+def _safe_round(number, ndigits=None):
+    # round(5, -9**300) computes 10**(9**300) and never returns, bound the digit count
+    if ndigits is not None and abs(ndigits) > MAX_FAST_FUNCTION_ARG:
+        raise FastPathUnsupported("Too many digits for fast round")
+    return round(number, ndigits)
+
+# Fast path replacements for SAFE_FUNCTIONS entries that need a guard
+FAST_FUNCTIONS = {
+    'round': _safe_round,
+}
+
+BINARY_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+    "**": _safe_pow,
+}
+
+# Recursive-descent parser that compiles tokens straight into closures (Python operator precedence)
+class _ExpressionParser:
+    def __init__(self, tokens: list[Token], variables: frozenset[str]):
+        self.tokens = tokens
+        self.variables = variables
+        self.pos = 0
+        self.nodes = 0
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _peek_op(self, *ops: str) -> Optional[str]:
+        token = self._peek()
+        if token is not None and token.kind == "op" and token.value in ops:
+            return token.value
+        return None
+
+    def _expect(self, kind: str, value: str):
+        token = self._peek()
+        if token is None or token.kind != kind or token.value != value:
+            raise FastPathUnsupported(f"Expected '{value}'")
+        self.pos += 1
+
+    def _node(self, func: Callable) -> Callable:
+        self.nodes += 1
+        if self.nodes > MAX_AST_NODES:
+            raise FastPathUnsupported("Expression too large")
+        return func
+
+    def _binary(self, op: str, left: Callable, right: Callable) -> Callable:
+        func = BINARY_OPERATORS[op]
+        return self._node(lambda env: func(left(env), right(env)))
+
+    def parse(self) -> Callable:
+        func = self._sum()
+        if self._peek() is not None:
+            raise FastPathUnsupported(f"Unsupported token: {self._peek().value}")
+        return func
+
+    # sum := term (('+' | '-') term)*
+    def _sum(self) -> Callable:
+        left = self._term()
+        while (op := self._peek_op("+", "-")):
+            self.pos += 1
+            left = self._binary(op, left, self._term())
+        return left
+
+    # term := unary (('*' | '/' | '%') unary)*
+    def _term(self) -> Callable:
+        left = self._unary()
+        while (op := self._peek_op("*", "/", "%")):
+            self.pos += 1
+            left = self._binary(op, left, self._unary())
+        return left
+
+    # unary := ('+' | '-') unary | power
+    def _unary(self) -> Callable:
+        op = self._peek_op("+", "-")
+        if op:
+            self.pos += 1
+            operand = self._unary()
+            if op == "-":
+                return self._node(lambda env: -operand(env))
+            return operand
+        return self._power()
+
+    # power := primary ('**' unary)?   (right associative, -2**2 == -4)
+    def _power(self) -> Callable:
+        base = self._primary()
+        if self._peek_op("**"):
+            self.pos += 1
+            return self._binary("**", base, self._unary())
+        return base
+
+    # primary := number | name | name '(' args ')' | '(' sum ')'
+    def _primary(self) -> Callable:
+        token = self._peek()
+        if token is None:
+            raise FastPathUnsupported("Unexpected end of expression")
+        self.pos += 1
+
+        if token.kind == "num":
+            text = token.value.replace("_", "")
+            value = int(text) if text.isdigit() else float(text)
+            return self._node(lambda env: value)
+
+        if token.kind == "open" and token.value == "(":
+            inner = self._sum()
+            self._expect("close", ")")
+            return inner
+
+        if token.kind == "name":
+            name = token.value
+            next_token = self._peek()
+            if next_token is not None and next_token.kind == "open" and next_token.value == "(":
+                return self._call(name)
+            if name in self.variables:
+                return self._node(lambda env: env[name])
+            constant = SAFE_FUNCTIONS.get(name)
+            if isinstance(constant, (int, float)) and not isinstance(constant, bool):
+                return self._node(lambda env: constant)
+            raise FastPathUnsupported(f"Symbolic name: {name}")
+
+        raise FastPathUnsupported(f"Unsupported token: {token.value}")
+
+    def _call(self, name: str) -> Callable:
+        func = FAST_FUNCTIONS.get(name, SAFE_FUNCTIONS.get(name))
+        if name in SYMPY_ONLY_FUNCTIONS or not callable(func):
+            raise FastPathUnsupported(f"Function needs sympy: {name}")
+
+        self._expect("open", "(")
+        args = [self._sum()]
+        while (token := self._peek()) is not None and token.kind == "comma":
+            self.pos += 1
+            args.append(self._sum())
+        self._expect("close", ")")
+
+        guarded = name in GUARDED_FUNCTIONS
+
+        def call(env):
+            values = [arg(env) for arg in args]
+            if guarded and any(abs(value) > MAX_FAST_FUNCTION_ARG for value in values):
+                raise FastPathUnsupported(f"Argument too large for fast {name}")
+            return func(*values)
+
+        return self._node(call)
+
+# Compile an expression (after replace_special_characters) into a function of the given variables
+# Raises FastPathUnsupported (or SecurityError) if the fast path cannot handle it
+def compile_expression(expression: str, variables: tuple[str, ...] = ()) -> Callable[[Dict[str, float]], Any]:
+    tokens = tokenize_expression(expression, validate=False)
+    return _ExpressionParser(tokens, frozenset(variables)).parse()
+
+# Evaluate an expression natively; returns the formatted result or None to fall back to sympy
+def fast_evaluate(expression: str) -> Optional[str]:
     try:
-        # Run calculation in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        result = await asyncio.wait_for(
-            loop.run_in_executor(
-                None, 
-                lambda: sympify(expression, locals=SAFE_FUNCTIONS)
-            ),
-            timeout=CALCULATION_TIMEOUT
+        value = compile_expression(expression)({})
+    except Exception:
+        # Unsupported syntax, math domain errors, ... -> sympy decides (and reports errors)
+        return None
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None  # e.g. complex results of negative bases
+    try:
+        number = float(value)
+    except OverflowError:
+        return None
+    if not math.isfinite(number):
+        return None
+    return format_number(number)
+
+# Evaluate and format an expression (runs inside a calculator worker process)
+def evaluate_expression(expression: str) -> str:
+    sympy = _sympy()
+    try:
+        result = sympy.sympify(expression, locals=SAFE_FUNCTIONS)
+    except sympy.SympifyError as e:
+        # Reported as CalculatorError so the bot process never has to unpickle sympy classes
+        logging.warning(f"Sympy parsing error: {str(e)}")
+        raise CalculatorError(f"Invalid mathematical expression: {str(e)}")
+    
+    # Format the result
+    try:
+        if isinstance(result, (int, float, sympy.Number)):
+            return format_number(float(result))
+        return str(result)
+    except (ValueError, TypeError) as e:
+        logging.error(f"Error formatting result: {str(e)}")
+        return str(result)
+
+# Convert a computed value to a finite float, None for undefined/complex/infinite results
+def _to_real(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return number if math.isfinite(number) else None
+
+# sympy counterparts of the SAFE_FUNCTIONS that only accept numbers (math.*), so an expression
+# can be sympified once with its variable as a Symbol
+def _symbolic_functions() -> Dict[str, Any]:
+    sympy = _sympy()
+    return {
+        'sqrt': sympy.sqrt, 'ln': sympy.log, 'exp': sympy.exp,
+        'log': lambda x: sympy.log(x, 10), 'log2': lambda x: sympy.log(x, 2),
+        'sin': sympy.sin, 'cos': sympy.cos, 'tan': sympy.tan,
+        'asin': sympy.asin, 'acos': sympy.acos, 'atan': sympy.atan,
+        'sinh': sympy.sinh, 'cosh': sympy.cosh, 'tanh': sympy.tanh,
+        'pow': sympy.Pow, 'factorial': sympy.factorial, 'abs': sympy.Abs,
+        'floor': sympy.floor, 'ceil': sympy.ceiling,
+        'pi': sympy.pi, 'e': sympy.E, 'tau': 2 * sympy.pi, 'inf': sympy.oo,
+    }
+
+# Evaluate an expression for many values of one variable (runs inside a calculator worker process)
+# The expression is sympified once and compiled to an mpmath function for all points
+def tabulate_expression(expression: str, variable: str, points: list) -> list:
+    sympy = _sympy()
+    symbol = sympy.Symbol(variable)
+    try:
+        compiled = sympy.sympify(expression, locals={**SAFE_FUNCTIONS, **_symbolic_functions(), variable: symbol})
+        func = sympy.lambdify(symbol, compiled, modules="mpmath")
+    except Exception:
+        # e.g. sum('n^2', 1, x) needs a number for x
+        return _tabulate_per_point(expression, variable, points)
+
+    values = []
+    for point in points:
+        try:
+            values.append(_to_real(func(point)))
+        except Exception:
+            values.append(None)
+    return values
+
+# Fallback: substitute every point into the expression and sympify it again
+def _tabulate_per_point(expression: str, variable: str, points: list) -> list:
+    sympify = _sympy().sympify
+    tokens = tokenize_expression(expression, validate=False)
+    values = []
+    for point in points:
+        substituted = " ".join(
+            f"({point!r})" if token.kind == "name" and token.value == variable
+            else f"'{token.value}'" if token.kind == "str"
+            else token.value
+            for token in tokens
         )
-        
-        # Format the result
         try:
-            if isinstance(result, (int, float, Number)):
-                return format_number(float(result))
-            return str(result)
-        except (ValueError, TypeError) as e:
-            logging.error(f"Error formatting result: {str(e)}")
-            return str(result)
+            values.append(_to_real(sympify(substituted, locals=SAFE_FUNCTIONS)))
+        except Exception:
+            values.append(None)
+    return values
+
+# Compile the expression once and evaluate it natively for every point;
+# None when it needs sympy (undefined points become None values)
+def sample_expression(expression: str, variable: str, points: list) -> Optional[list]:
+    try:
+        func = compile_expression(expression, (variable,))
+        values = []
+        env: Dict[str, float] = {}
+        for point in points:
+            env[variable] = point
+            try:
+                values.append(_to_real(func(env)))
+            except FastPathUnsupported:
+                raise
+            except (ArithmeticError, ValueError, TypeError):
+                values.append(None)  # e.g. outside the domain of ln/sqrt
+        return values
+    except CalculatorError:
+        return None
+
+# Sample and render a plot as PNG (runs inside a calculator worker process)
+def plot_expression(expression: str, variable: str, start: float, end: float) -> bytes:
+    points = calculator_plot.sample_points(start, end)
+    values = sample_expression(expression, variable, points)
+    if values is None:
+        # sympy is far slower per point, use fewer samples
+        points = calculator_plot.sample_points(start, end, PLOT_SYMPY_SAMPLES)
+        values = tabulate_expression(expression, variable, points)
+    if all(value is None for value in values):
+        raise CalculatorError("The expression has no real values in this range")
+    return calculator_plot.render_plot(points, values)
+
+# Calculate with timeout protection
+# task: "evaluate_expression" for plain expressions, "solve_equation" for solve(...),
+# "tabulate_expression" for tables (args: variable, points), "plot_expression" for plots (args: variable, start, end)
+async def calculate_with_timeout(expression: str, task: str = "evaluate_expression", *args: Any) -> Any:
+    try:
+        # Run calculation in the calculator process pool (killed and replaced on timeout)
+        return await calculator_sandbox.run_task(task, expression, *args, timeout=CALCULATION_TIMEOUT)
         
     # Error handling
-    except asyncio.TimeoutError:
+    except CalculatorError:
+        raise  # Already user-friendly (raised by the solvers inside the worker)
+    except calculator_sandbox.SandboxBusy as e:
+        logging.warning(f"Calculator overloaded, rejected: {expression[:50]}")
+        raise CalculatorError(str(e))
+    except (calculator_sandbox.SandboxTimeout, asyncio.TimeoutError):
         logging.warning(f"Calculation timeout for expression: {expression[:50]}")
         raise CalculatorError(f"Calculation timed out (exceeded {CALCULATION_TIMEOUT}s)")
+    except calculator_sandbox.SandboxError as e:
+        logging.error(f"Calculator sandbox error: {str(e)}")
+        raise CalculatorError("Calculation failed, please try again")
+    except MemoryError:
+        logging.warning(f"Memory limit hit for expression: {expression[:50]}")
+        raise CalculatorError("Calculation needs too much memory")
     except ZeroDivisionError:
         logging.warning(f"Zero division in expression: {expression[:50]}")
         raise CalculatorError("Cannot divide by zero")
-    except sympy.SympifyError as e:
-        logging.warning(f"Sympy parsing error: {str(e)}")
-        raise CalculatorError(f"Invalid mathematical expression: {str(e)}")
     except ValueError as e:
         logging.warning(f"Value error in calculation: {str(e)}")
         raise CalculatorError(f"Invalid value: {str(e)}")
@@ -336,7 +758,8 @@ def solve_equation(equation_str: str) -> str:
             raise CalculatorError("Invalid equation format")
         
         # Define x
-        x = symbols('x')
+        sympy = _sympy()
+        x = sympy.symbols('x')
         
         # Remove quotes if present
         equation_str = equation_str.strip('"\'')
@@ -349,13 +772,13 @@ def solve_equation(equation_str: str) -> str:
         
         # Parse and solve the equation
         try:
-            expr = sympify(equation_str)
+            expr = sympy.sympify(equation_str)
         except sympy.SympifyError as e:
             logging.error(f"Invalid equation syntax: {str(e)}")
             raise CalculatorError(f"Invalid equation format: {str(e)}")
         
-        # Solve with timeout
-        solutions = solve(expr, x)
+        # Solve (time-limited by the calculator worker this runs in)
+        solutions = sympy.solve(expr, x)
 
         if not solutions:
             return "No valid solutions found!"
@@ -378,9 +801,11 @@ def solve_equation(equation_str: str) -> str:
     # Error handling
     except CalculatorError:
         raise
-    except sympy.SympifyError as e:
+    except _sympy().SympifyError as e:
         logging.error(f"Sympy error in solve_equation: {str(e)}")
         raise CalculatorError(f"Invalid equation: {str(e)}")
+    except (calculator_sandbox.SandboxError, MemoryError):
+        raise  # CPU/memory limit of the worker, reported by calculate_with_timeout
     except Exception as e:
         logging.error(f"Unexpected error in solve_equation: {str(e)}", exc_info=True)
         raise CalculatorError(f"Failed to solve equation: {str(e)}")
@@ -395,6 +820,7 @@ def solve_equation_system(equations: list) -> str:
             raise CalculatorError(f"Too many equations (max {MAX_VARIABLES_IN_EQUATION})")
         
         # Parse the equations
+        sympy = _sympy()
         parsed_equations = []
         for eq in equations:
             if not eq or len(eq) > MAX_EXPRESSION_LENGTH:
@@ -412,7 +838,7 @@ def solve_equation_system(equations: list) -> str:
                 eq = f"({lhs}) - ({rhs})"
             
             try:
-                parsed_equations.append(sympify(eq))
+                parsed_equations.append(sympy.sympify(eq))
             except sympy.SympifyError as e:
                 logging.error(f"Invalid equation: {eq}")
                 raise CalculatorError(f"Invalid equation: {str(e)}")
@@ -422,10 +848,10 @@ def solve_equation_system(equations: list) -> str:
         if len(all_vars) == 0:
             raise CalculatorError("No variables found in equations")
         
-        variables = symbols(' '.join(sorted(all_vars)))
+        variables = sympy.symbols(' '.join(sorted(all_vars)))
 
-        # Solve the system
-        solutions = solve(parsed_equations, variables)
+        # Solve the system (time-limited by the calculator worker this runs in)
+        solutions = sympy.solve(parsed_equations, variables)
 
         if not solutions:
             return "No solution found!"
@@ -444,6 +870,8 @@ def solve_equation_system(equations: list) -> str:
     except ValueError as e:
         logging.error(f"Value error in solve_equation_system: {str(e)}")
         raise CalculatorError(f"Cannot solve system: {str(e)}")
+    except (calculator_sandbox.SandboxError, MemoryError):
+        raise  # CPU/memory limit of the worker, reported by calculate_with_timeout
     except Exception as e:
         logging.error(f"Unexpected error in solve_equation_system: {str(e)}", exc_info=True)
         raise CalculatorError(f"Failed to solve system: {str(e)}")
@@ -491,8 +919,8 @@ SAFE_FUNCTIONS = {
     'inf': math.inf,
     
     # Summation and product functions
-    'sum': lambda expr, start, end: sum(sympify(expr).subs('n', i) for i in range(start, end + 1)),
-    'prod': lambda expr, start, end: math.prod(sympify(expr).subs('n', i) for i in range(start, end + 1)),
+    'sum': lambda expr, start, end: sum(_sympy().sympify(expr).subs('n', i) for i in range(start, end + 1)),
+    'prod': lambda expr, start, end: math.prod(_sympy().sympify(expr).subs('n', i) for i in range(start, end + 1)),
     
     # Unit conversions
     
@@ -618,9 +1046,6 @@ SAFE_FUNCTIONS = {
     'GB_to_TB': lambda x: x / 1000,
     'TB_to_GB': lambda x: x * 1000,
 
-    # SymPy functions
-    'solve': solve,
-
     # Additional safe functions
     'solve': solve_equation,
     'pq': lambda p, q: solve_pq(p, q),
@@ -644,8 +1069,10 @@ def format_error(error):
         ValueError: "Invalid input",
         SyntaxError: "Invalid expression syntax",
         CalculatorError: str(error),
-        sympy.SympifyError: "Invalid mathematical expression"
     }
+    # Checked by name so formatting an error does not import sympy
+    if type(error).__name__ == "SympifyError":
+        return "Invalid mathematical expression"
     return error_mapping.get(type(error), str(error))
 
 # ----------------------------------------------------------------
@@ -683,6 +1110,30 @@ async def handle_calc_command(client, message, user_message: str) -> Optional[st
                 return "❌ Failed to send help message."
             return None
 
+        # Table mode: one compiled expression evaluated over a whole range
+        if expression.startswith("table "):
+            try:
+                await process_table(message, expression[6:])
+            except discord.Forbidden:
+                logging.error(f"No permission to send embed in channel {message.channel.id}")
+                return "❌ I don't have permission to send messages here."
+            except discord.HTTPException as e:
+                logging.error(f"Failed to send table embed: {e}")
+                return "❌ Failed to send result."
+            return None
+
+        # Plot mode: sampled and rendered to PNG in the worker pool
+        if expression.startswith("plot "):
+            try:
+                await process_plot(message, expression[5:])
+            except discord.Forbidden:
+                logging.error(f"No permission to send embed in channel {message.channel.id}")
+                return "❌ I don't have permission to send messages here."
+            except discord.HTTPException as e:
+                logging.error(f"Failed to send plot embed: {e}")
+                return "❌ Failed to send result."
+            return None
+
         result = await process_calculation(message, expression)
         if result is not None:
             try:
@@ -710,14 +1161,23 @@ async def process_calculation(message, expression: str) -> Optional[str]:
     try:
         # Check for previous result
         if 'ans' in expression:
-            if message.author.id not in LAST_RESULT:
+            last_result = await get_last_result(message.author.id)
+            if last_result is None:
                 try:
                     await message.channel.send("❌ No previous calculation found. Cannot use 'ans'.")
                 except discord.Forbidden:
                     logging.error(f"No permission to send message in channel {message.channel.id}")
                 return None
-            expression = expression.replace('ans', str(LAST_RESULT[message.author.id]))
-            logging.debug(f"Replaced 'ans' with: {LAST_RESULT[message.author.id]}")
+            expression = expression.replace('ans', last_result)
+            logging.debug(f"Replaced 'ans' with: {last_result}")
+
+        # Repeated expression: only validated expressions end up in the cache
+        cache_key = normalize_expression(expression)
+        cached = RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            await set_last_result(message.author.id, cached)
+            logging.debug(f"Calculation served from cache: {cache_key[:50]}")
+            return cached
 
         # Safety checks
         is_safe, error_msg = is_safe_expression(expression)
@@ -736,12 +1196,15 @@ async def process_calculation(message, expression: str) -> Optional[str]:
         if expression.startswith("solve(") and expression.endswith(")"):
             # Extract the equation inside solve()
             equation = expression[6:-1].strip()
-            result = solve_equation(equation)
+            result = await calculate_with_timeout(equation, task="solve_equation")
         else:
-            # Calculate with timeout
-            result = await calculate_with_timeout(expression)
+            # Plain arithmetic is evaluated natively, everything else by sympy (with timeout)
+            result = fast_evaluate(expression)
+            if result is None:
+                result = await calculate_with_timeout(expression)
 
-        LAST_RESULT[message.author.id] = result
+        RESULT_CACHE.set(cache_key, result)
+        await set_last_result(message.author.id, result)
         
         calc_duration = time.time() - calc_start
         logging.debug(f"Calculation processed in {calc_duration:.2f} seconds.")
@@ -831,6 +1294,8 @@ async def send_help_message(message) -> None:
             "  - Summation: sum(expr, start, end)\n"
             "  - Product: prod(expr, start, end)\n"
             "  - Unit conversion: c_to_f(x), km_to_mi(x)\n"
+            "  - Value table: table f(x) x=start..end step s\n"
+            "  - Function plot: plot f(x) x=start..end\n"
             "\n**Examples:**\n"
             "• `!calc 2 + 2`\n"
             "• `!calc sin(45) + cos(30)`\n"
@@ -840,7 +1305,9 @@ async def send_help_message(message) -> None:
             "• `!calc ans + 5`\n"
             "• `!calc solve_system(['x + y = 5', 'x - y = 1'])`\n"
             "• `!calc sum('n**2', 1, 5)`\n"
-            "• `!calc c_to_f(20)`"
+            "• `!calc c_to_f(20)`\n"
+            "• `!calc table x^2 + 1 x=0..10 step 1`\n"
+            "• `!calc plot sin(x) x=-2*pi..2*pi`"
         )
         await message.channel.send(help_msg)
         logging.debug(f"Help message sent to {message.author} in {message.channel}")
@@ -855,6 +1322,185 @@ async def send_help_message(message) -> None:
         logging.error(f"Unexpected error in send_help_message: {str(e)}", exc_info=True)
         raise
 
+# ----------------------------------------------------------------
+# TABLE MODE (!calc table <expression> x=<start>..<end> [step <step>])
+# ----------------------------------------------------------------
+
+TABLE_MAX_POINTS = 200
+TABLE_DEFAULT_POINTS = 11
+TABLE_EMBED_ROWS = 25  # Longer tables are attached as CSV
+TABLE_VARIABLES = frozenset({'x', 'y', 'z', 'n', 'i', 'j', 'k'})
+TABLE_PATTERN = re.compile(r'^(?P<expr>.+?)\s+(?P<var>[a-z])\s*=\s*(?P<range>\S+?)(?:\s+step\s+(?P<step>\S+))?\s*$')
+TABLE_USAGE = "Usage: `!calc table <expression> x=<start>..<end> [step <step>]`"
+
+# Parse a range value like "0", "-1.5" or "2*pi"
+def _parse_table_bound(text: str) -> float:
+    is_safe, error_msg = is_safe_expression(text)
+    if not is_safe:
+        raise CalculatorError(f"Invalid range value '{text[:20]}': {error_msg}")
+    try:
+        value = float(compile_expression(replace_special_characters(text))({}))
+    except Exception:
+        raise CalculatorError(f"Invalid range value: {text[:20]}")
+    if not math.isfinite(value):
+        raise CalculatorError(f"Invalid range value: {text[:20]}")
+    return value
+
+# Split the table arguments into expression, variable and the list of points
+def parse_table_arguments(arguments: str) -> Tuple[str, str, list]:
+    match = TABLE_PATTERN.match(arguments.strip())
+    if not match:
+        raise CalculatorError(TABLE_USAGE)
+
+    variable = match["var"]
+    if variable not in TABLE_VARIABLES:
+        raise CalculatorError(f"Variable must be one of: {', '.join(sorted(TABLE_VARIABLES))}")
+
+    start_text, separator, end_text = match["range"].partition("..")
+    if not separator or not start_text or not end_text:
+        raise CalculatorError(TABLE_USAGE)
+    start, end = _parse_table_bound(start_text), _parse_table_bound(end_text)
+    if end < start:
+        raise CalculatorError("The range end must not be smaller than its start")
+
+    if match["step"]:
+        step = _parse_table_bound(match["step"])
+        if step <= 0:
+            raise CalculatorError("Step must be greater than 0")
+        count = int((end - start) / step + 1e-9) + 1
+    else:
+        count = TABLE_DEFAULT_POINTS if end > start else 1
+        step = (end - start) / (count - 1) if count > 1 else 0.0
+
+    if count > TABLE_MAX_POINTS:
+        raise CalculatorError(f"Too many values ({count}, max {TABLE_MAX_POINTS}). Use a larger step.")
+
+    # start + k * step avoids the rounding drift of repeated additions
+    points = [start + k * step for k in range(count)]
+    return match["expr"].strip(), variable, points
+
+# Evaluate the expression over all points: compiled once natively, sympy in the worker pool otherwise
+async def calculate_table(expression: str, variable: str, points: list) -> list:
+    values = sample_expression(expression, variable, points)
+    if values is not None:
+        return values
+    return await calculate_with_timeout(expression, "tabulate_expression", variable, points)
+
+def _format_table_value(value: Optional[float]) -> str:
+    return "undefined" if value is None else f"{value:.6g}"
+
+# Sends the table as an embed, long tables additionally as CSV attachment
+async def send_table_result(message, expression: str, variable: str, points: list, values: list) -> None:
+    rows = [(_format_table_value(point), _format_table_value(value)) for point, value in zip(points, values)]
+    width = max(len(variable), *(len(row[0]) for row in rows))
+    lines = [f"{variable:>{width}} | f({variable})", f"{'-' * width}-+-{'-' * 12}"]
+    lines += [f"{x:>{width}} | {y}" for x, y in rows[:TABLE_EMBED_ROWS]]
+
+    embed = discord.Embed(
+        title="🔢 Calculator - Table",
+        description="```\n" + "\n".join(lines) + "\n```",
+        color=discord.Color.blue()
+    )
+    embed.add_field(name="Expression", value=f"**{expression}**", inline=False)
+
+    file = None
+    if len(rows) > TABLE_EMBED_ROWS:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([variable, expression])
+        writer.writerows([repr(point), "" if value is None else repr(value)] for point, value in zip(points, values))
+        file = discord.File(io.BytesIO(buffer.getvalue().encode("utf-8")), filename="table.csv")
+        embed.set_footer(text=f"Showing {TABLE_EMBED_ROWS} of {len(rows)} values, the full table is attached as CSV.")
+    else:
+        embed.set_footer(text=f"{len(rows)} values")
+
+    if file:
+        await message.channel.send(embed=embed, file=file)
+    else:
+        await message.channel.send(embed=embed)
+    logging.debug(f"Calculation table sent for {message.author}: {expression} ({len(rows)} values)")
+
+# Handles '!calc table ...'; raises CalculatorError with a user-facing message on invalid input
+async def process_table(message, arguments: str) -> None:
+    expression, variable, points = parse_table_arguments(arguments)
+
+    is_safe, error_msg = is_safe_expression(expression)
+    if not is_safe:
+        raise CalculatorError(error_msg)
+
+    replaced = replace_special_characters(expression)
+    values = await calculate_table(replaced, variable, points)
+    await send_table_result(message, expression, variable, points, values)
+
+# ----------------------------------------------------------------
+# PLOT MODE (!calc plot <expression> [x=<start>..<end>])
+# ----------------------------------------------------------------
+
+PLOT_DEFAULT_RANGE = (-10.0, 10.0)
+PLOT_MAX_SPAN = 1e6
+PLOT_SYMPY_SAMPLES = 160  # Samples when the expression needs sympy (one sympify per point)
+PLOT_PATTERN = re.compile(r'^(?P<expr>.+?)(?:\s+(?P<var>[a-z])\s*=\s*(?P<start>\S+?)\.\.(?P<end>\S+))?\s*$')
+PLOT_USAGE = "Usage: `!calc plot <expression> x=<start>..<end>`"
+
+# Split the plot arguments into expression, variable and range
+def parse_plot_arguments(arguments: str) -> Tuple[str, str, float, float]:
+    match = PLOT_PATTERN.match(arguments.strip())
+    if not match or not match["expr"].strip():
+        raise CalculatorError(PLOT_USAGE)
+
+    variable = match["var"] or "x"
+    if variable not in TABLE_VARIABLES:
+        raise CalculatorError(f"Variable must be one of: {', '.join(sorted(TABLE_VARIABLES))}")
+
+    if match["start"] is None:
+        start, end = PLOT_DEFAULT_RANGE
+    else:
+        start, end = _parse_table_bound(match["start"]), _parse_table_bound(match["end"])
+    if end <= start:
+        raise CalculatorError("The range end must be greater than its start")
+    if end - start > PLOT_MAX_SPAN:
+        raise CalculatorError(f"Range too large (max width {PLOT_MAX_SPAN:g})")
+
+    return match["expr"].strip(), variable, start, end
+
+# Render the plot in the worker pool (or take it from the cache)
+async def calculate_plot(expression: str, variable: str, start: float, end: float) -> bytes:
+    cache_key = (normalize_expression(expression), variable, start, end)
+    image = PLOT_CACHE.get(cache_key)
+    if image is not None:
+        logging.debug(f"Plot served from cache: {expression[:50]}")
+        return image
+
+    image = await calculate_with_timeout(expression, "plot_expression", variable, start, end)
+    PLOT_CACHE.set(cache_key, image)
+    return image
+
+# Sends the plot as an embed with the PNG attached
+async def send_plot_result(message, expression: str, variable: str, start: float, end: float, image: bytes) -> None:
+    embed = discord.Embed(
+        title="📈 Calculator - Plot",
+        color=discord.Color.blue()
+    )
+    embed.add_field(name="Expression", value=f"**{expression}**", inline=False)
+    embed.add_field(name="Range", value=f"{variable} = {format_number(start)} .. {format_number(end)}", inline=False)
+    embed.set_image(url="attachment://plot.png")
+
+    file = discord.File(io.BytesIO(image), filename="plot.png")
+    await message.channel.send(embed=embed, file=file)
+    logging.debug(f"Calculation plot sent for {message.author}: {expression} ({len(image)} bytes)")
+
+# Handles '!calc plot ...'; raises CalculatorError with a user-facing message on invalid input
+async def process_plot(message, arguments: str) -> None:
+    expression, variable, start, end = parse_plot_arguments(arguments)
+
+    is_safe, error_msg = is_safe_expression(expression)
+    if not is_safe:
+        raise CalculatorError(error_msg)
+
+    replaced = replace_special_characters(expression)
+    image = await calculate_plot(replaced, variable, start, end)
+    await send_plot_result(message, expression, variable, start, end, image)
+
 # Replaces special mathematical characters with their python equivalents
 def replace_special_characters(expression):
     replacements = {
@@ -0,0 +1,227 @@
+import math
+import zlib
+import struct
+from typing import Optional
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Calculator_plot.py
+# Description: Renders sampled function values to a PNG image
+# Pure Python (zlib + struct), runs inside the calculator worker processes
+# ================================================================
+
+# ----------------------------------------------------------------
+# Layout & Colors
+# ----------------------------------------------------------------
+
+WIDTH = 640
+HEIGHT = 400
+MARGIN_LEFT = 72  # Room for the y tick labels
+MARGIN_RIGHT = 12
+MARGIN_TOP = 12
+MARGIN_BOTTOM = 28  # Room for the x tick labels
+PLOT_WIDTH = WIDTH - MARGIN_LEFT - MARGIN_RIGHT  # One sample per pixel column
+
+BACKGROUND = (255, 255, 255)
+GRID = (225, 228, 235)
+AXIS = (90, 90, 90)
+BORDER = (160, 160, 160)
+CURVE = (52, 101, 196)
+TEXT = (60, 60, 60)
+
+# Share of samples cut off at each end of the value range (poles like 1/x would flatten everything else)
+OUTLIER_SHARE = 0.02
+
+# 3x5 bitmap font for tick labels, one string of 15 pixels per character (row by row)
+FONT = {
+    "0": "111101101101111", "1": "010110010010111", "2": "111001111100111",
+    "3": "111001111001111", "4": "101101111001001", "5": "111100111001111",
+    "6": "111100111101111", "7": "111001001001001", "8": "111101111101111",
+    "9": "111101111001111", "-": "000000111000000", ".": "000000000000010",
+    "e": "000111101110111", "+": "000010111010000",
+}
+FONT_SCALE = 2
+CHAR_WIDTH = 4 * FONT_SCALE  # 3 pixels + 1 pixel spacing
+
+# ----------------------------------------------------------------
+# Canvas
+# ----------------------------------------------------------------
+
+class Canvas:
+    # RGB pixel buffer with the few drawing primitives the plot needs
+    def __init__(self, width: int, height: int, background: tuple[int, int, int]):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(background) * (width * height))
+
+    def set(self, x: int, y: int, color: tuple[int, int, int]):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            offset = (y * self.width + x) * 3
+            self.pixels[offset:offset + 3] = bytes(color)
+
+    def hline(self, x0: int, x1: int, y: int, color: tuple[int, int, int]):
+        if not 0 <= y < self.height:
+            return
+        x0, x1 = max(0, min(x0, x1)), min(self.width - 1, max(x0, x1))
+        if x0 <= x1:
+            start = (y * self.width + x0) * 3
+            self.pixels[start:start + (x1 - x0 + 1) * 3] = bytes(color) * (x1 - x0 + 1)
+
+    def vline(self, x: int, y0: int, y1: int, color: tuple[int, int, int]):
+        for y in range(max(0, min(y0, y1)), min(self.height - 1, max(y0, y1)) + 1):
+            self.set(x, y, color)
+
+    # Bresenham line, drawn 2 pixels thick; clipped to the given box
+    def line(self, x0: int, y0: int, x1: int, y1: int, color: tuple[int, int, int], clip: tuple[int, int, int, int]):
+        left, top, right, bottom = clip
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+        error = dx + dy
+        while True:
+            if left <= x0 <= right and top <= y0 <= bottom:
+                self.set(x0, y0, color)
+                self.set(x0, y0 + 1 if y0 < bottom else y0 - 1, color)
+            if x0 == x1 and y0 == y1:
+                break
+            doubled = 2 * error
+            if doubled >= dy:
+                error += dy
+                x0 += sx
+            if doubled <= dx:
+                error += dx
+                y0 += sy
+
+    def text(self, x: int, y: int, label: str, color: tuple[int, int, int]):
+        for index, char in enumerate(label):
+            glyph = FONT.get(char)
+            if glyph is None:
+                continue
+            for pixel, bit in enumerate(glyph):
+                if bit == "1":
+                    gx, gy = x + index * CHAR_WIDTH + (pixel % 3) * FONT_SCALE, y + (pixel // 3) * FONT_SCALE
+                    for ox in range(FONT_SCALE):
+                        for oy in range(FONT_SCALE):
+                            self.set(gx + ox, gy + oy, color)
+
+    # Encode as 8-bit RGB PNG (filter type 0 on every row)
+    def to_png(self) -> bytes:
+        stride = self.width * 3
+        raw = b"".join(b"\x00" + self.pixels[row * stride:(row + 1) * stride] for row in range(self.height))
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+# ----------------------------------------------------------------
+# Scaling Helpers
+# ----------------------------------------------------------------
+
+# Evenly spaced sample points over [start, end], one per pixel column by default
+def sample_points(start: float, end: float, count: int = PLOT_WIDTH) -> list[float]:
+    if count < 2 or end <= start:
+        return [start]
+    step = (end - start) / (count - 1)
+    return [start + k * step for k in range(count)]
+
+# Visible y range: finite values without the outermost outliers, padded by 5%
+def value_range(values: list[Optional[float]]) -> Optional[tuple[float, float]]:
+    finite = sorted(v for v in values if v is not None and math.isfinite(v))
+    if not finite:
+        return None
+    cut = int(len(finite) * OUTLIER_SHARE) if len(finite) >= 50 else 0
+    low, high = finite[cut], finite[len(finite) - 1 - cut]
+    if high - low < 1e-12:
+        padding = max(abs(low) * 0.1, 1.0)
+    else:
+        padding = (high - low) * 0.05
+    return low - padding, high + padding
+
+# Tick spacing of 1, 2 or 5 times a power of ten giving about `target` ticks
+def nice_step(span: float, target: int = 6) -> float:
+    raw = span / max(1, target)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+def ticks(low: float, high: float) -> list[float]:
+    step = nice_step(high - low)
+    first = math.ceil(low / step) * step
+    return [first + k * step for k in range(int((high - first) / step + 1e-9) + 1)]
+
+def format_tick(value: float) -> str:
+    if abs(value) < 1e-12:
+        return "0"
+    return f"{value:.4g}"
+
+# ----------------------------------------------------------------
+# Plot Rendering
+# ----------------------------------------------------------------
+
+# Render y = f(x) for the sampled points; None marks undefined values (gaps in the curve)
+def render_plot(points: list[float], values: list[Optional[float]]) -> bytes:
+    y_range = value_range(values)
+    if y_range is None:
+        raise ValueError("No finite values to plot")
+    x_low, x_high = points[0], points[-1]
+    if x_high <= x_low:
+        x_low, x_high = x_low - 1.0, x_high + 1.0
+    y_low, y_high = y_range
+
+    canvas = Canvas(WIDTH, HEIGHT, BACKGROUND)
+    left, top = MARGIN_LEFT, MARGIN_TOP
+    right, bottom = WIDTH - MARGIN_RIGHT - 1, HEIGHT - MARGIN_BOTTOM - 1
+
+    def to_px(x: float) -> int:
+        return round(left + (x - x_low) / (x_high - x_low) * (right - left))
+
+    def to_py(y: float) -> int:
+        return round(bottom - (y - y_low) / (y_high - y_low) * (bottom - top))
+
+    # Grid and tick labels
+    for x in ticks(x_low, x_high):
+        px = to_px(x)
+        canvas.vline(px, top, bottom, GRID)
+        label = format_tick(x)
+        canvas.text(px - len(label) * CHAR_WIDTH // 2, bottom + 8, label, TEXT)
+    for y in ticks(y_low, y_high):
+        py = to_py(y)
+        canvas.hline(left, right, py, GRID)
+        label = format_tick(y)
+        canvas.text(left - 6 - len(label) * CHAR_WIDTH, py - 5, label, TEXT)
+
+    # Axes through the origin when visible
+    if x_low <= 0 <= x_high:
+        canvas.vline(to_px(0), top, bottom, AXIS)
+    if y_low <= 0 <= y_high:
+        canvas.hline(left, right, to_py(0), AXIS)
+
+    # Border
+    canvas.hline(left, right, top, BORDER)
+    canvas.hline(left, right, bottom, BORDER)
+    canvas.vline(left, top, bottom, BORDER)
+    canvas.vline(right, top, bottom, BORDER)
+
+    # Curve: connect neighbouring defined samples, but not across poles (jump from one edge to the other)
+    clip = (left + 1, top + 1, right - 1, bottom - 1)
+    previous: Optional[tuple[int, int, float]] = None
+    for x, y in zip(points, values):
+        if y is None or not math.isfinite(y):
+            previous = None
+            continue
+        # Keep far-off values near the plot so the clipped line still has the right slope
+        py = to_py(min(max(y, y_low - (y_high - y_low)), y_high + (y_high - y_low)))
+        px = to_px(x)
+        if previous is not None:
+            prev_px, prev_py, prev_y = previous
+            crosses_pole = (prev_y > y_high and y < y_low) or (prev_y < y_low and y > y_high)
+            if not crosses_pole:
+                canvas.line(prev_px, prev_py, px, py, CURVE, clip)
+        previous = (px, py, y)
+
+    return canvas.to_png()
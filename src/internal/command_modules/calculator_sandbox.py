@@ -0,0 +1,376 @@
+import os
+import signal
+import asyncio
+import logging
+import importlib
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Any
+from internal import utils
+
+try:
+    import resource  # Unix only, rlimits are skipped on Windows
+except ImportError:
+    resource = None
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Calculator_sandbox.py
+# Description: Killable process pool for calculator evaluation
+# Workers are pre-warmed with sympy and run under CPU/memory rlimits
+# ================================================================
+
+# ----------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------
+
+# Optional "calculator" section in config.json
+CALC_CONFIG = utils.get_config_value("calculator", default={}) or {}
+
+POOL_SIZE = max(1, int(CALC_CONFIG.get("pool_size", 2)))
+MAX_PENDING = max(1, int(CALC_CONFIG.get("max_pending", 8)))  # Running + waiting calculations
+CPU_LIMIT = int(CALC_CONFIG.get("cpu_limit", 10))  # CPU seconds per calculation (backstop for the wall timeout)
+MEMORY_LIMIT_MB = int(CALC_CONFIG.get("memory_limit_mb", 256))  # Address space a worker may add after warm-up
+MAX_TASKS_PER_WORKER = int(CALC_CONFIG.get("max_tasks_per_worker", 200))  # Recycle workers (sympy caches grow)
+STARTUP_TIMEOUT = 60.0  # Importing sympy on a Pi takes a while
+
+# Module the workers import and the functions they are allowed to call
+TASK_MODULE = "internal.command_modules.calculator"
+ALLOWED_TASKS = {"evaluate_expression", "solve_equation", "tabulate_expression", "plot_expression"}
+
+class SandboxError(Exception):
+    pass
+
+# Raised when too many calculations are already running or waiting
+class SandboxBusy(SandboxError):
+    pass
+
+# Raised when a calculation exceeds its wall-clock or CPU time limit
+class SandboxTimeout(SandboxError):
+    pass
+
+# ----------------------------------------------------------------
+# Worker Process
+# ----------------------------------------------------------------
+
+def _cpu_limit_exceeded(signum, frame):
+    raise SandboxTimeout("CPU time limit exceeded")
+
+# Allow the worker MEMORY_LIMIT_MB on top of what it uses after importing sympy
+def _limit_memory(extra_mb: int):
+    if resource is None or extra_mb <= 0:
+        return
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            current = int(fh.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        current = 0
+
+    limit = current + extra_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logging.debug(f"Could not set memory limit for calculator worker: {e}")
+
+# RLIMIT_CPU counts the whole process lifetime, so move the soft limit before every task
+def _limit_cpu(seconds: int):
+    if resource is None or seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = int(usage.ru_utime + usage.ru_stime) + seconds + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    except (ValueError, OSError) as e:
+        logging.debug(f"Could not set CPU limit for calculator worker: {e}")
+
+def _worker_main(conn: Connection, task_module: str, cpu_limit: int, memory_limit_mb: int):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the bot process
+
+    module = importlib.import_module(task_module)
+    importlib.import_module("sympy")  # Pre-warm: the calculator only imports sympy on first use
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _cpu_limit_exceeded)
+        _limit_memory(memory_limit_mb)
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break  # Bot process is gone
+        if message is None:
+            break
+
+        task, args = message
+        _limit_cpu(cpu_limit)
+        try:
+            if task not in ALLOWED_TASKS:
+                raise SandboxError(f"Task not allowed: {task}")
+            reply = ("ok", getattr(module, task)(*args))
+        except Exception as e:
+            reply = ("error", e)
+
+        try:
+            conn.send(reply)
+        except Exception:
+            # Result or exception could not be pickled
+            conn.send(("error", SandboxError(str(reply[1])[:200])))
+
+# ----------------------------------------------------------------
+# Process Pool
+# ----------------------------------------------------------------
+
+class _Worker:
+    __slots__ = ("process", "conn", "tasks")
+
+    def __init__(self, process: multiprocessing.process.BaseProcess, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.tasks = 0
+
+def _get_context() -> Any:
+    # forkserver forks workers from a clean helper process (the bot itself runs threads and an
+    # event loop, so forking it directly is unsafe) and lets us import sympy there only once
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["__main__", "sympy", TASK_MODULE])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+class CalculatorSandbox:
+    # Fixed number of worker slots; a slot holds a worker process or None when
+    # processes are unavailable and the slot falls back to a dedicated thread
+    def __init__(self, size: int, max_pending: int):
+        self.size = size
+        self.max_pending = max_pending
+        self.pending = 0
+        self.stats = {"tasks": 0, "timeouts": 0, "rejected": 0, "respawns": 0}
+
+        self._ctx = None
+        self._slots: asyncio.Queue | None = None
+        self._workers: set[_Worker] = set()
+        self._background: set[asyncio.Task] = set()
+        self._started = False
+        self._closed = False
+        # Blocking pipe waits and process starts; never the loop's default executor
+        self._executor = ThreadPoolExecutor(max_workers=size * 2, thread_name_prefix="calc-sandbox")
+        self._fallback_executor: ThreadPoolExecutor | None = None
+        self._hung_threads: set[Future] = set()  # Fallback calculations still running after their timeout
+
+    def start(self):
+        if self._started or self._closed:
+            return
+        self._started = True
+        self._ctx = _get_context()
+        self._slots = asyncio.Queue()
+        for _ in range(self.size):
+            self._spawn_in_background()
+        logging.info(f"Calculator sandbox starting {self.size} worker(s) ({self._ctx.get_start_method()})")
+
+    def _spawn_in_background(self):
+        task = asyncio.get_running_loop().create_task(self._spawn())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # Start a worker and wait until it has imported sympy (runs in a pool thread)
+    def _start_worker(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, TASK_MODULE, CPU_LIMIT, MEMORY_LIMIT_MB),
+            name="calculator-worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        worker = _Worker(process, parent_conn)
+        try:
+            if not parent_conn.poll(STARTUP_TIMEOUT):
+                raise SandboxError(f"Worker did not start within {STARTUP_TIMEOUT:.0f}s")
+            parent_conn.recv()
+        except Exception:
+            self._kill(worker)
+            raise
+        return worker
+
+    async def _spawn(self):
+        loop = asyncio.get_running_loop()
+        try:
+            worker = await loop.run_in_executor(self._executor, self._start_worker)
+        except Exception as e:
+            logging.error(f"Calculator worker could not be started, using thread fallback: {e}")
+            if not self._closed and self._slots is not None:
+                self._slots.put_nowait(None)
+            return
+
+        if self._closed or self._slots is None:
+            self._kill(worker)
+            return
+        self._workers.add(worker)
+        self._slots.put_nowait(worker)
+
+    @staticmethod
+    def _kill(worker: _Worker):
+        try:
+            worker.conn.close()
+        except OSError:
+            pass
+        try:
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.process.join(timeout=1.0)
+        except Exception as e:
+            logging.debug(f"Error killing calculator worker: {e}")
+
+    # Kill a worker (hung, crashed or worn out) and start a fresh one in its slot
+    def _replace(self, worker: _Worker):
+        self._workers.discard(worker)
+        asyncio.get_running_loop().run_in_executor(self._executor, self._kill, worker)
+        if not self._closed:
+            self.stats["respawns"] += 1
+            self._spawn_in_background()
+
+    async def _run_in_worker(self, worker: _Worker, task: str, args: tuple, timeout: float) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            worker.conn.send((task, args))
+            ready = await loop.run_in_executor(self._executor, worker.conn.poll, timeout)
+            if not ready:
+                self.stats["timeouts"] += 1
+                self._replace(worker)
+                raise SandboxTimeout(f"Calculation exceeded {timeout:g}s")
+            status, value = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            self._replace(worker)
+            raise SandboxError(f"Calculation worker crashed: {e}")
+        except asyncio.CancelledError:
+            # Worker state is unknown now
+            self._replace(worker)
+            raise
+
+        worker.tasks += 1
+        if isinstance(value, MemoryError) or worker.tasks >= MAX_TASKS_PER_WORKER:
+            self._replace(worker)
+        else:
+            self._slots.put_nowait(worker)
+
+        if status == "error":
+            raise value
+        return value
+
+    # Used by slots without a worker process. Threads cannot be killed, so the slot is only
+    # returned once the thread has really finished; a hung calculation keeps its slot taken
+    async def _run_in_thread(self, task: str, args: tuple, timeout: float) -> Any:
+        if task not in ALLOWED_TASKS:
+            self._slots.put_nowait(None)
+            raise SandboxError(f"Task not allowed: {task}")
+        if self._fallback_executor is None:
+            self._fallback_executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="calc-fallback")
+
+        loop = asyncio.get_running_loop()
+        try:
+            func = getattr(importlib.import_module(TASK_MODULE), task)
+            future = self._fallback_executor.submit(func, *args)
+        except BaseException:
+            self._slots.put_nowait(None)
+            raise
+        future.add_done_callback(lambda done: self._call_in_loop(loop, self._thread_finished, done))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            if not future.done():
+                self._hung_threads.add(future)
+                logging.warning(f"Calculator fallback thread still busy after {timeout:g}s, its slot stays blocked")
+            raise SandboxTimeout(f"Calculation exceeded {timeout:g}s")
+
+    @staticmethod
+    def _call_in_loop(loop: asyncio.AbstractEventLoop, callback, *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # Loop already closed (shutdown)
+
+    # A fallback thread finished (also a hung one, late): its slot is free again
+    def _thread_finished(self, future: Future):
+        self._hung_threads.discard(future)
+        if not self._closed and self._slots is not None:
+            self._slots.put_nowait(None)
+
+    async def run(self, task: str, *args: Any, timeout: float) -> Any:
+        if self._closed:
+            raise SandboxError("Calculator is shutting down")
+        if self.pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise SandboxBusy("Calculator is busy right now, please try again in a moment")
+
+        self.start()
+        # Every slot blocked by a hung fallback thread: waiting would never end
+        if self._slots.empty() and len(self._hung_threads) >= self.size:
+            self.stats["rejected"] += 1
+            raise SandboxBusy("Calculator is unavailable right now, please try again later")
+        self.pending += 1
+        try:
+            worker = await self._slots.get()
+            self.stats["tasks"] += 1
+            if worker is None:
+                return await self._run_in_thread(task, args, timeout)  # Returns the slot itself
+            return await self._run_in_worker(worker, task, args, timeout)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self._closed = True
+        for task in list(self._background):
+            task.cancel()
+        for worker in list(self._workers):
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(timeout=0.5)
+            self._kill(worker)
+        self._workers.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._fallback_executor:
+            self._fallback_executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        stats = dict(self.stats)
+        stats["workers"] = len(self._workers)
+        stats["idle"] = self._slots.qsize() if self._slots else 0
+        stats["pending"] = self.pending
+        stats["hung_threads"] = len(self._hung_threads)
+        stats["started"] = self._started
+        return stats
+
+pool = CalculatorSandbox(POOL_SIZE, MAX_PENDING)
+
+# ----------------------------------------------------------------
+# Public Helpers
+# ----------------------------------------------------------------
+
+# Start the workers early so the first !calc does not wait for sympy to load
+def start_pool():
+    pool.start()
+
+def shutdown_pool():
+    pool.shutdown()
+
+# Run an allowed calculator task in the pool; raises SandboxBusy/SandboxTimeout/SandboxError
+# or the exception raised by the task itself
+async def run_task(task: str, *args: Any, timeout: float) -> Any:
+    return await pool.run(task, *args, timeout=timeout)
+
+def get_pool_stats() -> dict[str, Any]:
+    return pool.get_stats()
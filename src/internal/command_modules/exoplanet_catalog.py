@@ -0,0 +1,346 @@
+import os
+import io
+import re
+import csv
+import time
+import sqlite3
+import asyncio
+import logging
+import urllib.parse
+import aiohttp
+from contextlib import closing
+from internal import utils
+from internal import http_client
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Exoplanet_catalog.py
+# Description: Local SQLite snapshot of the NASA Exoplanet Archive (ps table)
+# Refreshed in the background; !exoplanet answers from it without API calls
+# ================================================================
+
+# ----------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------
+
+# Optional "exoplanet_catalog" section in config.json
+CATALOG_CONFIG = utils.get_config_value("exoplanet_catalog", default={}) or {}
+
+CATALOG_ENABLED = bool(CATALOG_CONFIG.get("enabled", True))
+CATALOG_PATH = CATALOG_CONFIG.get("path") or os.path.join(utils.BASE_DATA_DIR, "exoplanet_catalog.sqlite3")
+REFRESH_INTERVAL = float(CATALOG_CONFIG.get("refresh_interval", 86400))  # The archive is updated about weekly
+RETRY_INTERVAL = float(CATALOG_CONFIG.get("retry_interval", 3600))  # After a failed download
+DOWNLOAD_TIMEOUT = float(CATALOG_CONFIG.get("download_timeout", 120))  # The full table is a few MB of CSV
+
+TAP_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+COLUMNS = ("pl_name", "hostname", "disc_year", "sy_dist", "pl_rade", "pl_bmasse", "pl_eqt", "discoverymethod", "releasedate")
+# default_flag = 1 selects one (the default) parameter set per planet
+SNAPSHOT_QUERY = f"SELECT {', '.join(COLUMNS)} FROM ps WHERE default_flag = 1"
+
+SCHEMA = """
+CREATE TABLE planets (
+    id INTEGER PRIMARY KEY,
+    pl_name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    hostname TEXT,
+    disc_year INTEGER,
+    sy_dist REAL,
+    pl_rade REAL,
+    pl_bmasse REAL,
+    pl_eqt REAL,
+    discoverymethod TEXT,
+    releasedate TEXT
+);
+CREATE INDEX planets_name ON planets (name_key);
+CREATE INDEX planets_distance ON planets (sy_dist) WHERE sy_dist IS NOT NULL;
+CREATE INDEX planets_discovery ON planets (disc_year DESC, releasedate DESC) WHERE disc_year IS NOT NULL;
+CREATE TABLE trigrams (
+    trigram TEXT NOT NULL,
+    planet_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, planet_id)
+) WITHOUT ROWID;
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Share of the search key's trigrams a name needs for a fuzzy match (typos like "Keplr-22b")
+FUZZY_MATCH_SHARE = 0.6
+
+_refresh_task: asyncio.Task | None = None
+
+# ----------------------------------------------------------------
+# Name Normalisation
+# ----------------------------------------------------------------
+
+# "Kepler-22 b" and "kepler22b" both become "kepler22b"
+def normalise_name(name: str) -> str:
+    return re.sub(r"[^0-9a-z]", "", name.casefold())
+
+def trigrams(key: str) -> set[str]:
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+# ----------------------------------------------------------------
+# Snapshot Building (runs in a worker thread)
+# ----------------------------------------------------------------
+
+def _to_float(value: str) -> float | None:
+    try:
+        return float(value) if value.strip() else None
+    except ValueError:
+        return None
+
+def _to_int(value: str) -> int | None:
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+# Parse the TAP CSV export and write a new database file next to the current one
+def build_snapshot(csv_text: str, path: str = CATALOG_PATH) -> int:
+    rows = []
+    for row in csv.DictReader(io.StringIO(csv_text)):
+        name = (row.get("pl_name") or "").strip()
+        if not name:
+            continue
+        rows.append((
+            name,
+            normalise_name(name),
+            row.get("hostname") or None,
+            _to_int(row.get("disc_year") or ""),
+            _to_float(row.get("sy_dist") or ""),
+            _to_float(row.get("pl_rade") or ""),
+            _to_float(row.get("pl_bmasse") or ""),
+            _to_float(row.get("pl_eqt") or ""),
+            row.get("discoverymethod") or None,
+            row.get("releasedate") or None,
+        ))
+    if not rows:
+        raise ValueError("Exoplanet archive returned no rows")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            "INSERT INTO planets (pl_name, name_key, hostname, disc_year, sy_dist, pl_rade, pl_bmasse, pl_eqt, discoverymethod, releasedate) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO trigrams (trigram, planet_id) VALUES (?, ?)",
+            ((trigram, planet_id) for planet_id, key in connection.execute("SELECT id, name_key FROM planets").fetchall() for trigram in trigrams(key)),
+        )
+        connection.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("created_at", str(time.time())), ("planets", str(len(rows)))],
+        )
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    # Readers keep using the old file until they open a new connection
+    os.replace(tmp_path, path)
+    return len(rows)
+
+# ----------------------------------------------------------------
+# Streaming CSV
+# ----------------------------------------------------------------
+
+# Rows of a CSV response, parsed line by line while the body arrives (nothing is buffered as a whole)
+# Stops reading after `limit` rows; with `unique` only the first row per value of that column is kept
+async def read_csv_rows(response: aiohttp.ClientResponse, limit: int | None = None, unique: str | None = None) -> list[dict[str, str]]:
+    encoding = response.charset or "utf-8"
+    header: list[str] | None = None
+    rows: list[dict[str, str]] = []
+    seen: set[str] = set()
+    record = ""
+
+    async for line in response.content:
+        record += line.decode(encoding, errors="replace")
+        # A quoted field may contain a line break: wait until every quote is closed
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+
+        row = dict(zip(header, values))
+        if unique is not None:
+            if row.get(unique) in seen:
+                continue
+            seen.add(row.get(unique, ""))
+        rows.append(row)
+        if limit is not None and len(rows) >= limit:
+            break
+    return rows
+
+# ----------------------------------------------------------------
+# Snapshot Refresh
+# ----------------------------------------------------------------
+
+# Download the ps table and rebuild the snapshot; returns the number of planets
+async def refresh_snapshot() -> int:
+    url = f"{TAP_URL}?query={urllib.parse.quote(SNAPSHOT_QUERY)}&format=csv"
+    started = time.perf_counter()
+    async with http_client.session() as session:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT)) as response:
+            if response.status != 200:
+                raise Exception(f"API returned {response.status}")
+            text = await response.text()
+    count = await asyncio.to_thread(build_snapshot, text)
+    logging.info(f"Exoplanet catalogue snapshot updated: {count:,} planets in {time.perf_counter() - started:.1f}s")
+    return count
+
+# Seconds since the snapshot was written (None when there is none)
+def snapshot_age() -> float | None:
+    try:
+        return max(0.0, time.time() - os.path.getmtime(CATALOG_PATH))
+    except OSError:
+        return None
+
+def is_available() -> bool:
+    return CATALOG_ENABLED and os.path.exists(CATALOG_PATH)
+
+async def _refresh_loop():
+    while True:
+        age = snapshot_age()
+        if age is not None and age < REFRESH_INTERVAL:
+            await asyncio.sleep(REFRESH_INTERVAL - age)
+            continue
+        try:
+            await refresh_snapshot()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"Exoplanet catalogue refresh failed (retry in {RETRY_INTERVAL:.0f}s): {e}")
+            await asyncio.sleep(RETRY_INTERVAL)
+
+# Start the background refresh (downloads right away when the snapshot is missing or outdated)
+def start_refresh():
+    global _refresh_task
+    if not CATALOG_ENABLED or (_refresh_task and not _refresh_task.done()):
+        return
+    _refresh_task = asyncio.get_running_loop().create_task(_refresh_loop())
+    logging.info(f"Exoplanet catalogue refresh started (every {REFRESH_INTERVAL / 3600:.0f}h)")
+
+def stop_refresh():
+    global _refresh_task
+    if _refresh_task and not _refresh_task.done():
+        _refresh_task.cancel()
+    _refresh_task = None
+
+# ----------------------------------------------------------------
+# Queries
+# ----------------------------------------------------------------
+
+# Columns handed to !exoplanet (releasedate is only used for ordering)
+PLANET_FIELDS = ", ".join(COLUMNS[:-1])
+
+def _connect() -> sqlite3.Connection:
+    connection = sqlite3.connect(f"file:{CATALOG_PATH}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+def _format_value(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # 234.0 -> "234" as in the archive's CSV
+    return str(value)
+
+# Same shape as a csv.DictReader row of the live API (strings, "" for missing values)
+def _to_planet(row: sqlite3.Row) -> dict[str, str]:
+    return {key: _format_value(row[key]) for key in row.keys()}
+
+def _count() -> int:
+    with closing(_connect()) as connection:
+        return connection.execute("SELECT COUNT(*) FROM planets").fetchone()[0]
+
+def _nearest(limit: int) -> list[dict[str, str]]:
+    with closing(_connect()) as connection:
+        rows = connection.execute(
+            f"SELECT {PLANET_FIELDS} FROM planets WHERE sy_dist IS NOT NULL ORDER BY sy_dist ASC LIMIT ?", (limit,)
+        ).fetchall()
+    return [_to_planet(row) for row in rows]
+
+def _latest(limit: int) -> list[dict[str, str]]:
+    with closing(_connect()) as connection:
+        rows = connection.execute(
+            f"SELECT {PLANET_FIELDS} FROM planets WHERE disc_year IS NOT NULL "
+            "ORDER BY disc_year DESC, releasedate DESC LIMIT ?", (limit,)
+        ).fetchall()
+    return [_to_planet(row) for row in rows]
+
+# Exact name, then names containing the key (trigram candidates), then names sharing most trigrams
+def _search(name: str, limit: int) -> list[dict[str, str]]:
+    key = normalise_name(name)
+    if not key:
+        return []
+    with closing(_connect()) as connection:
+        rows = connection.execute(f"SELECT {PLANET_FIELDS} FROM planets WHERE name_key = ?", (key,)).fetchall()
+        if rows:
+            return [_to_planet(row) for row in rows[:limit]]
+
+        key_trigrams = trigrams(key)
+        if not key_trigrams:
+            # One or two characters: too short for the index, the table is small enough to scan
+            rows = connection.execute(
+                f"SELECT {PLANET_FIELDS} FROM planets WHERE instr(name_key, ?) > 0 ORDER BY length(name_key), pl_name LIMIT ?",
+                (key, limit),
+            ).fetchall()
+            return [_to_planet(row) for row in rows]
+
+        placeholders = ", ".join("?" * len(key_trigrams))
+        candidates = connection.execute(
+            f"SELECT p.name_key, COUNT(*) AS hits, {', '.join('p.' + column for column in COLUMNS[:-1])} "
+            f"FROM trigrams t JOIN planets p ON p.id = t.planet_id WHERE t.trigram IN ({placeholders}) "
+            "GROUP BY t.planet_id ORDER BY hits DESC, length(p.name_key), p.pl_name",
+            tuple(key_trigrams),
+        ).fetchall()
+
+    # Substring matches need every trigram of the key, shortest names first (like LIKE '%key%')
+    contained = [row for row in candidates if row["hits"] == len(key_trigrams) and key in row["name_key"]]
+    if contained:
+        contained.sort(key=lambda row: (not row["name_key"].startswith(key), len(row["name_key"]), row["pl_name"]))
+        return [_to_planet(row) for row in contained[:limit]]
+
+    fuzzy = [row for row in candidates if row["hits"] >= len(key_trigrams) * FUZZY_MATCH_SHARE]
+    return [_to_planet(row) for row in fuzzy[:limit]]
+
+# Async wrappers: SQLite calls run in a thread so the event loop never blocks on disk
+async def count_planets() -> int:
+    return await asyncio.to_thread(_count)
+
+async def nearest(limit: int = 5) -> list[dict[str, str]]:
+    return await asyncio.to_thread(_nearest, limit)
+
+async def latest(limit: int = 5) -> list[dict[str, str]]:
+    return await asyncio.to_thread(_latest, limit)
+
+async def search(name: str, limit: int = 3) -> list[dict[str, str]]:
+    return await asyncio.to_thread(_search, name, limit)
+
+# Status line for the component tests
+def describe() -> str:
+    if not CATALOG_ENABLED:
+        return "Exoplanet snapshot disabled"
+    age = snapshot_age()
+    if age is None:
+        return "Exoplanet snapshot not downloaded yet (live queries)"
+    try:
+        planets = _count()
+    except sqlite3.Error as e:
+        return f"Exoplanet snapshot unreadable: {e}"
+    return f"Exoplanet snapshot: {planets:,} planets, {age / 3600:.1f}h old"
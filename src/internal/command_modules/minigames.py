@@ -6,6 +6,8 @@ import logging
 import string
 from internal.utils import load_hangman, load_quiz  # Utils functions for loading data
 from internal import rate_limiter
+from internal import http_client
+from internal.command_modules import word_dictionary
 
 # Copyright (c) 2026 Dennis Plischke.
 # All rights reserved.
@@ -52,13 +54,14 @@ async def component_test():
         else:
             messages.append("Quiz data loaded.")
                 
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session() as session:
             async with session.get('https://api.dictionaryapi.dev/api/v2/entries/en/example', timeout=aiohttp.ClientTimeout(total=API_TIMEOUT)) as response:
                 if response.status == 200:
                     messages.append("Dictionary API reachable.")
                 else:
                     status = "🟧"
                     messages.append(f"Dictionary API error: Status {response.status}")
+        messages.append(word_dictionary.get_stats())
                     
     except Exception as e:
         status = "🟥"
@@ -178,29 +181,13 @@ def draw_letters(pool, count):
         logging.warning("No letters could be drawn because the pool is empty.")
     return letters
 
-# Check if a word is valid using the appropriate dictionary API
+# Check if a word is valid -> Word_dictionary.py (wordlist, word cache, dictionary API)
 async def is_valid_word(word, language):
-    if language == "En":
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word.lower()}"
-    elif language == "De":
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/de/{word.lower()}"
-    else:
-        logging.error(f"Unsupported language '{language}' for dictionary lookup.")
-        return False
+    return await word_dictionary.is_valid_word(word, language)
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return True  # Word exists
-                elif response.status == 404:
-                    return False  # Word does not exist
-                else:
-                    logging.warning(f"Unexpected response from dictionary API: {response.status}")
-                    return False
-    except aiohttp.ClientError as e:
-        logging.error(f"Error connecting to dictionary API: {e}")
-        return False
+# Check several words at once (e.g. all words of a scrabble move); returns {word: valid}
+async def validate_words(words, language):
+    return await word_dictionary.validate_words(words, language)
 
 def check_answer(question, user_answer):
     # If the question has multiple correct answers
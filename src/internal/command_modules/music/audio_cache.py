@@ -0,0 +1,208 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, cast
+from internal import lazy_import
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Audio_cache.py
+# Description: Local audio file cache for frequently played tracks
+# Disk budget is enforced with least-recently-used eviction
+# ================================================================
+
+# ----------------------------------------------------------------
+# Helper Functions
+# ----------------------------------------------------------------
+
+# Partial downloads left behind by yt-dlp
+PARTIAL_SUFFIXES = (".part", ".ytdl", ".tmp")
+
+# Tracks whose plays are counted at once; the least recently played are forgotten first
+MAX_PLAY_COUNTS = 4096
+
+# Build a filesystem-safe cache key from extractor and video id
+def make_cache_key(extractor: str | None, video_id: str | None) -> str | None:
+    if not video_id:
+        return None
+    raw = f"{extractor or 'generic'}-{video_id}"
+    return re.sub(r"[^A-Za-z0-9_-]", "_", raw)[:120]
+
+# ----------------------------------------------------------------
+# Audio Cache
+# ----------------------------------------------------------------
+
+class AudioCache:
+    # Stores downloaded audio files under a directory with a byte budget (LRU eviction)
+    def __init__(self, directory: str, max_bytes: int, min_plays: int, ytdl_options: dict[str, Any]):
+        # directory: Where audio files are stored
+        # max_bytes: Disk budget for all cached files
+        # min_plays: Plays of a track before it is downloaded
+        # ytdl_options: Base yt-dlp options (format selection, cookies, ...)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_plays = max(1, min_plays)
+        self.ytdl_options = ytdl_options
+
+        self.entries: OrderedDict[str, tuple[str, int]] = OrderedDict()  # key -> (path, size), oldest first
+        self.total_bytes = 0
+        self.play_counts: OrderedDict[str, int] = OrderedDict()  # key -> plays of uncached tracks, oldest first
+        self.hits = 0
+        self.misses = 0
+
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-cache")
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._scan()
+
+    # Rebuild the index from disk, least recently used files first
+    def _scan(self):
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isfile(path):
+                continue
+            if name.endswith(PARTIAL_SUFFIXES):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logging.warning(f"Could not remove partial download {path}: {e}")
+                continue
+            stat = os.stat(path)
+            files.append((max(stat.st_atime, stat.st_mtime), os.path.splitext(name)[0], path, stat.st_size))
+
+        for _, key, path, size in sorted(files):
+            self.entries[key] = (path, size)
+            self.total_bytes += size
+
+        self._evict()
+        logging.info(f"Audio cache: {len(self.entries)} file(s), {self.total_bytes / 1048576:.1f} MB in {self.directory}")
+
+    # Remove least recently used files until the budget is met
+    def _evict(self):
+        while self.entries and self.total_bytes > self.max_bytes:
+            key, (path, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(path)
+                logging.debug(f"Audio cache evicted {key} ({size / 1048576:.1f} MB)")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Could not evict cached audio {path}: {e}")
+
+    # Return the local file for a key (and mark it as recently used) or None
+    # Called on the event loop: the in-memory index is trusted, a file removed behind our back
+    # is dropped by the touch job or by the player when ffmpeg cannot open it (see forget)
+    def lookup(self, key: str | None) -> str | None:
+        if not key:
+            return None
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            path = entry[0]
+
+        # Keep LRU order across restarts (in the cache thread, not on the event loop)
+        try:
+            self._executor.submit(self._touch, key, path)
+        except RuntimeError:
+            pass  # Executor already shut down
+        return path
+
+    def _touch(self, key: str, path: str):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.forget(key)
+        except OSError:
+            pass
+
+    # Drop the entry of a file that no longer exists, so the next play streams the track
+    def forget(self, key: str | None):
+        if not key:
+            return
+        with self._lock:
+            entry = self.entries.pop(key, None)
+            if entry:
+                self.total_bytes -= entry[1]
+                logging.warning(f"Cached audio for {key} is missing, removed it from the cache")
+
+    # Count a play and download the track once it is played often enough
+    def record_play(self, key: str | None, webpage_url: str | None):
+        if not key or not webpage_url:
+            return
+        with self._lock:
+            if key in self.entries:
+                return
+            count = self.play_counts.pop(key, 0) + 1
+            self.play_counts[key] = count
+            if len(self.play_counts) > MAX_PLAY_COUNTS:
+                self.play_counts.popitem(last=False)
+            if key in self._pending or count < self.min_plays:
+                return
+            self._pending.add(key)
+        self._executor.submit(self._download, key, webpage_url)
+
+    # Download a track into the cache directory (runs in the cache thread)
+    def _download(self, key: str, webpage_url: str):
+        options = dict(self.ytdl_options)
+        options.update({
+            "skip_download": False,
+            "outtmpl": os.path.join(self.directory, f"{key}.%(ext)s"),
+            "noprogress": True,
+            "quiet": True,
+        })
+        started = time.monotonic()
+        try:
+            yt_dlp = lazy_import.load("yt_dlp")
+            with yt_dlp.YoutubeDL(cast(Any, options)) as ydl:
+                info = ydl.extract_info(webpage_url, download=True)
+                downloads = (info or {}).get("requested_downloads") or []
+                path = downloads[0].get("filepath") if downloads else None
+
+            if not path or not os.path.isfile(path):
+                logging.warning(f"Audio cache download for {key} produced no file")
+                return
+
+            size = os.path.getsize(path)
+            with self._lock:
+                self.entries[key] = (path, size)
+                self.entries.move_to_end(key)
+                self.total_bytes += size
+                self.play_counts.pop(key, None)  # Cached now, the count is no longer needed
+                self._evict()
+            logging.info(f"Audio cached: {key} ({size / 1048576:.1f} MB in {time.monotonic() - started:.1f}s)")
+        except Exception as e:
+            logging.warning(f"Audio cache download failed for {key}: {str(e)[:100]}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    # Cache statistics for component tests and logs
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "files": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "pending": len(self._pending),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
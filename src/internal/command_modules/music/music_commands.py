@@ -33,8 +33,8 @@ class QueueView(ui.View):
     
     # Update button states based on current page
     def _update_button_states(self):
-        state = player.get_guild_state(self.guild_id)
-        queue = state.get("queue", [])
+        state = player.peek_guild_state(self.guild_id)
+        queue = state.queue if state else ()
         total_pages = (len(queue) + QUEUE_ITEMS_PER_PAGE - 1) // QUEUE_ITEMS_PER_PAGE if queue else 1
         
         # Disable buttons at boundaries
@@ -55,8 +55,8 @@ class QueueView(ui.View):
     # Netx page button
     @ui.button(label="➡️ Next", style=discord.ButtonStyle.blurple)
     async def next_page(self, interaction: discord.Interaction, button: ui.Button):
-        state = player.get_guild_state(self.guild_id)
-        queue = state.get("queue", [])
+        state = player.peek_guild_state(self.guild_id)
+        queue = state.queue if state else ()
         total_pages = (len(queue) + QUEUE_ITEMS_PER_PAGE - 1) // QUEUE_ITEMS_PER_PAGE if queue else 1
         
         if self.current_page < total_pages - 1:
@@ -77,9 +77,9 @@ class QueueView(ui.View):
 
 # Create embed for queue display
 def create_queue_embed(guild_id: int, page: int = 0) -> discord.Embed:
-    state = player.get_guild_state(guild_id)
-    queue = state.get("queue", [])
-    current = state.get("current")
+    state = player.peek_guild_state(guild_id)
+    queue = list(state.queue) if state else []
+    current = state.current if state else None
     
     # Calculate pagination information
     total_items = len(queue)
@@ -97,12 +97,12 @@ def create_queue_embed(guild_id: int, page: int = 0) -> discord.Embed:
     # Currently playing song
     if current:
         duration_str = ""
-        if current.get("duration"):
-            mins, secs = divmod(current["duration"], 60)
+        if current.duration:
+            mins, secs = divmod(current.duration, 60)
             duration_str = f" | ⏱️ {mins}:{secs:02d}"
         embed.add_field(
             name="▶️ Now Playing",
-            value=f"**{current['title']}**{duration_str}",
+            value=f"**{current.title}**{duration_str}",
             inline=False
         )
     
@@ -119,10 +119,10 @@ def create_queue_embed(guild_id: int, page: int = 0) -> discord.Embed:
         for idx in range(start_idx, end_idx):
             item = queue[idx]
             duration_str = ""
-            if item.get("duration"):
-                mins, secs = divmod(item["duration"], 60)
+            if item.duration:
+                mins, secs = divmod(item.duration, 60)
                 duration_str = f" | ⏱️ {mins}:{secs:02d}"
-            queue_text += f"{idx+1}. **{item['title']}**{duration_str}\n"
+            queue_text += f"{idx+1}. **{item.title}**{duration_str}\n"
         
         embed.add_field(
             name=f"📜 Queue ({start_idx+1}-{end_idx} of {total_items})",
@@ -137,9 +137,9 @@ def create_queue_embed(guild_id: int, page: int = 0) -> discord.Embed:
 
 # Create embed for now playing display
 def create_nowplaying_embed(guild_id: int) -> discord.Embed:
-    state = player.get_guild_state(guild_id)
-    current = state.get("current")
-    voice_client = state.get("voice_client")
+    state = player.peek_guild_state(guild_id)
+    current = state.current if state else None
+    voice_client = state.voice_client if state else None
     
     # If nothing is playing
     if not current:
@@ -151,10 +151,10 @@ def create_nowplaying_embed(guild_id: int) -> discord.Embed:
         return embed
     
     # Extract song information
-    title = current.get("title", "Unknown")
-    duration = current.get("duration", 0)
-    thumbnail = current.get("thumbnail", "")
-    webpage_url = current.get("webpage_url", "")
+    title = current.title or "Unknown"
+    duration = current.duration or 0
+    thumbnail = current.thumbnail or ""
+    webpage_url = current.webpage_url or ""
     
     # Create embed with title and description
     embed = discord.Embed(
@@ -202,8 +202,7 @@ def create_nowplaying_embed(guild_id: int) -> discord.Embed:
     )
     
     # Add queue position
-    queue = state.get("queue", [])
-    queue_position = len(queue)
+    queue_position = len(state.queue) if state else 0
     embed.add_field(
         name="Queue",
         value=f"**{queue_position}** song(s) in queue",
@@ -285,9 +284,8 @@ async def component_test():
 
     # Test 4: Check if player.py module is functional
     try:
-        test_guild_id = 0  # Dummy guild ID for testing
-        state = player.get_guild_state(test_guild_id)
-        if isinstance(state, dict):
+        state = player.GuildMusicState()  # Detached state, not registered for any guild
+        if isinstance(state, player.GuildMusicState) and not state.queue:
             messages.append("Player module functional.")
         else:
             status = "🟧"
@@ -296,6 +294,24 @@ async def component_test():
         status = "🟧"
         messages.append(f"Warning: Player module test failed: {e}")
 
+    # Test 5: Report voice connections and ffmpeg processes
+    try:
+        stats = player.get_supervisor_stats()
+        messages.append(
+            f"Voice connections: {stats['voice_connections']}, ffmpeg processes: {stats['ffmpeg_processes']}"
+        )
+    except Exception as e:
+        status = "🟧"
+        messages.append(f"Warning: Voice supervisor stats failed: {e}")
+
+    # Test 6: Local audio cache (optional)
+    if player.audio_cache:
+        cache_stats = player.audio_cache.stats()
+        messages.append(
+            f"Audio cache: {cache_stats['files']} file(s), "
+            f"{cache_stats['bytes'] / 1048576:.0f}/{cache_stats['max_bytes'] / 1048576:.0f} MB"
+        )
+
     return {"status": status, "msg": " | ".join(messages)}
 
 # ----------------------------------------------------------------
@@ -377,7 +393,7 @@ async def handle_music_commands(client, message, user_message):
             await message.channel.send(f"**Joined voice channel: {channel.name}**")
             vc = message.guild.voice_client
             state = player.get_guild_state(message.guild.id)
-            state["voice_client"] = vc
+            state.voice_client = vc
         except discord.ClientException as e:
             await message.channel.send(f"❌ Failed to connect to voice channel: {e}")
             logging.error(f"Voice channel connect failed: {e}")
@@ -429,7 +445,7 @@ async def handle_music_commands(client, message, user_message):
         
         try:
             song = await player.add_to_queue(message.guild, query)
-            await message.channel.send(f"▶️ Added to queue: **{song['title']}**")
+            await message.channel.send(f"▶️ Added to queue: **{song.title}**")
         except player.PlayerError as e:
             logging.error(f"Play failed: {e}")
             await message.channel.send(f"❌ {e}")
@@ -445,8 +461,8 @@ async def handle_music_commands(client, message, user_message):
         if not message.guild or not await is_music_channel(message):
             return
 
-        state = player.get_guild_state(message.guild.id)
-        vc = state.get("voice_client")
+        state = player.peek_guild_state(message.guild.id)
+        vc = state.voice_client if state else None
 
         if not vc or not vc.is_playing():
             await message.channel.send("ℹ️ **Nothing is playing.**")
@@ -460,8 +476,8 @@ async def handle_music_commands(client, message, user_message):
         if not message.guild or not await is_music_channel(message):
             return
 
-        state = player.get_guild_state(message.guild.id)
-        vc = state.get("voice_client")
+        state = player.peek_guild_state(message.guild.id)
+        vc = state.voice_client if state else None
         if not vc or not vc.is_paused():
             await message.channel.send("ℹ️ **Nothing to resume.**")
             return
@@ -493,8 +509,8 @@ async def handle_music_commands(client, message, user_message):
         if not message.guild or not await is_music_channel(message):
             return
 
-        state = player.get_guild_state(message.guild.id)
-        vc = state.get("voice_client")
+        state = player.peek_guild_state(message.guild.id)
+        vc = state.voice_client if state else None
 
         if not vc:
             await message.channel.send("ℹ️ **Nothing to stop.**")
@@ -516,8 +532,9 @@ async def handle_music_commands(client, message, user_message):
         if not message.guild or not await is_music_channel(message):
             return
         
-        state = player.get_guild_state(message.guild.id)
-        queue = state.get("queue", [])
+        state = player.peek_guild_state(message.guild.id)
+        queue = state.queue if state else ()
+        current = state.current if state else None
         
         # Check if there is a page parameter
         page = 0
@@ -533,7 +550,7 @@ async def handle_music_commands(client, message, user_message):
             except (ValueError, IndexError):
                 page = 0
         
-        if not queue and not state.get("current"):
+        if not queue and not current:
             await message.channel.send("📭 **Queue is empty.**")
             return
         
@@ -552,8 +569,8 @@ async def handle_music_commands(client, message, user_message):
         if not message.guild or not await is_music_channel(message):
             return
         
-        state = player.get_guild_state(message.guild.id)
-        current = state.get("current")
+        state = player.peek_guild_state(message.guild.id)
+        current = state.current if state else None
         
         if not current:
             await message.channel.send("📭 **Nothing is playing.**")
@@ -585,7 +602,7 @@ async def handle_music_commands(client, message, user_message):
             return
         
         # Save to both state (RAM) and config (persistent)
-        state["repeat_mode"] = mode
+        state.repeat_mode = mode
         cfg["repeat_mode"] = mode
         save_server_config(message.guild.id, cfg)
         
@@ -2,12 +2,16 @@ import discord
 import discord.ext.commands
 import asyncio
 import logging
-import yt_dlp
 import os
 import shutil
 import platform
-from yt_dlp.utils import DownloadError, ExtractorError
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Any, TypedDict, IO, cast
+from internal import utils, lazy_import
+from internal.command_modules.music.audio_cache import AudioCache, make_cache_key
 
 # Copyright (c) 2026 Dennis Plischke.
 # All rights reserved.
@@ -36,26 +40,104 @@ logging.info(f"Platform: {PLATFORM} | Architecture: {ARCH} | Is Pi: {IS_PI}")
 VOICE_TIMEOUT = 30.0
 FFMPEG_TIMEOUT = 10.0
 
+# Optional "music" section in config.json
+MUSIC_CONFIG = utils.get_config_value("music", default={}) or {}
+
+# Idle guild states (no voice client, nothing queued) are dropped after this many seconds
+STATE_IDLE_TIMEOUT = float(MUSIC_CONFIG.get("state_idle_timeout", 600))
+STATE_SWEEP_INTERVAL = 60.0
+
+# Voice supervisor: disconnect after this many seconds without playback / without listeners
+VOICE_IDLE_TIMEOUT = float(MUSIC_CONFIG.get("voice_idle_timeout", 600))
+EMPTY_CHANNEL_TIMEOUT = float(MUSIC_CONFIG.get("empty_channel_timeout", 120))
+SUPERVISOR_INTERVAL = float(MUSIC_CONFIG.get("supervisor_interval", 30))
+
+# Stream Opus sources (YouTube formats 251/250/249) without decoding and re-encoding them
+OPUS_PASSTHROUGH = bool(MUSIC_CONFIG.get("opus_passthrough", True))
+
+# Spawn the next track's ffmpeg this many seconds before the current one ends (0 disables)
+PRESPAWN_LEAD = float(MUSIC_CONFIG.get("prespawn_lead", 8))
+
 bot_loop = None
-music_state = {}
+music_state: dict[int, "GuildMusicState"] = {}
 max_queue_size = 20 if IS_PI else 50
+_last_state_sweep = 0.0
 
 class PlayerError(Exception):
     """Raised when playback prerequisites are missing (e.g., ffmpeg)."""
 
+# A single track as returned by extract_audio
+@dataclass(slots=True)
+class Track:
+    title: str
+    url: str | None
+    webpage_url: str | None = None
+    duration: int | None = None
+    thumbnail: str | None = None
+    codec: str | None = None  # Audio codec reported by yt-dlp (e.g. "opus")
+    cache_key: str | None = None  # Key of the local audio cache file
+
+# Per-guild playback state (slotted to keep thousands of guilds cheap)
+@dataclass(slots=True)
+class GuildMusicState:
+    queue: deque[Track] = field(default_factory=deque)
+    current: Track | None = None
+    voice_client: discord.VoiceClient | None = None
+    playing: bool = False
+    repeat_mode: str = "off"  # off, one, or all
+    error_count: int = 0  # Track consecutive playback errors
+    last_error_time: float | None = None
+    last_active: float = field(default_factory=time.monotonic)
+    prepared: tuple[Track, discord.AudioSource] | None = None  # Pre-spawned source of the next track
+    prespawn_task: asyncio.Task | None = None
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def is_idle(self) -> bool:
+        return self.voice_client is None and not self.playing and not self.queue
+
+# Restore the persisted repeat mode so evicted states come back unchanged
+def _load_repeat_mode(guild_id: int) -> str:
+    try:
+        mode = utils.load_server_config(guild_id).get("repeat_mode", "off")
+    except Exception as e:
+        logging.debug(f"Could not load repeat mode for guild {guild_id}: {e}")
+        return "off"
+    return mode if mode in ("off", "one", "all") else "off"
+
 # Setup bot loop
-def get_guild_state(guild_id: int):
-    if guild_id not in music_state:
-        music_state[guild_id] = {
-            "queue": [],
-            "current": None,
-            "voice_client": None,
-            "playing": False,
-            "repeat_mode": "off",  # off, one, or all
-            "error_count": 0,  # Track consecutive playback errors
-            "last_error_time": None
-        }
-    return music_state[guild_id]
+def get_guild_state(guild_id: int) -> GuildMusicState:
+    evict_idle_states()
+    state = music_state.get(guild_id)
+    if state is None:
+        state = GuildMusicState(repeat_mode=_load_repeat_mode(guild_id))
+        music_state[guild_id] = state
+    state.touch()
+    return state
+
+# Read-only lookup that never creates a new state
+def peek_guild_state(guild_id: int) -> GuildMusicState | None:
+    return music_state.get(guild_id)
+
+# Drop states of guilds that have been idle for longer than the timeout
+def evict_idle_states(timeout: float = STATE_IDLE_TIMEOUT, force: bool = False) -> int:
+    global _last_state_sweep
+    now = time.monotonic()
+    if not force and now - _last_state_sweep < STATE_SWEEP_INTERVAL:
+        return 0
+    _last_state_sweep = now
+
+    stale = [
+        guild_id for guild_id, state in music_state.items()
+        if state.is_idle() and now - state.last_active > timeout
+    ]
+    for guild_id in stale:
+        del music_state[guild_id]
+
+    if stale:
+        logging.debug(f"Evicted {len(stale)} idle music state(s)")
+    return len(stale)
 
 # Youtube-dl and FFMPEG parameter types
 YtDlpParams = dict[str, Any]
@@ -127,6 +209,9 @@ BASE_FFMPEG_OPTIONS: FFmpegParams = {
     "options": "-vn -q:a 5",  # -q:a 5 for better quality/speed balance on Pi
 }
 
+# Opus passthrough only needs to drop the video stream, the audio is copied as-is
+OPUS_PASSTHROUGH_OPTIONS = "-vn"
+
 
 def resolve_ffmpeg_executable() -> str:
 # Resolve the ffmpeg executable path with error handling
@@ -194,23 +279,106 @@ def get_ffmpeg_options() -> FFmpegParams:
     opts.update(BASE_FFMPEG_OPTIONS)
     return opts
 
+# Opus passthrough source that counts the frames it delivered (see _passthrough_failed)
+class PassthroughAudio(discord.FFmpegOpusAudio):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.frames = 0
+        self.ended = False  # ffmpeg's stream ended (not stopped by a skip)
+
+    def read(self) -> bytes:
+        data = super().read()
+        if data:
+            self.frames += 1
+        else:
+            self.ended = True
+        return data
+
+# Create the audio source for a track, copying Opus streams and decoding everything else to PCM
+def create_audio_source(track: Track) -> discord.AudioSource:
+    options = get_ffmpeg_options()
+    source = track.url
+
+    # Prefer the local copy from the audio cache (no network reconnect options needed)
+    local_path = audio_cache.lookup(track.cache_key) if audio_cache else None
+    if local_path:
+        source = local_path
+        options.pop("before_options", None)
+        logging.debug(f"Playing '{track.title}' from audio cache")
+
+    audio: discord.AudioSource | None = None
+    if OPUS_PASSTHROUGH and track.codec == "opus":
+        try:
+            audio = PassthroughAudio(
+                source,
+                codec="copy",
+                executable=options["executable"],
+                before_options=options.get("before_options"),
+                options=OPUS_PASSTHROUGH_OPTIONS,
+            )
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logging.warning(f"Opus passthrough failed for '{track.title}', falling back to PCM: {e}")
+
+    if audio is None:
+        audio = discord.FFmpegPCMAudio(source, **options)
+    setattr(audio, "cache_path", local_path)  # Checked by _cached_file_missing after playback
+    return _track_ffmpeg(audio)
+
+# pids of the ffmpeg processes started for playback; only these are reaped by the supervisor
+# (yt-dlp also runs ffmpeg for audio cache downloads, those must be left alone)
+_playback_ffmpeg: set[int] = set()
+
+def _track_ffmpeg(source: discord.AudioSource) -> discord.AudioSource:
+    process = getattr(source, "_process", None)
+    if process is not None:
+        _playback_ffmpeg.add(process.pid)
+    return source
+
+# ----------------------------------------------------------------
+# Local Audio Cache (optional)
+# ----------------------------------------------------------------
+
+CACHE_CONFIG = MUSIC_CONFIG.get("cache", {}) or {}
+
+def _create_audio_cache() -> AudioCache | None:
+    if not CACHE_CONFIG.get("enabled", False):
+        return None
+    try:
+        return AudioCache(
+            directory=CACHE_CONFIG.get("directory") or os.path.join(utils.BASE_DATA_DIR, "audio_cache"),
+            max_bytes=int(CACHE_CONFIG.get("max_bytes", 1024 ** 3)),
+            min_plays=int(CACHE_CONFIG.get("min_plays", 2)),
+            ytdl_options=YTDLP_OPTIONS,
+        )
+    except OSError as e:
+        logging.error(f"Audio cache disabled: {e}")
+        return None
+
+audio_cache = _create_audio_cache()
+
 # ----------------------------------------------------------------
 # Search and Extract
 # ----------------------------------------------------------------
 
 # Extract audio information using yt-dlp
-def extract_audio(query: str):
+def extract_audio(query: str) -> Track:
     
 # Extract audio information from a query using yt-dlp with error handling.
 
+    # yt-dlp is imported on the first search instead of at bot startup
+    yt_dlp = lazy_import.load("yt_dlp")
+    yt_dlp_utils = lazy_import.load("yt_dlp.utils")
+
     try:
         with yt_dlp.YoutubeDL(cast(Any, YTDLP_OPTIONS)) as ydl:
             try:
                 info = ydl.extract_info(query, download=False)
-            except DownloadError as e:
+            except yt_dlp_utils.DownloadError as e:
                 # Video not found, age-restricted, or removed
                 raise PlayerError(f"Cannot download: {str(e)[:100]}")
-            except ExtractorError as e:
+            except yt_dlp_utils.ExtractorError as e:
                 # Extractor-specific error (wrong platform, auth required, etc.)
                 raise PlayerError(f"Extractor error: {str(e)[:100]}")
             except (TimeoutError, Exception) as e:
@@ -230,12 +398,15 @@ def extract_audio(query: str):
             if not info.get("title"):
                 raise PlayerError("Song title not found in results.")
 
-            return {
-                "title": info.get("title"),
-                "url": info.get("url"),
-                "webpage_url": info.get("webpage_url"),
-                "duration": info.get("duration"),
-            }
+            return Track(
+                title=info["title"],
+                url=info.get("url"),
+                webpage_url=info.get("webpage_url"),
+                duration=info.get("duration"),
+                thumbnail=info.get("thumbnail"),
+                codec=info.get("acodec"),
+                cache_key=make_cache_key(info.get("extractor_key"), info.get("id")),
+            )
     except PlayerError:
         raise  # Re-raise PlayerError as-is
     except Exception as e:
@@ -246,34 +417,121 @@ def extract_audio(query: str):
 # Playback Logic
 # ------------------------------------------------------------
 
-# Play the next song in the queue
-async def play_next(guild: discord.Guild):
+# The track play_next will pick after the current one (mirrors the repeat handling there)
+def _peek_next_track(state: GuildMusicState) -> Track | None:
+    current = state.current
+    if state.repeat_mode == "one" and current:
+        return current
+    if state.repeat_mode == "all" and current and not state.queue:
+        return current
+    return state.queue[0] if state.queue else None
+
+# Drop the pre-spawned source and stop its ffmpeg process
+def discard_prepared(state: GuildMusicState):
+    if state.prespawn_task and not state.prespawn_task.done():
+        state.prespawn_task.cancel()
+    state.prespawn_task = None
+
+    if state.prepared:
+        track, source = state.prepared
+        state.prepared = None
+        try:
+            source.cleanup()
+        except Exception as e:
+            logging.debug(f"Error cleaning up prepared source for '{track.title}': {e}")
+
+# Spawn the next track's ffmpeg shortly before the current track ends so it can
+# open the stream (reconnect handshake) and fill its pipe while we still play
+async def _prespawn_next(state: GuildMusicState, track: Track, voice_client: discord.VoiceClient):
+    remaining = (track.duration or 0) - PRESPAWN_LEAD
+    try:
+        # Count only time actually spent playing, pauses push the spawn back
+        while remaining > 0:
+            step = min(remaining, 5.0)
+            await asyncio.sleep(step)
+            if state.current is not track or not voice_client.is_connected():
+                return
+            if voice_client.is_playing():
+                remaining -= step
+            elif not voice_client.is_paused():
+                return  # Stopped or skipped
+
+        next_track = _peek_next_track(state)
+        if not next_track or not next_track.url:
+            return
+
+        source = create_audio_source(next_track)
+        if state.current is not track or state.prepared is not None:
+            source.cleanup()
+            return
+        state.prepared = (next_track, source)
+        logging.debug(f"Pre-spawned ffmpeg for next track '{next_track.title}'")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # Not fatal: play_next falls back to spawning the source itself
+        logging.warning(f"Could not pre-spawn next track: {e}")
+
+# Take the pre-spawned source if it belongs to this track, otherwise discard it
+def _take_prepared(state: GuildMusicState, song: Track) -> discord.AudioSource | None:
+    prepared = state.prepared
+    if prepared and prepared[0] is song:
+        state.prepared = None
+        return prepared[1]
+    discard_prepared(state)
+    return None
+
+# A passthrough source that ends or fails within its first second of audio is retried as PCM;
+# later failures (network drop near the end, ...) take the normal error path
+PASSTHROUGH_MIN_FRAMES = 50  # 20 ms Opus frames
+
+# Check whether an Opus passthrough source failed right at the start of playback
+def _passthrough_failed(source: discord.AudioSource, error: Exception | None) -> bool:
+    if not isinstance(source, PassthroughAudio):
+        return False
+    # Few frames without an error or the end of the stream means the track was skipped
+    return source.frames < PASSTHROUGH_MIN_FRAMES and (error is not None or source.ended)
+
+# Check whether a track played from the audio cache failed because its file is gone
+# (runs in the player thread, the event loop never waits for the filesystem)
+def _cached_file_missing(source: discord.AudioSource) -> bool:
+    path = getattr(source, "cache_path", None)
+    return bool(path) and not os.path.isfile(path)
+
+# Play the next song in the queue (or replay `retry` after a failed passthrough or missing cache file)
+async def play_next(guild: discord.Guild, retry: Track | None = None):
     state = get_guild_state(guild.id)
-    repeat_mode = state.get("repeat_mode", "off")
-    current = state.get("current")
+    if state.prespawn_task and not state.prespawn_task.done():
+        state.prespawn_task.cancel()
+    state.prespawn_task = None
+    repeat_mode = state.repeat_mode
+    current = state.current
 
     # Handle repeat modes
-    if repeat_mode == "one" and current:
+    if retry is not None:
+        song = retry
+    elif repeat_mode == "one" and current:
         song = current
-    elif repeat_mode == "all" and current and not state["queue"]:
+    elif repeat_mode == "all" and current and not state.queue:
         song = current
     else:
-        if not state["queue"]:
-            state["playing"] = False
-            state["current"] = None
+        if not state.queue:
+            state.playing = False
+            state.current = None
+            discard_prepared(state)
             return
         
-        song = state["queue"].pop(0)
+        song = state.queue.popleft()
     
-    state["current"] = song
-    state["playing"] = True
+    state.current = song
+    state.playing = True
     
     # Get voice client
     vc = guild.voice_client
     if not vc:
         logging.warning(f"No active voice connection for guild {guild.id}")
-        state["playing"] = False
-        state["current"] = None
+        state.playing = False
+        state.current = None
         return
     
     # Cast to VoiceClient for type checking
@@ -281,57 +539,76 @@ async def play_next(guild: discord.Guild):
     
     try:
         # Validate song URL before creating FFmpeg source
-        if not song.get("url"):
-            logging.error(f"Invalid song: no URL available for '{song.get('title', 'Unknown')}'")
+        if not song.url:
+            logging.error(f"Invalid song: no URL available for '{song.title}'")
             # Skip to next song instead of stopping
             await play_next(guild)
             return
         
-        # Create FFmpeg source with timeout handling
+        # Use the pre-spawned source if there is one, else create the FFmpeg source now
         try:
-            source = discord.FFmpegPCMAudio(song["url"], **get_ffmpeg_options())
+            source = _take_prepared(state, song) or create_audio_source(song)
         except FileNotFoundError as e:
             raise PlayerError(f"ffmpeg executable not found: {e}")
         except ValueError as e:
             # Invalid URL or codec
-            logging.warning(f"Invalid audio source for '{song.get('title', 'Unknown')}': {e}")
+            logging.warning(f"Invalid audio source for '{song.title}': {e}")
             raise PlayerError(f"Invalid audio source: {str(e)[:100]}")
         
         loop = voice_client.client.loop
         
         def after_play(error):
-            if error:
-                error_str = str(error).lower()
-                # Ignore harmless reconnect messages from FFmpeg
-                if "connection reset" in error_str or "io error" in error_str:
-                    logging.warning(f"Network blip during playback: {error}")
-                else:
-                    logging.error(f"Playback error: {error}")
-                    state["error_count"] = state.get("error_count", 0) + 1
-                    # Stop after 5 consecutive errors
-                    if state["error_count"] >= 5:
-                        logging.error(f"Too many consecutive errors ({state['error_count']}). Stopping playback.")
-                        state["playing"] = False
-                        state["error_count"] = 0
-                        return
+            error_str = str(error).lower() if error else ""
+            if _cached_file_missing(source):
+                # Replay the track from its stream URL (the cache entry is dropped first)
+                logging.warning(f"Cached audio for '{song.title}' is missing, streaming it instead")
+                if audio_cache:
+                    audio_cache.forget(song.cache_key)
+                loop.call_soon_threadsafe(asyncio.create_task, play_next(guild, retry=song))
+                return
+            if _passthrough_failed(source, error):
+                # Replay the track once, decoded to PCM (codec None -> no passthrough next time)
+                logging.warning(f"Opus passthrough failed at the start of '{song.title}', replaying as PCM: {error or 'stream ended immediately'}")
+                song.codec = None
+                loop.call_soon_threadsafe(asyncio.create_task, play_next(guild, retry=song))
+                return
+            # Ignore harmless reconnect messages from FFmpeg
+            elif "connection reset" in error_str or "io error" in error_str:
+                logging.warning(f"Network blip during playback: {error}")
+            elif error:
+                logging.error(f"Playback error: {error}")
+                state.error_count += 1
+                state.last_error_time = time.time()
+                # Stop after 5 consecutive errors
+                if state.error_count >= 5:
+                    logging.error(f"Too many consecutive errors ({state.error_count}). Stopping playback.")
+                    state.playing = False
+                    state.error_count = 0
+                    return
             else:
-                state["error_count"] = 0  # Reset on success
+                state.error_count = 0  # Reset on success
             
             loop.call_soon_threadsafe(asyncio.create_task, play_next(guild))
         
         voice_client.play(source, after=after_play)
-        logging.info(f"Now playing: {song['title']} on guild {guild.id}")
+        logging.info(f"Now playing: {song.title} on guild {guild.id}")
+
+        if audio_cache:
+            audio_cache.record_play(song.cache_key, song.webpage_url)
+
+        if PRESPAWN_LEAD > 0 and song.duration:
+            state.prespawn_task = loop.create_task(_prespawn_next(state, song, voice_client))
         
     except PlayerError as e:
         logging.error(f"Player error: {e}")
-        state["playing"] = False
-        state["current"] = None
+        state.playing = False
+        state.current = None
         # Try next song instead of stopping
         await play_next(guild)
     except discord.ClientException as e:
         logging.error(f"Discord error while playing: {e}")
-        state["playing"] = False
-        state["current"] = None
+        state.playing = False
+        state.current = None
         # Try next song
         await play_next(guild)
     except Exception as e:
@@ -340,18 +617,18 @@ async def play_next(guild: discord.Guild):
             logging.warning(f"Network issue while starting playback: {e}")
         else:
             logging.error(f"Unexpected error during playback: {e}")
-        state["playing"] = False
-        state["current"] = None
+        state.playing = False
+        state.current = None
         # Try next song instead of stopping
         await play_next(guild)
 
 # Add a song to the queue
-async def add_to_queue(guild: discord.Guild, query: str):
+async def add_to_queue(guild: discord.Guild, query: str) -> Track:
 # Add a song to the queue with error handling.
 
     state = get_guild_state(guild.id)
 
-    if len(state["queue"]) >= max_queue_size:
+    if len(state.queue) >= max_queue_size:
         raise PlayerError(f"Queue limit reached ({max_queue_size} tracks).")
 
     try:
@@ -363,9 +640,9 @@ async def add_to_queue(guild: discord.Guild, query: str):
         logging.error(f"Unexpected error extracting audio: {e}")
         raise PlayerError(f"Failed to add track: {str(e)[:100]}")
     
-    state["queue"].append(song)
+    state.queue.append(song)
 
-    if not state["playing"]:
+    if not state.playing:
         await play_next(guild)
 
     return song
@@ -379,16 +656,17 @@ async def add_to_queue(guild: discord.Guild, query: str):
 def pause(guild_id: int):
 # Pause playback with error handling.
 
-    state = music_state.get(guild_id)
+    state = peek_guild_state(guild_id)
     if not state:
         logging.warning(f"No music state for guild {guild_id}")
         return
     
-    voice_client = state.get("voice_client")
+    voice_client = state.voice_client
     if not voice_client:
         logging.warning(f"No voice client for guild {guild_id}")
         return
     
+    state.touch()
     try:
         if voice_client.is_playing():
             voice_client.pause()
@@ -404,16 +682,17 @@ def pause(guild_id: int):
 def resume(guild_id: int):
 # Resume playback with error handling.
 
-    state = music_state.get(guild_id)
+    state = peek_guild_state(guild_id)
     if not state:
         logging.warning(f"No music state for guild {guild_id}")
         return
     
-    voice_client = state.get("voice_client")
+    voice_client = state.voice_client
     if not voice_client:
         logging.warning(f"No voice client for guild {guild_id}")
         return
     
+    state.touch()
     try:
         if voice_client.is_paused():
             voice_client.resume()
@@ -427,8 +706,12 @@ def resume(guild_id: int):
 
 # Graceful Stop
 async def stop(guild_id: int):
-    state = get_guild_state(guild_id)
-    voice_client = state.get("voice_client")
+    state = peek_guild_state(guild_id)
+    if not state:
+        logging.debug(f"No music state to stop for guild {guild_id}")
+        return
+    voice_client = state.voice_client
+    discard_prepared(state)
     
     if voice_client:
         try:
@@ -441,15 +724,18 @@ async def stop(guild_id: int):
             logging.error(f"Error stopping playback: {e}")
     
     # Clear queue and reset state
-    state["queue"].clear()
-    state["current"] = None
-    state["playing"] = False
+    state.queue.clear()
+    state.current = None
+    state.playing = False
+    state.touch()
     logging.info(f"Playback stopped for guild {guild_id}")
 
 # Graceful Disconnect
 async def disconnect(guild_id: int):
-    state = get_guild_state(guild_id)
-    voice_client = state.get("voice_client")
+    state = peek_guild_state(guild_id)
+    voice_client = state.voice_client if state else None
+    if state:
+        discard_prepared(state)
     
     if voice_client:
         try:
@@ -464,16 +750,20 @@ async def disconnect(guild_id: int):
         except Exception as e:
             logging.error(f"Error disconnecting: {e}")
         finally:
-            state["voice_client"] = None
-            state["queue"].clear()
-            state["current"] = None
-            state["playing"] = False
+            if state:
+                state.voice_client = None
+                state.queue.clear()
+                state.current = None
+                state.playing = False
     
+    # Nothing left to keep for this guild; repeat mode is restored from config on next use
+    music_state.pop(guild_id, None)
     logging.info(f"Disconnected from voice for guild {guild_id}")
 
 async def cleanup_all_guilds(bot: discord.ext.commands.Bot):
 # Cleanup all voice connections and clear music state before shutdown.
 
+    stop_supervisor()
     try:
         for guild in bot.guilds:
             try:
@@ -486,6 +776,224 @@ async def cleanup_all_guilds(bot: discord.ext.commands.Bot):
         
         # Clear all music states
         music_state.clear()
+        reap_ffmpeg_processes(bot)
+        if audio_cache:
+            audio_cache.shutdown()
         logging.info("Music state cleaned up")
     except Exception as e:
-        logging.error(f"Error during music cleanup: {e}")
\ No newline at end of file
+        logging.error(f"Error during music cleanup: {e}")
+
+# ------------------------------------------------------------
+# Voice Supervisor (idle disconnect and ffmpeg reaper)
+# ------------------------------------------------------------
+
+_supervisor_task: asyncio.Task | None = None
+_idle_since: dict[int, float] = {}
+_empty_since: dict[int, float] = {}
+_stray_ffmpeg: set[int] = set()
+
+supervisor_stats = {
+    "voice_connections": 0,
+    "ffmpeg_processes": 0,
+    "idle_disconnects": 0,
+    "reaped_processes": 0,
+}
+
+# Collect the pids of ffmpeg processes that are still attached to a voice client
+def _active_ffmpeg_pids(bot: discord.ext.commands.Bot) -> set[int]:
+    pids = set()
+    for vc in bot.voice_clients:
+        source = getattr(vc, "source", None)
+        # Unwrap transformers like PCMVolumeTransformer
+        while source is not None and hasattr(source, "original"):
+            source = source.original
+        process = getattr(source, "_process", None)
+        if process is not None and process.poll() is None:
+            pids.add(process.pid)
+
+    # Pre-spawned sources waiting for the current track to end
+    for state in music_state.values():
+        if state.prepared:
+            process = getattr(state.prepared[1], "_process", None)
+            if process is not None and process.poll() is None:
+                pids.add(process.pid)
+    return pids
+
+# List (pid, state) of all ffmpeg child processes of this bot (Linux /proc only)
+def _list_ffmpeg_children() -> list[tuple[int, str]]:
+    if not os.path.isdir("/proc"):
+        return []
+
+    own_pid = os.getpid()
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as fh:
+                stat = fh.read()
+        except OSError:
+            continue  # Process exited meanwhile
+
+        # Format: pid (comm) state ppid ...
+        comm = stat[stat.find("(") + 1:stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2:].split()
+        if len(fields) < 2 or not comm.startswith("ffmpeg"):
+            continue
+        if int(fields[1]) == own_pid:
+            children.append((int(entry), fields[0]))
+    return children
+
+# Count ffmpeg child processes (alive or zombie)
+def count_ffmpeg_processes() -> int:
+    return len(_list_ffmpeg_children())
+
+# Reap zombie playback ffmpeg children and kill the ones no voice client owns anymore
+def reap_ffmpeg_processes(bot: discord.ext.commands.Bot) -> int:
+    global _stray_ffmpeg
+    if IS_WINDOWS:
+        return 0
+
+    active = _active_ffmpeg_pids(bot)
+    reaped = 0
+    strays = set()
+    children = _list_ffmpeg_children()
+
+    # Forget playback processes that are gone (their pid may be reused later)
+    _playback_ffmpeg.intersection_update(pid for pid, _ in children)
+
+    for pid, proc_state in children:
+        if pid in active or pid not in _playback_ffmpeg:
+            continue
+        try:
+            if proc_state == "Z":
+                os.waitpid(pid, os.WNOHANG)
+                reaped += 1
+            elif pid in _stray_ffmpeg:
+                # Unowned for two sweeps in a row -> orphaned by a crashed/stopped player
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                logging.warning(f"Killed orphaned ffmpeg process {pid}")
+                reaped += 1
+            else:
+                strays.add(pid)
+        except ChildProcessError:
+            pass  # Already reaped by its owner
+        except ProcessLookupError:
+            pass  # Exited on its own
+        except OSError as e:
+            logging.error(f"Failed to reap ffmpeg process {pid}: {e}")
+
+    _stray_ffmpeg = strays
+    supervisor_stats["reaped_processes"] += reaped
+    return reaped
+
+# Disconnect voice clients whose channel is empty or which have been idle for too long
+async def disconnect_idle_voice_clients(bot: discord.ext.commands.Bot) -> int:
+    now = time.monotonic()
+    disconnected = 0
+    connected_guilds = set()
+
+    for vc in list(bot.voice_clients):
+        guild = getattr(vc, "guild", None)
+        if guild is None:
+            continue
+        connected_guilds.add(guild.id)
+        voice_client = cast(discord.VoiceClient, vc)
+
+        reason = None
+        if not voice_client.is_connected():
+            reason = "connection lost"
+        else:
+            # Channel without human listeners
+            channel = voice_client.channel
+            members = getattr(channel, "members", [])
+            if not any(not member.bot for member in members):
+                since = _empty_since.setdefault(guild.id, now)
+                if now - since >= EMPTY_CHANNEL_TIMEOUT:
+                    reason = "voice channel empty"
+            else:
+                _empty_since.pop(guild.id, None)
+
+            # Nothing playing (stopped, paused or queue finished)
+            if voice_client.is_playing():
+                _idle_since.pop(guild.id, None)
+            else:
+                since = _idle_since.setdefault(guild.id, now)
+                if reason is None and now - since >= VOICE_IDLE_TIMEOUT:
+                    reason = "no playback"
+
+        if reason is None:
+            continue
+
+        try:
+            state = peek_guild_state(guild.id)
+            if state and state.voice_client:
+                await disconnect(guild.id)
+            else:
+                await voice_client.disconnect(force=True)
+            disconnected += 1
+            logging.info(f"Auto-disconnected from voice in guild {guild.id} ({reason})")
+        except Exception as e:
+            logging.error(f"Error auto-disconnecting from guild {guild.id}: {e}")
+        finally:
+            _idle_since.pop(guild.id, None)
+            _empty_since.pop(guild.id, None)
+
+    # Forget timers and stale voice client references of guilds without a connection
+    for guild_id in list(_idle_since):
+        if guild_id not in connected_guilds:
+            _idle_since.pop(guild_id, None)
+    for guild_id in list(_empty_since):
+        if guild_id not in connected_guilds:
+            _empty_since.pop(guild_id, None)
+    for guild_id, state in music_state.items():
+        if state.voice_client is not None and guild_id not in connected_guilds:
+            state.voice_client = None
+            state.playing = False
+
+    supervisor_stats["idle_disconnects"] += disconnected
+    return disconnected
+
+# Report counts of voice connections and ffmpeg processes
+def get_supervisor_stats(bot: discord.ext.commands.Bot | None = None) -> dict[str, int]:
+    if bot is not None:
+        supervisor_stats["voice_connections"] = len(bot.voice_clients)
+    supervisor_stats["ffmpeg_processes"] = count_ffmpeg_processes()
+    stats = dict(supervisor_stats)
+    stats["guild_states"] = len(music_state)
+    return stats
+
+async def _supervisor_loop(bot: discord.ext.commands.Bot):
+    while True:
+        try:
+            await asyncio.sleep(SUPERVISOR_INTERVAL)
+            await disconnect_idle_voice_clients(bot)
+            reap_ffmpeg_processes(bot)
+            evict_idle_states(force=True)
+            stats = get_supervisor_stats(bot)
+            logging.debug(
+                f"Voice supervisor: {stats['voice_connections']} voice connection(s), "
+                f"{stats['ffmpeg_processes']} ffmpeg process(es), {stats['guild_states']} guild state(s)"
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in voice supervisor: {e}", exc_info=True)
+
+# Start the background supervisor (safe to call on every on_ready)
+def start_supervisor(bot: discord.ext.commands.Bot):
+    global _supervisor_task
+    if _supervisor_task and not _supervisor_task.done():
+        return
+    _supervisor_task = asyncio.get_running_loop().create_task(_supervisor_loop(bot))
+    logging.info(
+        f"Voice supervisor started (idle timeout {VOICE_IDLE_TIMEOUT:.0f}s, "
+        f"empty channel timeout {EMPTY_CHANNEL_TIMEOUT:.0f}s)"
+    )
+
+def stop_supervisor():
+    global _supervisor_task
+    if _supervisor_task and not _supervisor_task.done():
+        _supervisor_task.cancel()
+    _supervisor_task = None
@@ -4,6 +4,7 @@ import asyncio
 import logging
 from internal import utils
 from internal import rate_limiter
+from internal import http_client
 
 # Copyright (c) 2026 Dennis Plischke.
 # All rights reserved.
@@ -33,7 +34,7 @@ async def component_test():
         messages.append(f"Rules Channel in config: {rules_channel}")
         
     try:
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session() as session:
             async with session.get('https://catfact.ninja/fact', timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     messages.append("Catfact API reachable.")
@@ -63,7 +64,7 @@ async def handle_public_commands(client, message, user_message):
     if user_message == '!help':
         try:
             embed = discord.Embed(title="Help", description="Possible Commands", color=0x00ff00)
-            embed.add_field(name="[System]", value="/shutdown, /full-shutdown, /restart, /log, /status, /debugmode, /whitelist, /logging, /logging_channel ", inline=False)
+            embed.add_field(name="[System]", value="/shutdown, /full-shutdown, /restart, /log, /status, /debugmode, /whitelist, /logging, /logging_channel, /api-status ", inline=False)
             embed.add_field(name="[Public]", value="!help, !info, !rules, !userinfo, !serverinfo", inline=False)
             embed.add_field(name="[Moderation]", value="!kick, !ban, !unban, !timeout, !untimeout, !reactionrole", inline=False)
             embed.add_field(name="[Science]", value="!apod, !marsphoto, !asteroids, !sun, !exoplanet", inline=False)
@@ -255,7 +256,7 @@ async def handle_public_commands(client, message, user_message):
         
         async def get_catfact():
             try:
-                async with aiohttp.ClientSession() as session:
+                async with http_client.session() as session:
                     async with session.get('https://catfact.ninja/fact', timeout=aiohttp.ClientTimeout(total=5)) as response:
                         if response.status == 200:
                             try:
@@ -1,14 +1,21 @@
 import discord
 import logging
 import os
-import io
-import csv
 import aiohttp
 import asyncio
+import time
+import sqlite3
 import urllib.parse
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from typing import Any, Tuple
 from dotenv import load_dotenv
 from internal import rate_limiter
+from internal import http_client
+from internal import utils
+from internal import circuit_breaker
+from internal.cache import LRUCache
+from internal.command_modules import exoplanet_catalog
 
 # Copyright (c) 2026 Dennis Plischke.
 # All rights reserved.
@@ -38,6 +45,271 @@ async def safe_send(message_obj, content=None, embed=None, view=None):
         logging.error(f"Failed to send message: {e}")
         return None
 
+# ----------------------------------------------------------------
+# NASA Response Cache
+# ----------------------------------------------------------------
+
+# Optional "nasa_cache" section in config.json (seconds)
+NASA_CACHE_CONFIG = utils.get_config_value("nasa_cache", default={}) or {}
+NASA_CACHE_ENTRIES = int(NASA_CACHE_CONFIG.get("entries", 128))
+NEO_TTL = float(NASA_CACHE_CONFIG.get("neo_ttl", 3600))  # Today's asteroid feed barely changes within an hour
+DONKI_TTL = float(NASA_CACHE_CONFIG.get("donki_ttl", 300))  # Space weather events
+MARS_TTL = float(NASA_CACHE_CONFIG.get("mars_ttl", 86400))  # Photos of past days never change
+MARS_TODAY_TTL = float(NASA_CACHE_CONFIG.get("mars_today_ttl", 3600))  # Photos of today may still arrive
+STALE_TTL = float(NASA_CACHE_CONFIG.get("stale_ttl", 21600))  # How long expired data is served while refreshing
+DONKI_DEADLINE = float(NASA_CACHE_CONFIG.get("donki_deadline", 10))  # All DONKI requests of one !sun together
+PREFETCH_ENABLED = bool(NASA_CACHE_CONFIG.get("prefetch", True))  # Fill the cache with the daily content in the background
+PREFETCH_DELAY = float(NASA_CACHE_CONFIG.get("prefetch_delay", 300))  # After a date change, give NASA time to publish
+PREFETCH_RETRY = float(NASA_CACHE_CONFIG.get("prefetch_retry", 120))  # When a prefetch was skipped or failed
+PREFETCH_RESERVE = int(NASA_CACHE_CONFIG.get("prefetch_reserve", 2))  # api_limiter_nasa tokens always left for users
+
+# APOD switches to the next picture at midnight US Eastern time
+try:
+    APOD_TIMEZONE = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:
+    APOD_TIMEZONE = timezone(timedelta(hours=-5))
+
+# Raised when a request has to go to NASA but no api_limiter_nasa token is left
+class NasaRateLimited(Exception):
+    pass
+
+class NasaResponseCache:
+    # JSON responses by endpoint and parameters; expired entries stay usable for STALE_TTL
+    # and are served while one background request refreshes them (stale-while-revalidate)
+    def __init__(self, max_entries: int):
+        self.entries = LRUCache(max_entries=max_entries)  # key -> (data, fresh until (monotonic))
+        self.revalidating: dict[str, asyncio.Task] = {}
+        self.stale_hits = 0
+
+    # Returns (data, is_fresh) or None
+    def lookup(self, key: str) -> Tuple[Any, bool] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        data, fresh_until = entry
+        return data, time.monotonic() < fresh_until
+
+    # Fresh or stale entry present (does not count as a cache lookup)
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    # Fresh entry present (does not count as a cache lookup)
+    def is_fresh(self, key: str) -> bool:
+        entry = self.entries.peek(key)
+        return entry is not None and time.monotonic() < entry[1]
+
+    def store(self, key: str, data: Any, ttl: float):
+        self.entries.set(key, (data, time.monotonic() + ttl), ttl=ttl + STALE_TTL)
+
+    # Refresh an expired entry in the background (at most one request per key)
+    def revalidate(self, key: str, url: str, ttl: float):
+        self.stale_hits += 1
+        if key in self.revalidating:
+            return
+        # Refreshing is optional, so it only uses a token when one is free
+        allowed, _ = rate_limiter.api_limiter_nasa.is_allowed("global")
+        if not allowed:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, url, ttl))
+        self.revalidating[key] = task
+        task.add_done_callback(lambda _: self.revalidating.pop(key, None))
+
+    async def _refresh(self, key: str, url: str, ttl: float):
+        try:
+            status, data = await fetch_nasa_json(url)
+            if status == 200:
+                self.store(key, data, ttl)
+                logging.debug(f"NASA cache refreshed: {key}")
+            else:
+                logging.warning(f"NASA cache refresh for {key} failed: Status {status}")
+        except Exception as e:
+            logging.warning(f"NASA cache refresh for {key} failed: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        stats = self.entries.stats()
+        stats["stale_hits"] = self.stale_hits
+        return stats
+
+NASA_CACHE = NasaResponseCache(NASA_CACHE_ENTRIES)
+
+# Seconds until the next APOD (shortly after midnight in New York)
+def seconds_until_apod_rollover() -> float:
+    now = datetime.now(APOD_TIMEZONE)
+    rollover = (now + timedelta(days=1)).replace(hour=0, minute=5, second=0, microsecond=0)
+    return max(60.0, (rollover - now).total_seconds())
+
+# Plain GET of a NASA endpoint; returns (status, parsed JSON or None)
+async def fetch_nasa_json(url: str, timeout: float = 10) -> Tuple[int, Any]:
+    async with http_client.session() as session:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status != 200:
+                return response.status, None
+            return 200, await response.json()
+
+# GET through the response cache; only cache misses use an api_limiter_nasa token
+# limit=False when the caller already took a token for this command
+async def cached_nasa_json(key: str, url: str, ttl: float, limit: bool = True) -> Tuple[int, Any]:
+    cached = NASA_CACHE.lookup(key)
+    if cached is not None:
+        data, fresh = cached
+        if not fresh:
+            NASA_CACHE.revalidate(key, url, ttl)
+        logging.debug(f"NASA response served from cache ({'fresh' if fresh else 'stale'}): {key}")
+        return 200, data
+
+    if limit:
+        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
+        if not allowed:
+            raise NasaRateLimited(error_msg)
+
+    status, data = await fetch_nasa_json(url)
+    if status == 200:
+        NASA_CACHE.store(key, data, ttl)
+    return status, data
+
+# ----------------------------------------------------------------
+# NASA Requests (shared by the commands and the prefetch)
+# ----------------------------------------------------------------
+
+DONKI_ENDPOINTS = {
+    "cme": "CME",
+    "flare": "FLR",
+    "storm": "GST",
+    "shock": "IPS",
+    "particle": "SEP"
+}
+
+# (cache key, url, ttl) of each request
+def apod_request() -> Tuple[str, str, float]:
+    return "apod", f'https://api.nasa.gov/planetary/apod?api_key={NASA_API_KEY}', seconds_until_apod_rollover()
+
+# !asteroids shows the local date of the bot
+def neo_request() -> Tuple[str, str, float]:
+    today = datetime.now().strftime('%Y-%m-%d')
+    url = f"https://api.nasa.gov/neo/rest/v1/feed?start_date={today}&end_date={today}&api_key={NASA_API_KEY}"
+    return f"neo:{today}", url, NEO_TTL
+
+def donki_request(endpoint: str, today: str) -> Tuple[str, str, float]:
+    return f"donki:{endpoint}:{today}", f"https://api.nasa.gov/DONKI/{endpoint}?startDate={today}&api_key={NASA_API_KEY}", DONKI_TTL
+
+# ----------------------------------------------------------------
+# Prefetch Scheduler
+# ----------------------------------------------------------------
+
+# The exoplanet count is answered from the local snapshot (exoplanet_catalog), so it needs no prefetch
+
+_prefetch_task: asyncio.Task | None = None
+
+# Take an api_limiter_nasa token only while enough are left for user commands
+def _take_prefetch_token() -> bool:
+    if rate_limiter.api_limiter_nasa.get_remaining("global") <= PREFETCH_RESERVE:
+        return False
+    allowed, _ = rate_limiter.api_limiter_nasa.is_allowed("global")
+    return allowed
+
+# Fetch the entries of one job that are not fresh, with a single token like the command would use
+# Returns True when everything of the job is cached
+async def _prefetch_job(name: str, requests: list[Tuple[str, str, float]]) -> bool:
+    missing = [request for request in requests if not NASA_CACHE.is_fresh(request[0])]
+    if not missing:
+        return True
+    if not _take_prefetch_token():
+        logging.debug(f"Prefetch of {name} postponed, NASA rate limit reserved for users")
+        return False
+
+    responses = await asyncio.gather(*(fetch_nasa_json(url) for _, url, _ in missing), return_exceptions=True)
+    complete = True
+    for (key, _, ttl), response in zip(missing, responses):
+        if isinstance(response, BaseException):
+            logging.warning(f"Prefetch of {key} failed: {response}")
+            complete = False
+        elif response[0] != 200:
+            logging.warning(f"Prefetch of {key} failed: Status {response[0]}")
+            complete = False
+        else:
+            NASA_CACHE.store(key, response[1], ttl)
+    if complete:
+        logging.debug(f"Prefetched {name} ({len(missing)} request(s))")
+    return complete
+
+# Daily content: APOD, today's asteroid feed and today's DONKI events (as shown by !sun)
+async def run_prefetch() -> bool:
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    jobs = {
+        "APOD": [apod_request()],
+        "asteroids": [neo_request()],
+        "solar activity": [donki_request(endpoint, today) for endpoint in DONKI_ENDPOINTS.values()],
+    }
+    complete = True
+    for name, requests in jobs.items():
+        try:
+            complete = await _prefetch_job(name, requests) and complete
+        except Exception as e:
+            logging.warning(f"Prefetch of {name} failed: {e}")
+            complete = False
+    return complete
+
+# Seconds until cached content becomes outdated: UTC midnight (DONKI),
+# local midnight (asteroids) or the APOD switch in New York
+def seconds_until_next_prefetch() -> float:
+    now = datetime.now(timezone.utc)
+    utc_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    local_now = datetime.now().astimezone()
+    local_midnight = (local_now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return min(
+        (utc_midnight - now).total_seconds(),
+        (local_midnight - local_now).total_seconds(),
+        seconds_until_apod_rollover(),
+    ) + PREFETCH_DELAY
+
+async def _prefetch_loop():
+    retry = PREFETCH_RETRY
+    while True:
+        if await run_prefetch():
+            retry = PREFETCH_RETRY
+            delay = seconds_until_next_prefetch()
+        else:
+            # Back off while NASA keeps failing, but never beyond the next date change
+            delay = min(retry, seconds_until_next_prefetch())
+            retry = min(retry * 2, 3600)
+        logging.debug(f"Next NASA prefetch in {delay:.0f}s")
+        await asyncio.sleep(delay)
+
+# Start prefetching the daily NASA content (right away, then after every date change)
+def start_prefetch():
+    global _prefetch_task
+    if not PREFETCH_ENABLED or (_prefetch_task and not _prefetch_task.done()):
+        return
+    if not NASA_API_KEY:
+        logging.warning("NASA prefetch disabled: NASA_API_KEY not present in .env file.")
+        return
+    _prefetch_task = asyncio.get_running_loop().create_task(_prefetch_loop())
+    logging.info("NASA prefetch scheduler started")
+
+def stop_prefetch():
+    global _prefetch_task
+    if _prefetch_task and not _prefetch_task.done():
+        _prefetch_task.cancel()
+    _prefetch_task = None
+
+# Live TAP query of the Exoplanet Archive (only until the local snapshot exists)
+# Uses an api_limiter_nasa token; rows are parsed while the response streams in and
+# reading stops after `limit` rows (deduplicated on `unique`)
+async def fetch_exoplanet_rows(query: str, max_rows: int | None = None, limit: int | None = None,
+                               unique: str | None = None) -> list[dict[str, str]]:
+    allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
+    if not allowed:
+        raise NasaRateLimited(error_msg)
+
+    url = f"{exoplanet_catalog.TAP_URL}?query={urllib.parse.quote(query)}&format=csv"
+    if max_rows:
+        url += f"&MAXREC={max_rows}"
+    async with http_client.session() as session:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                raise Exception(f"API returned {response.status}")
+            return await exoplanet_catalog.read_csv_rows(response, limit=limit, unique=unique)
+
 async def component_test():
     status = "🟩"
     messages = ["Sciencecific commands module loaded."]
@@ -48,7 +320,7 @@ async def component_test():
         messages.append("Warning: NASA_API_KEY not present in .env file.")
         
     try:
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session() as session:
             async with session.get('https://api.nasa.gov/planetary/apod', timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 403:
                     messages.append("NASA API reachable.")
@@ -59,6 +331,10 @@ async def component_test():
     except Exception as e:
         status = "🟧"
         messages.append(f"API not reachable: {e}")
+
+    cache_stats = NASA_CACHE.stats()
+    messages.append(f"NASA cache: {cache_stats['entries']} responses, {cache_stats['hit_rate']:.0%} hit rate")
+    messages.append(exoplanet_catalog.describe())
         
     return {"status": status, "msg": " | ".join(messages)}
 
@@ -80,36 +356,32 @@ async def handle_sciencecific_commands(client, message, user_message):
         if not allowed:
             await safe_send(message, content=error_msg)
             return
-
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
-        if not allowed:
-            await safe_send(message, content=error_msg)
-            return
         
         rate_limiter.command_cooldown.set_cooldown('apod')
         
-        url = f'https://api.nasa.gov/planetary/apod?api_key={NASA_API_KEY}'
+        key, url, ttl = apod_request()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        try:
-                            data = await response.json()
-                            embed = discord.Embed(
-                                title=data.get('title', 'Astronomy Picture of the Day'),
-                                description=data.get('explanation', 'No explanation available.'),
-                                color=discord.Color.blue()
-                            )
-                            embed.set_image(url=data.get('url'))
-                            embed.set_footer(text=f"Date: {data.get('date', '')} | Copyright: {data.get('copyright', 'NASA')}")
-                            await safe_send(message, embed=embed)
-                            logging.debug("Displayed APOD")
-                        except (ValueError, aiohttp.ContentTypeError) as e:
-                            logging.error(f"Failed to parse APOD response: {e}")
-                            await safe_send(message, content="❌ Error parsing APOD data from NASA API.")
-                    else:
-                        await safe_send(message, content="❌ Could not fetch APOD from NASA API.")
-                        logging.error(f"APOD API error: {response.status}")
+            try:
+                status, data = await cached_nasa_json(key, url, ttl=ttl)
+            except (ValueError, aiohttp.ContentTypeError) as e:
+                logging.error(f"Failed to parse APOD response: {e}")
+                await safe_send(message, content="❌ Error parsing APOD data from NASA API.")
+                return
+            if status == 200:
+                embed = discord.Embed(
+                    title=data.get('title', 'Astronomy Picture of the Day'),
+                    description=data.get('explanation', 'No explanation available.'),
+                    color=discord.Color.blue()
+                )
+                embed.set_image(url=data.get('url'))
+                embed.set_footer(text=f"Date: {data.get('date', '')} | Copyright: {data.get('copyright', 'NASA')}")
+                await safe_send(message, embed=embed)
+                logging.debug("Displayed APOD")
+            else:
+                await safe_send(message, content="❌ Could not fetch APOD from NASA API.")
+                logging.error(f"APOD API error: {status}")
+        except (NasaRateLimited, circuit_breaker.CircuitOpen) as e:
+            await safe_send(message, content=str(e))
         except asyncio.TimeoutError:
             logging.error("APOD API request timed out")
             await safe_send(message, content="❌ Request timed out. Please try again.")
@@ -130,11 +402,6 @@ async def handle_sciencecific_commands(client, message, user_message):
         if not allowed:
             await safe_send(message, content=error_msg)
             return
-
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
-        if not allowed:
-            await safe_send(message, content=error_msg)
-            return
         
         rate_limiter.command_cooldown.set_cooldown('marsphoto')
         
@@ -159,33 +426,35 @@ async def handle_sciencecific_commands(client, message, user_message):
             
         # Build URL and fetch data
         url = f'https://api.nasa.gov/mars-photos/api/v1/rovers/{rover}/photos?earth_date={date}&api_key={NASA_API_KEY}'
+        ttl = MARS_TODAY_TTL if date >= datetime.now(timezone.utc).strftime('%Y-%m-%d') else MARS_TTL
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        try:
-                            data = await response.json()
-                            photos = data.get('photos', [])
-                            if photos:
-                                import random
-                                photo = random.choice(photos)
-                                embed = discord.Embed(
-                                    title=f"Mars Rover Photo ({photo['rover']['name']})",
-                                    description=f"Camera: {photo['camera']['full_name']}\nDate: {photo['earth_date']}",
-                                    color=discord.Color.red()
-                                )
-                                embed.set_image(url=photo['img_src'])
-                                embed.set_footer(text="Data source: NASA Mars Rover Photos API")
-                                await safe_send(message, embed=embed)
-                                logging.debug(f"Displayed Mars photo from {rover} on {date}")
-                            else:
-                                await safe_send(message, content=f"❌ No photos found for {rover.title()} on {date}.")
-                        except (ValueError, aiohttp.ContentTypeError) as e:
-                            logging.error(f"Failed to parse Mars photo response: {e}")
-                            await safe_send(message, content="❌ Error parsing Mars photo data from NASA API.")
-                    else:
-                        await safe_send(message, content="❌ Could not fetch Mars photo from NASA API.")
-                        logging.error(f"Mars photo API error: {response.status}")
+            try:
+                status, data = await cached_nasa_json(f"marsphoto:{rover}:{date}", url, ttl=ttl)
+            except (ValueError, aiohttp.ContentTypeError) as e:
+                logging.error(f"Failed to parse Mars photo response: {e}")
+                await safe_send(message, content="❌ Error parsing Mars photo data from NASA API.")
+                return
+            if status == 200:
+                photos = data.get('photos', [])
+                if photos:
+                    import random
+                    photo = random.choice(photos)
+                    embed = discord.Embed(
+                        title=f"Mars Rover Photo ({photo['rover']['name']})",
+                        description=f"Camera: {photo['camera']['full_name']}\nDate: {photo['earth_date']}",
+                        color=discord.Color.red()
+                    )
+                    embed.set_image(url=photo['img_src'])
+                    embed.set_footer(text="Data source: NASA Mars Rover Photos API")
+                    await safe_send(message, embed=embed)
+                    logging.debug(f"Displayed Mars photo from {rover} on {date}")
+                else:
+                    await safe_send(message, content=f"❌ No photos found for {rover.title()} on {date}.")
+            else:
+                await safe_send(message, content="❌ Could not fetch Mars photo from NASA API.")
+                logging.error(f"Mars photo API error: {status}")
+        except (NasaRateLimited, circuit_breaker.CircuitOpen) as e:
+            await safe_send(message, content=str(e))
         except asyncio.TimeoutError:
             logging.error("Mars photo API request timed out")
             await safe_send(message, content="❌ Request timed out. Please try again.")
@@ -206,68 +475,64 @@ async def handle_sciencecific_commands(client, message, user_message):
         if not allowed:
             await safe_send(message, content=error_msg)
             return
-
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
-        if not allowed:
-            await safe_send(message, content=error_msg)
-            return
         
         rate_limiter.command_cooldown.set_cooldown('asteroids')
         
         try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            url = f"https://api.nasa.gov/neo/rest/v1/feed?start_date={today}&end_date={today}&api_key={NASA_API_KEY}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        try:
-                            data = await response.json()
-                            neos = []
-                            # The API returns a dictionary with dates as keys
-                            for date_key in data.get("near_earth_objects", {}):
-                                neos.extend(data["near_earth_objects"][date_key])
-                            if not neos:
-                                await safe_send(message, content="☄️ No near-Earth asteroids found for today!")
-                                return
-                            # Sort by distance
-                            neos.sort(key=lambda n: float(n["close_approach_data"][0]["miss_distance"]["kilometers"]))
-                            # Next 5 ones
-                            embed = discord.Embed(
-                                title="☄️ Next 5 Near-Earth Asteroids",
-                                description=f"Found for {today}",
-                                color=discord.Color.orange()
-                            )
-                            for neo in neos[:5]:
-                                name = neo["name"]
-                                size = neo["estimated_diameter"]["meters"]
-                                diameter = f"{size['estimated_diameter_min']:.1f}–{size['estimated_diameter_max']:.1f} m"
-                                miss_distance = float(neo["close_approach_data"][0]["miss_distance"]["kilometers"])
-                                velocity = float(neo["close_approach_data"][0]["relative_velocity"]["kilometers_per_hour"])
-                                hazardous = "⚠️" if neo["is_potentially_hazardous_asteroid"] else ""
-                                abs_mag = neo.get("absolute_magnitude_h", "N/A")
-                                approach_date = neo["close_approach_data"][0]["close_approach_date"]
-                                orbiting_body = neo["close_approach_data"][0]["orbiting_body"]
-                                jpl_url = neo.get("nasa_jpl_url", "")
-                                embed.add_field(
-                                    name=f"{name} {hazardous}",
-                                    value=(
-                                        f"Size: {diameter}\n"
-                                        f"Absolute Magnitude: {abs_mag}\n"
-                                        f"Distance: {miss_distance:,.0f} km\n"
-                                        f"Velocity: {velocity:,.0f} km/h\n"
-                                        f"Approach Date: {approach_date}\n"
-                                        f"Orbiting Body: {orbiting_body}\n"
-                                    ),
-                                    inline=False
-                                )
-                            embed.set_footer(text="Data source: NASA Near-Earth Object API")
-                            await safe_send(message, embed=embed)
-                            logging.debug("Displayed asteroid data")
-                        except (ValueError, aiohttp.ContentTypeError) as e:
-                            logging.error(f"Failed to parse asteroid response: {e}")
-                            await safe_send(message, content="❌ Error parsing asteroid data from NASA API.")
-                    else:
-                        await safe_send(message, content="❌ Error fetching asteroid data from NASA API.")
+            key, url, ttl = neo_request()
+            today = key.split(":", 1)[1]
+            try:
+                status, data = await cached_nasa_json(key, url, ttl=ttl)
+            except (ValueError, aiohttp.ContentTypeError) as e:
+                logging.error(f"Failed to parse asteroid response: {e}")
+                await safe_send(message, content="❌ Error parsing asteroid data from NASA API.")
+                return
+            if status == 200:
+                neos = []
+                # The API returns a dictionary with dates as keys
+                for date_key in data.get("near_earth_objects", {}):
+                    neos.extend(data["near_earth_objects"][date_key])
+                if not neos:
+                    await safe_send(message, content="☄️ No near-Earth asteroids found for today!")
+                    return
+                # Sort by distance
+                neos.sort(key=lambda n: float(n["close_approach_data"][0]["miss_distance"]["kilometers"]))
+                # Next 5 ones
+                embed = discord.Embed(
+                    title="☄️ Next 5 Near-Earth Asteroids",
+                    description=f"Found for {today}",
+                    color=discord.Color.orange()
+                )
+                for neo in neos[:5]:
+                    name = neo["name"]
+                    size = neo["estimated_diameter"]["meters"]
+                    diameter = f"{size['estimated_diameter_min']:.1f}–{size['estimated_diameter_max']:.1f} m"
+                    miss_distance = float(neo["close_approach_data"][0]["miss_distance"]["kilometers"])
+                    velocity = float(neo["close_approach_data"][0]["relative_velocity"]["kilometers_per_hour"])
+                    hazardous = "⚠️" if neo["is_potentially_hazardous_asteroid"] else ""
+                    abs_mag = neo.get("absolute_magnitude_h", "N/A")
+                    approach_date = neo["close_approach_data"][0]["close_approach_date"]
+                    orbiting_body = neo["close_approach_data"][0]["orbiting_body"]
+                    jpl_url = neo.get("nasa_jpl_url", "")
+                    embed.add_field(
+                        name=f"{name} {hazardous}",
+                        value=(
+                            f"Size: {diameter}\n"
+                            f"Absolute Magnitude: {abs_mag}\n"
+                            f"Distance: {miss_distance:,.0f} km\n"
+                            f"Velocity: {velocity:,.0f} km/h\n"
+                            f"Approach Date: {approach_date}\n"
+                            f"Orbiting Body: {orbiting_body}\n"
+                        ),
+                        inline=False
+                    )
+                embed.set_footer(text="Data source: NASA Near-Earth Object API")
+                await safe_send(message, embed=embed)
+                logging.debug("Displayed asteroid data")
+            else:
+                await safe_send(message, content="❌ Error fetching asteroid data from NASA API.")
+        except (NasaRateLimited, circuit_breaker.CircuitOpen) as e:
+            await safe_send(message, content=str(e))
         except asyncio.TimeoutError:
             logging.error("Asteroids API request timed out")
             await safe_send(message, content="❌ Request timed out. Please try again.")
@@ -291,11 +556,6 @@ async def handle_sciencecific_commands(client, message, user_message):
         if not allowed:
             await safe_send(message, content=error_msg)
             return
-
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
-        if not allowed:
-            await safe_send(message, content=error_msg)
-            return
         
         rate_limiter.command_cooldown.set_cooldown('sun')
         
@@ -303,41 +563,57 @@ async def handle_sciencecific_commands(client, message, user_message):
             args = user_message.split()
             today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-            endpoints = {
-                "cme": "CME",
-                "flare": "FLR",
-                "storm": "GST",
-                "shock": "IPS",
-                "particle": "SEP"
-            }
-
-            base_url = "https://api.nasa.gov/DONKI/"
             selected = args[1].lower() if len(args) > 1 else "all"
             results = []
 
-            async with aiohttp.ClientSession() as session:
-                # Fetch single or all endpoints
-                endpoints_to_fetch = (
-                    {selected: endpoints[selected]} if selected in endpoints else endpoints
-                )
-                for key, endpoint in endpoints_to_fetch.items():
-                    url = f"{base_url}{endpoint}?startDate={today}&api_key={NASA_API_KEY}"
-                    try:
-                        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                            if resp.status == 200:
-                                try:
-                                    data = await resp.json()
-                                    results.append((endpoint, data))
-                                except (ValueError, aiohttp.ContentTypeError) as e:
-                                    logging.error(f"Failed to parse {endpoint} response: {e}")
-                            else:
-                                await safe_send(message, content=f"❌ Error fetching {endpoint} data from NASA API.")
-                                logging.warning(f"NASA API {endpoint} returned {resp.status}")
-                    except asyncio.TimeoutError:
-                        logging.error(f"Solar activity {endpoint} API request timed out")
-                    except aiohttp.ClientError as e:
-                        logging.error(f"Solar activity {endpoint} API request failed: {e}")
-                    await asyncio.sleep(0.25)
+            # Fetch single or all endpoints
+            endpoints_to_fetch = (
+                {selected: DONKI_ENDPOINTS[selected]} if selected in DONKI_ENDPOINTS else DONKI_ENDPOINTS
+            )
+            donki_requests = {endpoint: donki_request(endpoint, today) for endpoint in endpoints_to_fetch.values()}
+
+            # One NASA token for the whole command, and none if everything is cached
+            if any(key not in NASA_CACHE for key, _, _ in donki_requests.values()):
+                allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
+                if not allowed:
+                    await safe_send(message, content=error_msg)
+                    return
+
+            # All endpoints at once: the slowest one decides the response time, not the sum
+            tasks = {
+                endpoint: asyncio.create_task(cached_nasa_json(key, url, ttl=ttl, limit=False))
+                for endpoint, (key, url, ttl) in donki_requests.items()
+            }
+            _, pending = await asyncio.wait(tasks.values(), timeout=DONKI_DEADLINE)
+
+            # Collect in endpoint order; failed endpoints are listed instead of aborting the command
+            failed = []
+            for endpoint, task in tasks.items():
+                if task in pending:
+                    task.cancel()
+                    failed.append(endpoint)
+                    logging.error(f"Solar activity {endpoint} API request exceeded the {DONKI_DEADLINE:g}s deadline")
+                    continue
+                try:
+                    status, data = task.result()
+                    if status == 200:
+                        results.append((endpoint, data))
+                    else:
+                        failed.append(endpoint)
+                        logging.warning(f"NASA API {endpoint} returned {status}")
+                except (ValueError, aiohttp.ContentTypeError) as e:
+                    failed.append(endpoint)
+                    logging.error(f"Failed to parse {endpoint} response: {e}")
+                except asyncio.TimeoutError:
+                    failed.append(endpoint)
+                    logging.error(f"Solar activity {endpoint} API request timed out")
+                except aiohttp.ClientError as e:
+                    failed.append(endpoint)
+                    logging.error(f"Solar activity {endpoint} API request failed: {e}")
+
+            if not results:
+                await safe_send(message, content="❌ Could not fetch solar activity data from NASA API.")
+                return
 
             embed = discord.Embed(
                 title="🌞 Solar Activity Overview",
@@ -389,8 +665,12 @@ async def handle_sciencecific_commands(client, message, user_message):
 
                     embed.add_field(name=field_title, value=details, inline=False)
 
-            if total_events == 0:
+            if failed:
+                embed.description = (embed.description or "") + f"\n⚠️ No data for: {', '.join(failed)}"
+            if total_events == 0 and not failed:
                 embed.description = (embed.description or "") + "\n✅ No solar events recorded today. The Sun is calm."
+            elif total_events == 0:
+                embed.description = (embed.description or "") + "\nNo events in the data that could be fetched."
             else:
                 embed.set_footer(
                     text=f"Data source: NASA DONKI • {datetime.now(timezone.utc).strftime('%H:%M:%S')} UTC"
@@ -417,16 +697,25 @@ async def handle_sciencecific_commands(client, message, user_message):
             await safe_send(message, content=error_msg)
             return
 
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_nasa, "NASA API")
-        if not allowed:
-            await safe_send(message, content=error_msg)
-            return
-        
         rate_limiter.command_cooldown.set_cooldown('exoplanet')
         
         await safe_send(message, content="Usage: !exoplanet <name | nearest | latest | count> \nExamples: !exoplanet Kepler-22b, !exoplanet nearest, !exoplanet latest, !exoplanet count")
         parts = user_message.split(maxsplit=1)
 
+        # The local snapshot answers without NASA budget; live queries only until it is downloaded
+        use_snapshot = exoplanet_catalog.is_available()
+        footer = "Data source: NASA Exoplanet Archive" + (" (local snapshot)" if use_snapshot else "")
+
+        # Snapshot query, falling back to the live archive when the snapshot cannot be read
+        async def query_planets(local_query, live_query: str, max_rows: int | None = None, limit: int | None = None,
+                                unique: str | None = None) -> list[dict[str, str]]:
+            if use_snapshot:
+                try:
+                    return await local_query()
+                except sqlite3.Error as e:
+                    logging.warning(f"Exoplanet snapshot query failed, using live archive: {e}")
+            return await fetch_exoplanet_rows(live_query, max_rows, limit=limit, unique=unique)
+
         # Function: Determine habitability based on extended criteria
         async def is_habitable(planet):
             try:
@@ -457,19 +746,13 @@ async def handle_sciencecific_commands(client, message, user_message):
 
         try:
             if len(parts) == 2 and parts[1].lower() == "count":
-                sql = "SELECT count(distinct pl_name) as total FROM ps"
-                url = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query=" + urllib.parse.quote(sql) + "&format=csv"
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        if response.status != 200:
-                            raise Exception(f"API returned {response.status}")
-                        text = await response.text()
-                        reader = csv.DictReader(io.StringIO(text))
-                        data = list(reader)
-                        total = int(data[0].get("total", 0))
-                        await safe_send(message, content=f"🪐 There are currently **{total:,}** confirmed exoplanets in NASA's Exoplanet Archive.")
-                        logging.debug("Displayed exoplanet count")
+                async def count_local():
+                    return [{"total": str(await exoplanet_catalog.count_planets())}]
+
+                data = await query_planets(count_local, "SELECT count(distinct pl_name) as total FROM ps", limit=1)
+                total = int(data[0].get("total", 0))
+                await safe_send(message, content=f"🪐 There are currently **{total:,}** confirmed exoplanets in NASA's Exoplanet Archive.")
+                logging.debug("Displayed exoplanet count")
                 return
 
             # Show nearest known exoplanets
@@ -478,90 +761,78 @@ async def handle_sciencecific_commands(client, message, user_message):
                     "SELECT DISTINCT pl_name, hostname, disc_year, sy_dist, pl_rade, pl_bmasse, pl_eqt, discoverymethod "
                     "FROM ps WHERE sy_dist IS NOT NULL ORDER BY sy_dist ASC"
                 )
-                url = (
-                    "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?"
-                    f"query={query.replace(' ', '+')}&format=csv&MAXREC=20"
+                results = await query_planets(exoplanet_catalog.nearest, query, 20, limit=5, unique="pl_name")
+
+                # Filter to unique planet names
+                seen = set()
+                unique_planets = []
+                for planet in results:
+                    name = planet.get("pl_name")
+                    if name and name not in seen:
+                        unique_planets.append(planet)
+                        seen.add(name)
+                    if len(unique_planets) >= 5:
+                        break
+
+                if not unique_planets:
+                    await safe_send(message, content="❌ No nearby exoplanets found.")
+                    return
+
+                embed = discord.Embed(
+                    title="🪐 Nearest Known Exoplanets",
+                    color=discord.Color.orange()
                 )
 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        if response.status != 200:
-                            raise Exception(f"API returned {response.status}")
-
-                        text = await response.text()
-                        reader = csv.DictReader(io.StringIO(text))
-                        results = list(reader)
-
-                        # Filter to unique planet names
-                        seen = set()
-                        unique_planets = []
-                        for planet in results:
-                            name = planet.get("pl_name")
-                            if name and name not in seen:
-                                unique_planets.append(planet)
-                                seen.add(name)
-                            if len(unique_planets) >= 5:
-                                break
-
-                        if not unique_planets:
-                            await safe_send(message, content="❌ No nearby exoplanets found.")
-                            return
-
-                        embed = discord.Embed(
-                            title="🪐 Nearest Known Exoplanets",
-                            color=discord.Color.orange()
+                for p in unique_planets:
+                    dist_display = "N/A"
+                    temp_str = "N/A"
+                    habitable = False
+                    
+                    try:
+                        # Read and convert values
+                        radius = float(p.get("pl_rade") or 0)
+                        mass = float(p.get("pl_bmasse") or 0)
+                        temp_k = float(p.get("pl_eqt") or 0)
+
+                        # Kelvin → Celsius
+                        temp_c = temp_k - 273.15 if temp_k else None
+                        dist_pc = float(p.get("sy_dist") or 0)
+                        dist_ly = dist_pc * 3.26156 if dist_pc else None
+                        
+                        if temp_k:
+                            temp_str = f"{temp_k:.2f} K ({temp_c:.1f} °C)" if temp_c is not None else "N/A"
+                        if temp_k:
+                            dist_display = f"{dist_pc:.2f} pc (≈ {dist_ly:.2f} ly)" if dist_pc is not None else "N/A"
+
+                        # Habitability Check (in °C)
+                        habitable = (
+                            0.8 <= radius <= 1.8 and
+                            (mass == 0 or mass <= 10) and
+                            (temp_c is not None and -93 <= temp_c <= 37)
                         )
-
-                        for p in unique_planets:
-                            dist_display = "N/A"
-                            temp_str = "N/A"
-                            habitable = False
-                            
-                            try:
-                                # Read and convert values
-                                radius = float(p.get("pl_rade") or 0)
-                                mass = float(p.get("pl_bmasse") or 0)
-                                temp_k = float(p.get("pl_eqt") or 0)
-
-                                # Kelvin → Celsius
-                                temp_c = temp_k - 273.15 if temp_k else None
-                                dist_pc = float(p.get("sy_dist") or 0)
-                                dist_ly = dist_pc * 3.26156 if dist_pc else None
-                                
-                                if temp_k:
-                                    temp_str = f"{temp_k:.2f} K ({temp_c:.1f} °C)" if temp_c is not None else "N/A"
-                                if temp_k:
-                                    dist_display = f"{dist_pc:.2f} pc (≈ {dist_ly:.2f} ly)" if dist_pc is not None else "N/A"
-
-                                # Habitability Check (in °C)
-                                habitable = (
-                                    0.8 <= radius <= 1.8 and
-                                    (mass == 0 or mass <= 10) and
-                                    (temp_c is not None and -93 <= temp_c <= 37)
-                                )
-                            except Exception as e:
-                                habitable = False
-                                temp_str = "N/A"
-                                logging.warning(f"Habitable check failed for planet: {p.get('pl_name', 'Unknown')} ({e})")
-
-                            embed.add_field(
-                                name=p.get("pl_name", "Unknown"),
-                                value=(
-                                    f"Host Star: {p.get('hostname', 'N/A')}\n"
-                                    f"Discovery: {p.get('disc_year', 'N/A')} ({p.get('discoverymethod', 'N/A')})\n"
-                                    f"Distance: {dist_display}\n"
-                                    f"Radius: {p.get('pl_rade', 'N/A')} R⊕\n"
-                                    f"Mass: {p.get('pl_bmasse', 'N/A')} M⊕\n"
-                                    f"Temperature: {temp_str}\n"
-                                    f"Habitable: {'✅ Possibly' if habitable else '❌ Unlikely'}"
-                                ),
-                                inline=False
-                            )
-
-                        embed.set_footer(text="Data source: NASA Exoplanet Archive")
-                        await safe_send(message, embed=embed)
-                        logging.debug("Displayed nearest unique exoplanets")
-                    return
+                    except Exception as e:
+                        habitable = False
+                        temp_str = "N/A"
+                        logging.warning(f"Habitable check failed for planet: {p.get('pl_name', 'Unknown')} ({e})")
+
+                    embed.add_field(
+                        name=p.get("pl_name", "Unknown"),
+                        value=(
+                            f"Host Star: {p.get('hostname', 'N/A')}\n"
+                            f"Discovery: {p.get('disc_year', 'N/A')} ({p.get('discoverymethod', 'N/A')})\n"
+                            f"Distance: {dist_display}\n"
+                            f"Radius: {p.get('pl_rade', 'N/A')} R⊕\n"
+                            f"Mass: {p.get('pl_bmasse', 'N/A')} M⊕\n"
+                            f"Temperature: {temp_str}\n"
+                            f"Habitable: {'✅ Possibly' if habitable else '❌ Unlikely'}"
+                        ),
+                        inline=False
+                    )
+
+                embed.set_footer(text=footer)
+                await safe_send(message, embed=embed)
+                logging.debug("Displayed nearest unique exoplanets")
+                return
 
             # Latest discovered exoplanets
             if len(parts) == 2 and parts[1].lower() == "latest":
@@ -569,90 +840,78 @@ async def handle_sciencecific_commands(client, message, user_message):
                     "SELECT pl_name, hostname, disc_year, sy_dist, pl_rade, pl_bmasse, pl_eqt, discoverymethod "
                     "FROM ps WHERE disc_year IS NOT NULL ORDER BY disc_year DESC"
                 )
-                url = (
-                    "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?"
-                    f"query={query.replace(' ', '+')}&format=csv&MAXREC=20"
+                results = await query_planets(exoplanet_catalog.latest, query, 20, limit=5, unique="pl_name")
+
+                # No results check
+                if not results:
+                    await safe_send(message, content="❌ No exoplanet data found.")
+                    return
+
+                # Only 5 newest unique planet names
+                seen = set()
+                unique_planets = []
+                for planet in results:
+                    name = planet.get("pl_name")
+                    if name and name not in seen:
+                        unique_planets.append(planet)
+                        seen.add(name)
+                    if len(unique_planets) >= 5:
+                        break
+
+                embed = discord.Embed(
+                    title="🪐 Latest Discovered Exoplanets",
+                    color=discord.Color.purple()
                 )
 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        if response.status != 200:
-                            raise Exception(f"API returned {response.status}")
-
-                        text = await response.text()
-                        reader = csv.DictReader(io.StringIO(text))
-                        results = list(reader)
-
-                        # No results check
-                        if not results:
-                            await safe_send(message, content="❌ No exoplanet data found.")
-                            return
-
-                        # Only 5 newest unique planet names
-                        seen = set()
-                        unique_planets = []
-                        for planet in results:
-                            name = planet.get("pl_name")
-                            if name and name not in seen:
-                                unique_planets.append(planet)
-                                seen.add(name)
-                            if len(unique_planets) >= 5:
-                                break
-
-                        embed = discord.Embed(
-                            title="🪐 Latest Discovered Exoplanets",
-                            color=discord.Color.purple()
-                        )
+                for p in unique_planets:
+                    dist_display = "N/A"
+                    temp_str = "N/A"
+                    habitable = False
 
-                        for p in unique_planets:
-                            dist_display = "N/A"
-                            temp_str = "N/A"
-                            habitable = False
-
-                            try:
-                                # Parse data
-                                radius = float(p.get("pl_rade") or 0)
-                                mass = float(p.get("pl_bmasse") or 0)
-                                temp_k = float(p.get("pl_eqt") or 0)
-
-                                # Kelvin → Celsius
-                                temp_c = temp_k - 273.15 if temp_k else None
-                                dist_pc = float(p.get("sy_dist") or 0)
-                                dist_ly = dist_pc * 3.26156 if dist_pc else None
-
-                                if temp_k:
-                                    temp_str = f"{temp_k:.2f} K ({temp_c:.1f} °C)" if temp_c is not None else "N/A"
-                                if dist_pc:
-                                    dist_display = f"{dist_pc:.2f} pc (≈ {dist_ly:.2f} ly)" if dist_ly is not None else "N/A"
-
-                                # Habitability Check (°C)
-                                habitable = (
-                                    0.8 <= radius <= 1.8 and
-                                    (mass == 0 or mass <= 10) and
-                                    (temp_c is not None and -93 <= temp_c <= 37)
-                                )
-                            except Exception as e:
-                                habitable = False
-                                temp_str = "N/A"
-                                logging.warning(f"Habitable check failed for planet: {p.get('pl_name', 'Unknown')} ({e})")
-
-                            embed.add_field(
-                                name=p.get("pl_name", "Unknown"),
-                                value=(
-                                    f"Host Star: {p.get('hostname', 'N/A')}\n"
-                                    f"Discovery: {p.get('disc_year', 'N/A')} ({p.get('discoverymethod', 'N/A')})\n"
-                                    f"Distance: {dist_display}\n"
-                                    f"Radius: {p.get('pl_rade', 'N/A')} R⊕\n"
-                                    f"Mass: {p.get('pl_bmasse', 'N/A')} M⊕\n"
-                                    f"Temperature: {temp_str}\n"
-                                    f"Habitable: {'✅ Possibly' if habitable else '❌ Unlikely'}"
-                                ),
-                                inline=False
-                            )
-
-                        embed.set_footer(text="Data source: NASA Exoplanet Archive")
-                        await safe_send(message, embed=embed)
-                        logging.debug("Displayed latest discovered unique exoplanets")
+                    try:
+                        # Parse data
+                        radius = float(p.get("pl_rade") or 0)
+                        mass = float(p.get("pl_bmasse") or 0)
+                        temp_k = float(p.get("pl_eqt") or 0)
+
+                        # Kelvin → Celsius
+                        temp_c = temp_k - 273.15 if temp_k else None
+                        dist_pc = float(p.get("sy_dist") or 0)
+                        dist_ly = dist_pc * 3.26156 if dist_pc else None
+
+                        if temp_k:
+                            temp_str = f"{temp_k:.2f} K ({temp_c:.1f} °C)" if temp_c is not None else "N/A"
+                        if dist_pc:
+                            dist_display = f"{dist_pc:.2f} pc (≈ {dist_ly:.2f} ly)" if dist_ly is not None else "N/A"
+
+                        # Habitability Check (°C)
+                        habitable = (
+                            0.8 <= radius <= 1.8 and
+                            (mass == 0 or mass <= 10) and
+                            (temp_c is not None and -93 <= temp_c <= 37)
+                        )
+                    except Exception as e:
+                        habitable = False
+                        temp_str = "N/A"
+                        logging.warning(f"Habitable check failed for planet: {p.get('pl_name', 'Unknown')} ({e})")
+
+                    embed.add_field(
+                        name=p.get("pl_name", "Unknown"),
+                        value=(
+                            f"Host Star: {p.get('hostname', 'N/A')}\n"
+                            f"Discovery: {p.get('disc_year', 'N/A')} ({p.get('discoverymethod', 'N/A')})\n"
+                            f"Distance: {dist_display}\n"
+                            f"Radius: {p.get('pl_rade', 'N/A')} R⊕\n"
+                            f"Mass: {p.get('pl_bmasse', 'N/A')} M⊕\n"
+                            f"Temperature: {temp_str}\n"
+                            f"Habitable: {'✅ Possibly' if habitable else '❌ Unlikely'}"
+                        ),
+                        inline=False
+                    )
+
+                embed.set_footer(text=footer)
+                await safe_send(message, embed=embed)
+                logging.debug("Displayed latest discovered unique exoplanets")
                 return
 
             # Specific exoplanet search
@@ -668,72 +927,66 @@ async def handle_sciencecific_commands(client, message, user_message):
                     f"LIKE '%{search_key}%'"
                 )
 
-                url = (
-                    "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?"
-                    f"query={urllib.parse.quote(query)}&format=csv&MAXREC=3"
-                )
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        if response.status != 200:
-                            raise Exception(f"API returned {response.status}")
-                        text = await response.text()
-                        reader = csv.DictReader(io.StringIO(text))
-                        results = list(reader)
-
-                        if not results:
-                            await safe_send(message, content=f"❌ No exoplanet found matching '{planet_name}'.")
-                            return
+                async def search_local():
+                    return await exoplanet_catalog.search(planet_name)
 
-                        # Nimm den ersten Treffer
-                        p = results[0]
+                results = await query_planets(search_local, query, 3, limit=1)
 
-                        # Temperatur & Distanz konvertieren
-                        dist_display = "N/A"
-                        temp_str = "N/A"
-                        habitable = False
+                if not results:
+                    await safe_send(message, content=f"❌ No exoplanet found matching '{planet_name}'.")
+                    return
 
-                        try:
-                            radius = float(p.get("pl_rade") or 0)
-                            mass = float(p.get("pl_bmasse") or 0)
-                            temp_k = float(p.get("pl_eqt") or 0)
-
-                            temp_c = temp_k - 273.15 if temp_k else None
-                            dist_pc = float(p.get("sy_dist") or 0)
-                            dist_ly = dist_pc * 3.26156 if dist_pc else None
-
-                            if dist_pc:
-                                dist_display = f"{dist_pc:.2f} pc (≈ {dist_ly:.2f} ly)"
-                            if temp_k:
-                                temp_str = f"{temp_k:.2f} K ({temp_c:.1f} °C)" if temp_c is not None else "N/A"
-
-                            habitable = (
-                                0.8 <= radius <= 1.8 and
-                                (mass == 0 or mass <= 10) and
-                                (temp_c is not None and -93 <= temp_c <= 37)
-                            )
-                        except Exception as e:
-                            habitable = False
-                            logging.warning(f"Habitable check failed for planet: {p.get('pl_name', 'Unknown')} ({e})")
-
-                        # Embed formatieren
-                        embed = discord.Embed(
-                            title=f"🪐 {p.get('pl_name', 'Unknown')}",
-                            color=discord.Color.blurple()
-                        )
-                        embed.add_field(name="Host Star", value=p.get("hostname", "N/A"))
-                        embed.add_field(name="Discovery Year", value=p.get("disc_year", "N/A"))
-                        embed.add_field(name="Method", value=p.get("discoverymethod", "N/A"))
-                        embed.add_field(name="Distance", value=dist_display)
-                        embed.add_field(name="Radius", value=f"{p.get('pl_rade', 'N/A')} R⊕")
-                        embed.add_field(name="Mass", value=f"{p.get('pl_bmasse', 'N/A')} M⊕")
-                        embed.add_field(name="Temperature", value=temp_str)
-                        embed.add_field(name="Habitable", value="✅ Possibly" if habitable else "❌ Unlikely")
-                        embed.set_footer(text="Data source: NASA Exoplanet Archive")
-
-                        await safe_send(message, embed=embed)
-                        logging.debug(f"Displayed exoplanet data for '{planet_name}'")
+                # Nimm den ersten Treffer
+                p = results[0]
+
+                # Temperatur & Distanz konvertieren
+                dist_display = "N/A"
+                temp_str = "N/A"
+                habitable = False
+
+                try:
+                    radius = float(p.get("pl_rade") or 0)
+                    mass = float(p.get("pl_bmasse") or 0)
+                    temp_k = float(p.get("pl_eqt") or 0)
+
+                    temp_c = temp_k - 273.15 if temp_k else None
+                    dist_pc = float(p.get("sy_dist") or 0)
+                    dist_ly = dist_pc * 3.26156 if dist_pc else None
+
+                    if dist_pc:
+                        dist_display = f"{dist_pc:.2f} pc (≈ {dist_ly:.2f} ly)"
+                    if temp_k:
+                        temp_str = f"{temp_k:.2f} K ({temp_c:.1f} °C)" if temp_c is not None else "N/A"
+
+                    habitable = (
+                        0.8 <= radius <= 1.8 and
+                        (mass == 0 or mass <= 10) and
+                        (temp_c is not None and -93 <= temp_c <= 37)
+                    )
+                except Exception as e:
+                    habitable = False
+                    logging.warning(f"Habitable check failed for planet: {p.get('pl_name', 'Unknown')} ({e})")
+
+                # Embed formatieren
+                embed = discord.Embed(
+                    title=f"🪐 {p.get('pl_name', 'Unknown')}",
+                    color=discord.Color.blurple()
+                )
+                embed.add_field(name="Host Star", value=p.get("hostname", "N/A"))
+                embed.add_field(name="Discovery Year", value=p.get("disc_year", "N/A"))
+                embed.add_field(name="Method", value=p.get("discoverymethod", "N/A"))
+                embed.add_field(name="Distance", value=dist_display)
+                embed.add_field(name="Radius", value=f"{p.get('pl_rade', 'N/A')} R⊕")
+                embed.add_field(name="Mass", value=f"{p.get('pl_bmasse', 'N/A')} M⊕")
+                embed.add_field(name="Temperature", value=temp_str)
+                embed.add_field(name="Habitable", value="✅ Possibly" if habitable else "❌ Unlikely")
+                embed.set_footer(text=footer)
+
+                await safe_send(message, embed=embed)
+                logging.debug(f"Displayed exoplanet data for '{planet_name}'")
                 return
+        except (NasaRateLimited, circuit_breaker.CircuitOpen) as e:
+            await safe_send(message, content=str(e))
         except Exception as e:
             await safe_send(message, content="❌ Error while fetching exoplanet data.")
             logging.exception("Exoplanet command error: %s", e)
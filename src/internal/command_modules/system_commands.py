@@ -169,6 +169,64 @@ async def check_emergency_measures(interaction: discord.Interaction) -> bool:
     
     return False  # All checks passed
 
+# ----------------------------------------------------------------
+# Shutdown Helper
+# ----------------------------------------------------------------
+
+# Clean up before shutdown and restart. Only modules that were loaded are touched,
+# importing a lazily loaded module just to shut it down would be wasted work
+async def shutdown_services(bot):
+    modules = sys.modules
+
+    # Cleanup music (disconnect voice clients, stop ffmpeg)
+    player = modules.get("internal.command_modules.music.player")
+    if player:
+        try:
+            await player.cleanup_all_guilds(bot)
+        except Exception as e:
+            log_.error(f"Error during music cleanup: {e}")
+
+    # Save calculator 'ans' results and stop worker processes
+    # (the pool is started at startup, also before the calculator itself is loaded)
+    calculator = modules.get("internal.command_modules.calculator")
+    calculator_sandbox = modules.get("internal.command_modules.calculator_sandbox")
+    try:
+        if calculator:
+            calculator.shutdown_calculator()
+        elif calculator_sandbox:
+            calculator_sandbox.shutdown_pool()
+    except Exception as e:
+        log_.error(f"Error during calculator cleanup: {e}")
+
+    # Stop the NASA prefetch and the exoplanet catalogue refresh before their HTTP session is closed
+    sciencecific_commands = modules.get("internal.command_modules.sciencecific_commands")
+    if sciencecific_commands:
+        try:
+            sciencecific_commands.stop_prefetch()
+        except Exception as e:
+            log_.error(f"Error stopping NASA prefetch: {e}")
+    exoplanet_catalog = modules.get("internal.command_modules.exoplanet_catalog")
+    if exoplanet_catalog:
+        try:
+            exoplanet_catalog.stop_refresh()
+        except Exception as e:
+            log_.error(f"Error stopping exoplanet catalogue refresh: {e}")
+
+    # Save looked up dictionary words
+    word_dictionary = modules.get("internal.command_modules.word_dictionary")
+    if word_dictionary:
+        try:
+            word_dictionary.save_word_cache(force=True)
+        except Exception as e:
+            log_.error(f"Error saving dictionary cache: {e}")
+
+    # Close the shared HTTP session and its keep-alive connections
+    try:
+        from internal import http_client
+        await http_client.close()
+    except Exception as e:
+        log_.error(f"Error closing HTTP session: {e}")
+
 # ----------------------------------------------------------------
 # Main Command Handler for [System Commands]
 # ----------------------------------------------------------------
@@ -190,12 +248,8 @@ def setup_system_commands(bot):
             await interaction.response.send_message("Shutting down the bot...")
             log_.info(f"System: Shutdown command executed by: {interaction.user.id}")
             
-            # Cleanup music before shutdown
-            try:
-                from internal.command_modules.music.player import cleanup_all_guilds
-                await cleanup_all_guilds(bot)
-            except Exception as e:
-                log_.error(f"Error during music cleanup: {e}")
+            # Stop background services and save state before the process ends
+            await shutdown_services(bot)
             
             await bot.close()
         else:
@@ -255,12 +309,8 @@ def setup_system_commands(bot):
                 await interaction.followup.send("Shutting down the bot and the Raspberry Pi...")
                 log_.info(f"System: Full shutdown command executed by: {interaction.user.id}")
                 
-                # Cleanup music before shutdown
-                try:
-                    from internal.command_modules.music.player import cleanup_all_guilds
-                    await cleanup_all_guilds(bot)
-                except Exception as e:
-                    log_.error(f"Error during music cleanup: {e}")
+                # Stop background services and save state before the process ends
+                await shutdown_services(bot)
                 
                 await bot.close()
                 os.system("sudo shutdown now")
@@ -298,12 +348,8 @@ def setup_system_commands(bot):
                 await interaction.response.send_message("Restarting the bot...")
                 log_.info(f"System: Restart command executed by: {interaction.user.id}")
                 
-                # Cleanup music before restart
-                try:
-                    from internal.command_modules.music.player import cleanup_all_guilds
-                    await cleanup_all_guilds(bot)
-                except Exception as e:
-                    log_.error(f"Error during music cleanup: {e}")
+                # Stop background services and save state before the process ends
+                await shutdown_services(bot)
                 
                 os.execv(sys.executable, ['python'] + sys.argv)
         else:
@@ -972,6 +1018,39 @@ def setup_system_commands(bot):
             await interaction.response.send_message("⚠️ Failed to send privacy information.", ephemeral=True)
             log_.error(f"Failed to send privacy embed: {e}")
 
+    # -----------------------------------------------------------------
+    # Command: /api-status
+    # Category: System Commands
+    # Type: Full Command
+    # Description: Show the circuit breaker state of the external APIs
+    # -----------------------------------------------------------------
+    
+    @bot.tree.command(name="api-status", description="Show the availability of the external APIs")
+    async def api_status(interaction: discord.Interaction):
+        from internal import circuit_breaker
+        
+        # 1. Emergency checks (Lockdown + Cooldown)
+        if await check_emergency_measures(interaction):
+            return
+        
+        # 2. Blacklist check
+        if await check_blacklist(interaction):
+            return
+        
+        lines = circuit_breaker.format_status()
+        any_open = any(circuit_breaker.get_breaker(name).state != circuit_breaker.CLOSED for name, _ in lines)
+        
+        embed = discord.Embed(
+            title="🌐 External API Status",
+            color=discord.Color.orange() if any_open else discord.Color.green()
+        )
+        for name, text in lines:
+            embed.add_field(name=name, value=text, inline=False)
+        embed.set_footer(text="🔴 open: requests are skipped until a test request succeeds")
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        log_.debug(f"API status displayed to user {interaction.user.id}")
+
     # -----------------------------------------------------------------
     # Command: /blacklist
     # Category: System Commands
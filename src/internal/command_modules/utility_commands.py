@@ -9,7 +9,9 @@ from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 from discord.ui import Button, View
 from internal import rate_limiter
+from internal import http_client
 from internal import utils
+from internal.cache import LRUCache, SingleFlight
 from internal.utils import is_authorized_global, is_authorized_server
 
 # Copyright (c) 2026 Dennis Plischke.
@@ -60,6 +62,99 @@ async def safe_interaction_send(interaction, content=None, embed=None, view=None
     except discord.InteractionResponded:
         logging.warning(f"Interaction already responded to")
 
+# ----------------------------------------------------------------
+# Weather Cache
+# ----------------------------------------------------------------
+
+# Optional "weather_cache" section in config.json (seconds)
+WEATHER_CACHE_CONFIG = utils.get_config_value("weather_cache", default={}) or {}
+WEATHER_CACHE_ENTRIES = int(WEATHER_CACHE_CONFIG.get("entries", 256))
+WEATHER_TTL = float(WEATHER_CACHE_CONFIG.get("weather_ttl", 600))  # OpenWeatherMap updates about every 10 minutes
+TIMEZONE_TTL = float(WEATHER_CACHE_CONFIG.get("timezone_ttl", 86400))  # Upper bound, see timezone_ttl()
+TIMEZONE_REFRESH_HOUR = 4  # Local hour at which cached UTC offsets expire
+
+WEATHER_CACHE = LRUCache(max_entries=WEATHER_CACHE_ENTRIES, ttl=WEATHER_TTL)  # location -> weather response
+TIMEZONE_CACHE = LRUCache(max_entries=WEATHER_CACHE_ENTRIES, ttl=TIMEZONE_TTL)  # location -> (city, country code, offset)
+WEATHER_REQUESTS = SingleFlight()  # Simultaneous requests for one location share a single API call
+
+# UTC offsets change with daylight saving time, which switches at night local time (mostly 01:00-03:00)
+# An offset is kept until the next 04:00 at the location, so after a switch !time can be an hour off
+# only until that morning; that is one API call per location and day, like a 24 hour TTL
+def timezone_ttl(offset: int) -> float:
+    local_now = datetime.now(timezone.utc) + timedelta(seconds=offset)
+    refresh = local_now.replace(hour=TIMEZONE_REFRESH_HOUR, minute=0, second=0, microsecond=0)
+    if refresh <= local_now:
+        refresh += timedelta(days=1)
+    return min(TIMEZONE_TTL, (refresh - local_now).total_seconds())
+
+# "  frankfurt AM  main" and "Frankfurt am Main" are the same location
+def normalise_location(location: str) -> str:
+    return " ".join(location.split()).casefold()
+
+# Asynchronous function to get weather data
+async def fetch_weather(location):
+    api_key = os.getenv('OPENWEATHERMAP_API_KEY')  # Get the API key from .env
+
+    if not api_key:
+        logging.error("API key is missing.")
+        return None
+
+    base_url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}&units=metric"
+    try:
+        async with http_client.session() as session:
+            async with session.get(base_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                if response.status == 200:
+                    try:
+                        weather_data = await response.json()
+                    except (ValueError, aiohttp.ContentTypeError) as e:
+                        logging.error(f"Failed to parse weather API response: {e}")
+                        return None
+                    if weather_data.get('cod') == 200:
+                        key = normalise_location(location)
+                        WEATHER_CACHE.set(key, weather_data)
+                        offset = weather_data['timezone']
+                        TIMEZONE_CACHE.set(key, (weather_data['name'], weather_data['sys']['country'], offset), ttl=timezone_ttl(offset))
+                    return weather_data
+                else:
+                    logging.warning(f"Failed to fetch weather data. Status code: {response.status}")
+                    return None
+    except asyncio.TimeoutError:
+        logging.error(f"Weather API request timed out for location: {location}")
+        return None
+    except aiohttp.ClientError as e:
+        logging.error(f"API request failed: {e}")
+        return None
+
+# Raised when a request has to go to OpenWeatherMap but no api_limiter_openweather token is left
+class WeatherRateLimited(Exception):
+    pass
+
+# Only requests that actually reach OpenWeatherMap use an API token
+async def fetch_weather_limited(location):
+    allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_openweather, "OpenWeatherMap")
+    if not allowed:
+        raise WeatherRateLimited(error_msg)
+    return await fetch_weather(location)
+
+# Weather data from the cache, otherwise from OpenWeatherMap (one request per location at a time)
+async def get_weather(location):
+    key = normalise_location(location)
+    weather_data = WEATHER_CACHE.get(key)
+    if weather_data is not None:
+        logging.debug(f"Weather for '{key}' served from cache")
+        return weather_data
+    return await WEATHER_REQUESTS.do(key, lambda: fetch_weather_limited(location))
+
+# Cached answers only count against a per-user cooldown; upstream requests against the global one
+async def check_weather_cooldown(command, user_id, cached):
+    if cached:
+        return await rate_limiter.check_user_cooldown(command, user_id)
+    return await rate_limiter.check_command_cooldown(command)
+
+# (city name, country code, UTC offset in seconds) of a location, or None when not cached
+def get_cached_timezone(location):
+    return TIMEZONE_CACHE.get(normalise_location(location))
+
 # ----------------------------------------------------------------
 # Component test function for [Utility Commands]
 # ----------------------------------------------------------------
@@ -74,7 +169,7 @@ async def component_test():
         messages.append("Warning: OPENWEATHERMAP_API_KEY not present in .env file.")
         
     try:
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session() as session:
             async with session.get('https://api.openweathermap.org/data/2.5/weather?q=London&appid=dummy', timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 401:
                     messages.append("OpenWeatherMap API reachable.")
@@ -85,6 +180,9 @@ async def component_test():
     except Exception as e:
         status = "🟧"
         messages.append(f"API not reachable: {e}")
+
+    weather_stats = WEATHER_CACHE.stats()
+    messages.append(f"Weather cache: {weather_stats['entries']} locations, {weather_stats['hit_rate']:.0%} hit rate, {len(TIMEZONE_CACHE)} timezones")
         
     return {"status": status, "msg": " | ".join(messages)}
 
@@ -178,34 +276,6 @@ async def handle_utility_commands(client, message, user_message):
     # Helper functions for !weather
     # --------------------------------------------------
     
-    # Asynchronous function to get weather data
-    async def get_weather(location):
-        api_key = os.getenv('OPENWEATHERMAP_API_KEY')  # Get the API key from .env
-
-        if not api_key:
-            logging.error("API key is missing.")
-            return None
-
-        base_url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}&units=metric"
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(base_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    if response.status == 200:
-                        try:
-                            return await response.json()
-                        except (ValueError, aiohttp.ContentTypeError) as e:
-                            logging.error(f"Failed to parse weather API response: {e}")
-                            return None
-                    else:
-                        logging.warning(f"Failed to fetch weather data. Status code: {response.status}")
-                        return None
-        except asyncio.TimeoutError:
-            logging.error(f"Weather API request timed out for location: {location}")
-            return None
-        except aiohttp.ClientError as e:
-            logging.error(f"API request failed: {e}")
-            return None
-
     # Function to convert wind direction in degrees to compass direction
     def wind_direction(degrees):
         directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
@@ -220,21 +290,23 @@ async def handle_utility_commands(client, message, user_message):
     # ---------------------------------------------------
     
     if user_message.startswith('!weather'):
-        allowed, error_msg = await rate_limiter.check_command_cooldown('weather')
+        location = user_message.split(' ', 1)[1] if len(user_message.split()) > 1 else 'Frankfurt am Main'
+        cached = normalise_location(location) in WEATHER_CACHE
+
+        allowed, error_msg = await check_weather_cooldown('weather', message.author.id, cached)
         if not allowed:
             await safe_send(message, content=error_msg)
             return
-        
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_openweather, "OpenWeatherMap")
-        if not allowed:
-            await safe_send(message, content=error_msg)
+
+        try:
+            weather_data = await get_weather(location)
+        except WeatherRateLimited as e:
+            await safe_send(message, content=str(e))
             return
-        
-        location = user_message.split(' ', 1)[1] if len(user_message.split()) > 1 else 'Frankfurt am Main'
-        weather_data = await get_weather(location)
 
         if weather_data and weather_data['cod'] == 200:
-            rate_limiter.command_cooldown.set_cooldown('weather')
+            if not cached:
+                rate_limiter.command_cooldown.set_cooldown('weather')
             # Extract data from the weather response
             city_name = weather_data['name']
             country = weather_data['sys']['country']
@@ -293,21 +365,23 @@ async def handle_utility_commands(client, message, user_message):
     # ---------------------------------------------------------
     
     if user_message.startswith('!city'):
-        allowed, error_msg = await rate_limiter.check_command_cooldown('city')
+        location = user_message.split(' ', 1)[1] if len(user_message.split()) > 1 else 'London'
+        cached = normalise_location(location) in WEATHER_CACHE
+
+        allowed, error_msg = await check_weather_cooldown('city', message.author.id, cached)
         if not allowed:
             await safe_send(message, content=error_msg)
             return
-        
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_openweather, "OpenWeatherMap")
-        if not allowed:
-            await safe_send(message, content=error_msg)
+
+        try:
+            weather_data = await get_weather(location)
+        except WeatherRateLimited as e:
+            await safe_send(message, content=str(e))
             return
-        
-        location = user_message.split(' ', 1)[1] if len(user_message.split()) > 1 else 'London'
-        weather_data = await get_weather(location)
 
         if weather_data and weather_data['cod'] == 200:
-            rate_limiter.command_cooldown.set_cooldown('city')
+            if not cached:
+                rate_limiter.command_cooldown.set_cooldown('city')
             # Extract data from the weather response
             city_name = weather_data['name']
             country_code = weather_data['sys']['country']  # Country code
@@ -358,26 +432,31 @@ async def handle_utility_commands(client, message, user_message):
     # ------------------------------------------------------
     
     if user_message.startswith('!time'):
-        allowed, error_msg = await rate_limiter.check_command_cooldown('time')
-        if not allowed:
-            await safe_send(message, content=error_msg)
-            return
-        
-        allowed, error_msg = await rate_limiter.check_api_limit(rate_limiter.api_limiter_openweather, "OpenWeatherMap")
+        location = user_message.split(' ', 1)[1] if len(user_message.split()) > 1 else 'London'
+        key = normalise_location(location)
+        cached = key in TIMEZONE_CACHE or key in WEATHER_CACHE
+
+        allowed, error_msg = await check_weather_cooldown('time', message.author.id, cached)
         if not allowed:
             await safe_send(message, content=error_msg)
             return
-        
-        location = user_message.split(' ', 1)[1] if len(user_message.split()) > 1 else 'London'
-        weather_data = await get_weather(location)
 
-        if weather_data and weather_data['cod'] == 200:
-            rate_limiter.command_cooldown.set_cooldown('time')
-            # Extract data from the weather response
-            city_name = weather_data['name']
-            country_code = weather_data['sys']['country']  # Country code
+        # The UTC offset is all !time needs, so a cached one saves the API call
+        timezone_info = get_cached_timezone(location)
+        if timezone_info is None:
+            try:
+                weather_data = await get_weather(location)
+            except WeatherRateLimited as e:
+                await safe_send(message, content=str(e))
+                return
+            if weather_data and weather_data['cod'] == 200:
+                timezone_info = (weather_data['name'], weather_data['sys']['country'], weather_data['timezone'])
+
+        if timezone_info is not None:
+            if not cached:
+                rate_limiter.command_cooldown.set_cooldown('time')
+            city_name, country_code, timezone_offset = timezone_info
             country = country_names.get(country_code, country_code)  # Get full country name or use code if not found
-            timezone_offset = weather_data['timezone']
             timezone_offset_hours = timezone_offset / 3600  # Divide by 3600 to convert seconds to hours
             timezone_offset_formatted = f"{timezone_offset_hours:+.1f} hours"  # Add "+" for positive offsets
 
@@ -0,0 +1,288 @@
+import os
+import math
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+import aiohttp
+import urllib.parse
+from internal import utils
+from internal import rate_limiter
+from internal import http_client
+from internal.cache import LRUCache, SingleFlight
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Word_dictionary.py
+# Description: Word validation for the word games (dictionaryapi.dev)
+# Local wordlists (Bloom filter) and a persistent word cache keep most lookups off the network
+# ================================================================
+
+# ----------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------
+
+# Optional "dictionary" section in config.json
+DICTIONARY_CONFIG = utils.get_config_value("dictionary", default={}) or {}
+
+API_URL = "https://api.dictionaryapi.dev/api/v2/entries"
+API_TIMEOUT = float(DICTIONARY_CONFIG.get("timeout", 5))
+LANGUAGES = {"En": "en", "De": "de"}  # Game language -> API language code
+
+CACHE_ENTRIES = int(DICTIONARY_CONFIG.get("cache_entries", 20000))  # Per language
+VALID_TTL = float(DICTIONARY_CONFIG.get("valid_ttl", 180 * 86400))  # Known words stay known
+INVALID_TTL = float(DICTIONARY_CONFIG.get("invalid_ttl", 7 * 86400))  # Unknown words may still be added to the dictionary
+CACHE_PERSIST = bool(DICTIONARY_CONFIG.get("persist", True))
+CACHE_FILE = "dictionary_cache.json"
+CACHE_SAVE_INTERVAL = 60.0
+
+# Plain text files with one word per line, relative to internal/data (missing files are skipped)
+WORDLISTS = DICTIONARY_CONFIG.get("wordlists", {"En": "wordlists/en.txt", "De": "wordlists/de.txt"}) or {}
+BLOOM_ERROR_RATE = float(DICTIONARY_CONFIG.get("bloom_error_rate", 0.001))  # Share of unknown words the filter accepts
+BATCH_CONCURRENCY = int(DICTIONARY_CONFIG.get("batch_concurrency", 4))  # Parallel API requests of one validate_words call
+
+# ----------------------------------------------------------------
+# Bloom Filter
+# ----------------------------------------------------------------
+
+class BloomFilter:
+    # Set membership in a fixed bit array: no false negatives, false positives at about error_rate
+    # A 200k word list needs about 350 KB instead of the ~15 MB of a Python set
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))  # Bits
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    # Double hashing: k bit positions from two 64-bit halves of one digest
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+# ----------------------------------------------------------------
+# Wordlists
+# ----------------------------------------------------------------
+
+WORDLIST_FILTERS: dict[str, BloomFilter | None] = {}  # language -> filter (None: no wordlist)
+_wordlist_lock = threading.Lock()
+
+def normalise_word(word: str) -> str:
+    return word.strip().lower()  # Not casefold(): "Straße" must not become "strasse"
+
+def _build_filter(language: str) -> BloomFilter | None:
+    rel_path = WORDLISTS.get(language)
+    if not rel_path:
+        return None
+    path = os.path.join(utils.BASE_DATA_DIR, *rel_path.split("/"))
+    if not os.path.exists(path):
+        logging.debug(f"No {language} wordlist at {path}, using the dictionary API only")
+        return None
+
+    started = time.perf_counter()
+    with open(path, encoding="utf-8") as fh:
+        words = {normalise_word(line) for line in fh if line.strip()}
+    bloom = BloomFilter(len(words), BLOOM_ERROR_RATE)
+    for word in words:
+        bloom.add(word)
+    logging.info(f"{language} wordlist loaded: {bloom.count:,} words, {len(bloom.bits) / 1024:.0f} KB filter in {time.perf_counter() - started:.1f}s")
+    return bloom
+
+# Filter of a language's wordlist, built on first use (call from a thread, reading the file takes a moment)
+def get_wordlist_filter(language: str) -> BloomFilter | None:
+    if language not in WORDLIST_FILTERS:
+        with _wordlist_lock:
+            if language not in WORDLIST_FILTERS:
+                try:
+                    WORDLIST_FILTERS[language] = _build_filter(language)
+                except OSError as e:
+                    logging.error(f"Failed to load {language} wordlist: {e}")
+                    WORDLIST_FILTERS[language] = None
+    return WORDLIST_FILTERS[language]
+
+# ----------------------------------------------------------------
+# Word Cache
+# ----------------------------------------------------------------
+
+WORD_CACHE = {language: LRUCache(max_entries=CACHE_ENTRIES) for language in LANGUAGES}  # word -> (valid, checked at (wall clock))
+WORD_REQUESTS = SingleFlight()  # One API request per word, also when several games ask at once
+_cache_loaded = False
+_cache_dirty = False
+_cache_last_save = 0.0
+
+_cache_load_lock = asyncio.Lock()
+
+# Read persisted lookups that are still valid (runs in a thread): [(language, word, entry, ttl)]
+def _read_word_cache() -> list[tuple[str, str, tuple[bool, float], float]]:
+    now = time.time()
+    entries = []
+    for language, words in utils.load_json_file(CACHE_FILE).items():
+        if language not in WORD_CACHE or not isinstance(words, dict):
+            continue
+        for word, entry in words.items():
+            try:
+                valid, checked_at = bool(entry[0]), float(entry[1])
+            except (TypeError, ValueError, IndexError):
+                continue
+            remaining = (VALID_TTL if valid else INVALID_TTL) - (now - checked_at)
+            if remaining > 0:
+                entries.append((language, word, (valid, checked_at), remaining))
+    return entries
+
+# Restore persisted lookups (lazily, on the first validation)
+# The file is parsed in a thread, the caches are only filled on the event loop (not thread-safe)
+async def _load_word_cache():
+    global _cache_loaded
+    async with _cache_load_lock:
+        if _cache_loaded:
+            return
+        entries = await asyncio.to_thread(_read_word_cache) if CACHE_PERSIST else []
+        for language, word, entry, ttl in entries:
+            WORD_CACHE[language].set(word, entry, ttl=ttl)
+        _cache_loaded = True
+    logging.debug(f"Restored {len(entries)} dictionary lookup(s)")
+
+def _remember(language: str, word: str, valid: bool):
+    global _cache_dirty
+    WORD_CACHE[language].set(word, (valid, time.time()), ttl=VALID_TTL if valid else INVALID_TTL)
+    _cache_dirty = True
+
+def _cache_snapshot() -> dict:
+    return {language: {word: [valid, checked_at] for word, (valid, checked_at) in cache.items()} for language, cache in WORD_CACHE.items()}
+
+def _write_cache(data: dict) -> bool:
+    try:
+        utils.save_json_file(data, CACHE_FILE)
+        return True
+    except Exception as e:
+        logging.error(f"Failed to save dictionary cache: {e}")
+        return False
+
+# Write lookups to disk synchronously (shutdown and restart)
+def save_word_cache(force: bool = False):
+    global _cache_dirty, _cache_last_save
+    if not CACHE_PERSIST or not _cache_dirty:
+        return
+    now = time.monotonic()
+    if not force and now - _cache_last_save < CACHE_SAVE_INTERVAL:
+        return
+    if _write_cache(_cache_snapshot()):
+        _cache_dirty = False
+        _cache_last_save = now
+
+# Write lookups to disk at most every CACHE_SAVE_INTERVAL seconds; the snapshot is taken on the
+# event loop (the caches are not thread-safe), the JSON is written in a thread
+async def _save_word_cache_async():
+    global _cache_dirty, _cache_last_save
+    now = time.monotonic()
+    if not CACHE_PERSIST or not _cache_dirty or now - _cache_last_save < CACHE_SAVE_INTERVAL:
+        return
+    _cache_last_save = now
+    _cache_dirty = False  # Lookups during the write mark the cache dirty again
+    if not await asyncio.to_thread(_write_cache, _cache_snapshot()):
+        _cache_dirty = True
+
+# ----------------------------------------------------------------
+# Dictionary API
+# ----------------------------------------------------------------
+
+# True/False from dictionaryapi.dev, None when the answer is unknown (error, rate limit)
+async def _lookup(language: str, word: str) -> bool | None:
+    allowed, _ = await rate_limiter.check_api_limit(rate_limiter.api_limiter_dictionary, "Dictionary API")
+    if not allowed:
+        return None
+
+    url = f"{API_URL}/{LANGUAGES[language]}/{urllib.parse.quote(word)}"
+    try:
+        async with http_client.session() as session:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=API_TIMEOUT)) as response:
+                if response.status == 200:
+                    _remember(language, word, True)
+                    return True  # Word exists
+                elif response.status == 404:
+                    _remember(language, word, False)
+                    return False  # Word does not exist
+                else:
+                    logging.warning(f"Unexpected response from dictionary API: {response.status}")
+                    return None
+    except asyncio.TimeoutError:
+        logging.error(f"Dictionary API request timed out for '{word}'")
+        return None
+    except aiohttp.ClientError as e:
+        logging.error(f"Error connecting to dictionary API: {e}")
+        return None
+
+# Answer without the network: wordlist first, then earlier lookups (None: unknown)
+def _check_local(language: str, word: str) -> bool | None:
+    bloom = WORDLIST_FILTERS.get(language)
+    if bloom is not None and word in bloom:
+        return True
+    entry = WORD_CACHE[language].get(word)
+    return entry[0] if entry is not None else None
+
+# ----------------------------------------------------------------
+# Word Validation
+# ----------------------------------------------------------------
+
+# Validate several words at once; returns {word as given: valid}
+# Local answers need no request, the rest are looked up concurrently (BATCH_CONCURRENCY at a time)
+async def validate_words(words: list[str], language: str) -> dict[str, bool]:
+    if language not in LANGUAGES:
+        logging.error(f"Unsupported language '{language}' for dictionary lookup.")
+        return {word: False for word in words}
+    if not _cache_loaded:
+        await _load_word_cache()
+    if language not in WORDLIST_FILTERS:
+        await asyncio.to_thread(get_wordlist_filter, language)
+
+    results: dict[str, bool] = {}
+    pending: set[str] = set()
+    for word in words:
+        key = normalise_word(word)
+        # Only letters (including umlauts) can be words; no request for anything else
+        if not key.isalpha():
+            results[word] = False
+            continue
+        local = _check_local(language, key)
+        if local is None:
+            pending.add(key)
+        else:
+            results[word] = local
+
+    if pending:
+        semaphore = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
+
+        async def lookup(key: str) -> bool | None:
+            async with semaphore:
+                return await WORD_REQUESTS.do((language, key), lambda: _lookup(language, key))
+
+        keys = sorted(pending)
+        answers = dict(zip(keys, await asyncio.gather(*(lookup(key) for key in keys))))
+        for word in words:
+            if word not in results:
+                # Unknown (API unreachable) counts as invalid, but is not cached
+                results[word] = bool(answers.get(normalise_word(word)))
+        await _save_word_cache_async()
+    return results
+
+async def is_valid_word(word: str, language: str) -> bool:
+    return (await validate_words([word], language))[word]
+
+def get_stats() -> str:
+    entries = sum(len(cache) for cache in WORD_CACHE.values())
+    hits = sum(cache.hits for cache in WORD_CACHE.values())
+    lookups = hits + sum(cache.misses for cache in WORD_CACHE.values())
+    wordlists = ", ".join(f"{language} {bloom.count:,}" for language, bloom in WORDLIST_FILTERS.items() if bloom is not None) or "none loaded"
+    return f"Dictionary cache: {entries} words, {hits / lookups if lookups else 0.0:.0%} hit rate | Wordlists: {wordlists}"
@@ -1,15 +1,12 @@
+import sys
+import asyncio
 import logging
 import inspect
+import importlib.util
 from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
 from internal import utils
 from internal import rate_limiter
-from internal.command_modules.calculator import handle_calc_command
-from internal.command_modules.minigames import handle_minigames_commands
-from internal.command_modules.utility_commands import handle_utility_commands
-from internal.command_modules.public_commands import handle_public_commands
-from internal.command_modules.moderation_commands import handle_moderation_commands
-from internal.command_modules.sciencecific_commands import handle_sciencecific_commands
-from internal.command_modules.music.music_commands import handle_music_commands
+from internal import lazy_import
 
 # Copyright (c) 2026 Dennis Plischke.
 # All rights reserved.
@@ -43,15 +40,22 @@ command_groups = {
     'music': ['!music-channel', '!join', '!leave', '!play', '!pause', '!resume', '!skip', '!last', '!stop', '!repeat', '!queue', '!nowplaying'],
 }
 
-# Command handlers mapping
+# Command handlers mapping: group -> (module, handler function)
+# Modules are imported on first use (or by the warm-up after on_ready) to keep startup fast
 command_handlers = {
-    'utility': handle_utility_commands,
-    'minigames': handle_minigames_commands,
-    'public': handle_public_commands,
-    'moderation': handle_moderation_commands,
-    'sciencecific': handle_sciencecific_commands,
-    'music': handle_music_commands,
+    'utility': ("internal.command_modules.utility_commands", "handle_utility_commands"),
+    'minigames': ("internal.command_modules.minigames", "handle_minigames_commands"),
+    'public': ("internal.command_modules.public_commands", "handle_public_commands"),
+    'moderation': ("internal.command_modules.moderation_commands", "handle_moderation_commands"),
+    'sciencecific': ("internal.command_modules.sciencecific_commands", "handle_sciencecific_commands"),
+    'music': ("internal.command_modules.music.music_commands", "handle_music_commands"),
 }
+CALC_MODULE = "internal.command_modules.calculator"
+
+# Optional "startup" section in config.json
+STARTUP_CONFIG = utils.get_config_value("startup", default={}) or {}
+WARM_UP_ENABLED = bool(STARTUP_CONFIG.get("warm_up", True))
+WARM_UP_EXTRA_MODULES = list(STARTUP_CONFIG.get("warm_up_modules", ["yt_dlp"]))  # Heavy dependencies to preload
 
 # Commands that cannot be executed in a DM
 no_dm_commands = [
@@ -62,10 +66,84 @@ no_dm_commands = [
     '!queue', '!nowplaying'
 ]
 
+# ----------------------------------------------------------------
+# Lazy handler loading
+# ----------------------------------------------------------------
+
+_loaded_handlers: Dict[str, Callable[..., Awaitable[Any]]] = {}
+
+# Resolve a command group's handler, importing its module on first use
+def get_handler(group: str) -> Callable[..., Awaitable[Any]]:
+    handler = _loaded_handlers.get(group)
+    if handler is None:
+        module_name, handler_name = command_handlers[group]
+        handler = getattr(lazy_import.load(module_name), handler_name)
+        _loaded_handlers[group] = handler
+    return handler
+
+# Import the remaining command modules and heavy dependencies in a background thread
+async def warm_up():
+    if not WARM_UP_ENABLED:
+        logging.info("Module warm-up disabled, modules load on first use.")
+        return
+    modules = [CALC_MODULE] + [module_name for module_name, _ in command_handlers.values()] + WARM_UP_EXTRA_MODULES
+    pending = [name for name in modules if not lazy_import.is_loaded(name)]
+    if pending:
+        await asyncio.to_thread(lazy_import.warm_up, pending)
+    logging.info(f"Module warm-up finished. {lazy_import.format_import_report()}")
+
 # ----------------------------------------------------------------
 # Component test function for command handlers
 # ----------------------------------------------------------------
 
+# Modules whose component test was skipped at startup (run by deferred_component_tests)
+_untested_modules: Dict[str, str] = {}  # name -> module name
+
+# Run the component test of a loaded module; modules that are not loaded yet are only located,
+# importing them here would undo the lazy loading (the tests run before the bot starts)
+async def _module_component_test(module_name: str) -> Dict[str, str]:
+    module = sys.modules.get(module_name)
+    if module is None:
+        try:
+            found = importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError) as e:
+            return {"status": "🟥", "msg": f"Error locating module: {e}"}
+        if not found:
+            return {"status": "🟥", "msg": f"Module {module_name} not found."}
+        # Not healthy yet, only present: API keys, ffmpeg, ... are checked after the warm-up
+        return {"status": "🟨", "msg": "Not tested (not loaded yet), tested after the warm-up."}
+
+    try:
+        module = lazy_import.load(module_name)  # Waits if the warm-up is still importing it
+        if not hasattr(module, "component_test"):
+            return {"status": "🟧", "msg": "No component test found."}
+        test_func: ComponentTestFunc = getattr(module, "component_test") # type: ignore
+        if inspect.iscoroutinefunction(test_func):
+            return await test_func() # type: ignore
+        return test_func() # type: ignore
+    except Exception as e:
+        print(f"  Status: 🟥 Error during loading.: {e}")
+        return {"status": "🟥", "msg": f"Error during loading.: {e}"}
+
+def _command_modules() -> List[Tuple[str, str]]:
+    return [("calculator", CALC_MODULE)] + [(name, module_name) for name, (module_name, _) in command_handlers.items()]
+
+# Run the component tests skipped at startup once the warm-up has loaded the modules
+async def deferred_component_tests() -> List[Tuple[str, Dict[str, str]]]:
+    results = []
+    for name, module_name in list(_untested_modules.items()):
+        if module_name not in sys.modules:
+            continue  # Warm-up disabled or failed; tested on the next start
+        result = await _module_component_test(module_name)
+        del _untested_modules[name]
+        results.append((name, result))
+        message = f"Component test {name}: {result.get('status', '🟥')} {result.get('msg', 'Unknown error')}"
+        if result.get("status") == "🟩":
+            logging.info(message)
+        else:
+            logging.warning(message)
+    return results
+
 # Component test function for all command handlers
 async def component_test() -> List[Tuple[str, Dict[str, str]]]:
     results: List[Tuple[str, Dict[str, str]]] = []
@@ -83,34 +161,23 @@ async def component_test() -> List[Tuple[str, Dict[str, str]]]:
     except Exception as e:
         results.append(("rate_limiter", {"status": "🟥", "msg": f"Error during loading: {e}"}))
 
-    # Component test for calculator module
+    # Component tests for the calculator and the other command modules
+    for name, module_name in _command_modules():
+        result = await _module_component_test(module_name)
+        if module_name not in sys.modules and result["status"] == "🟨":
+            _untested_modules[name] = module_name
+        results.append((name, result))
+
+    # Circuit breakers of the external APIs (after the module tests above used them)
     try:
-        import internal.command_modules.calculator as calc
-        if hasattr(calc, "component_test"):
-            result = calc.component_test()
-            results.append(("calculator", result))
-        else:
-            results.append(("calculator", {"status": "🟧", "msg": "No component test found."}))
+        from internal import circuit_breaker
+        results.append(("circuit_breakers", circuit_breaker.component_test()))
     except Exception as e:
-        results.append(("calculator", {"status": "🟥", "msg": f"Error during loading.: {e}"}))
-        
-    # Component tests for other modules
-    for name, handler in command_handlers.items():
-        try:
-            mod = handler.__module__
-            module = __import__(mod, fromlist=["component_test"])
-            if hasattr(module, "component_test"):
-                test_func: ComponentTestFunc = getattr(module, "component_test") # type: ignore
-                if inspect.iscoroutinefunction(test_func):
-                    result: Dict[str, str] = await test_func() # type: ignore
-                else:
-                    result: Dict[str, str] = test_func() # type: ignore
-                results.append((name, result))
-            else:
-                results.append((name, {"status": "🟧", "msg": "No component test found."}))
-        except Exception as e:
-            print(f"  Status: 🟥 Error during loading.: {e}")
-            results.append((name, {"status": "🟥", "msg": f"Error during loading.: {e}"}))
+        results.append(("circuit_breakers", {"status": "🟥", "msg": f"Error during loading: {e}"}))
+
+    # Import-time report (regressions in startup time show up here)
+    slow = [name for name, duration in lazy_import.get_import_report() if duration >= lazy_import.SLOW_IMPORT_WARNING]
+    results.append(("imports", {"status": "🟨" if slow else "🟩", "msg": lazy_import.format_import_report()}))
     return results
 
 # ----------------------------------------------------------------
@@ -132,6 +199,7 @@ async def handle_command(client, message) -> Union[str, None]:
     # Handle !calc separately
     if user_message.startswith('!calc'):
         try:
+            handle_calc_command = getattr(lazy_import.load(CALC_MODULE), "handle_calc_command")
             return await handle_calc_command(client, message, user_message)
         except Exception as e:
             logging.error(f"Error in !calc command handler: {e}", exc_info=True)
@@ -140,10 +208,10 @@ async def handle_command(client, message) -> Union[str, None]:
     # Handle other commands
     for group, commands in command_groups.items():
         if any(user_message.startswith(cmd) for cmd in commands):
-            handler = command_handlers[group]
-            logging.debug(f"Routing command '{user_message}' to handler '{handler.__name__}'")
             try:
-                return await command_handlers[group](client, message, user_message)
+                handler = get_handler(group)
+                logging.debug(f"Routing command '{user_message}' to handler '{handler.__name__}'")
+                return await handler(client, message, user_message)
             except Exception as e:
                 logging.error(f"Error in command handler '{group}': {e}", exc_info=True)
                 return "⚠️ An error occurred while processing your command."
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import aiohttp
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from internal import utils
+from internal import circuit_breaker
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Http_client.py
+# Description: One long-lived aiohttp session shared by all outbound API calls
+# Keeps connections alive and caches DNS instead of a new handshake per command
+# ================================================================
+
+# ----------------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------------
+
+# Optional "http" section in config.json
+HTTP_CONFIG = utils.get_config_value("http", default={}) or {}
+
+CONNECTION_LIMIT = int(HTTP_CONFIG.get("connection_limit", 32))  # Open connections in total
+CONNECTION_LIMIT_PER_HOST = int(HTTP_CONFIG.get("connection_limit_per_host", 6))  # e.g. api.nasa.gov
+KEEPALIVE_TIMEOUT = float(HTTP_CONFIG.get("keepalive_timeout", 60))  # Seconds an idle connection is kept
+DNS_CACHE_TTL = int(HTTP_CONFIG.get("dns_cache_ttl", 300))  # Seconds a DNS lookup is reused
+DEFAULT_TIMEOUT = float(HTTP_CONFIG.get("default_timeout", 10))  # Used when a request sets no timeout
+USER_AGENT = "MCLP-Discord-Bot (+https://github.com/MinecraftLetsPlay/Discord-Bot)"
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+_sessions_created = 0
+
+# ----------------------------------------------------------------
+# Session Handling
+# ----------------------------------------------------------------
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+        headers={"User-Agent": USER_AGENT},
+        trace_configs=[circuit_breaker.create_trace_config()],  # Fail fast while an API is down
+    )
+
+# Shared session of the running event loop (created on first use)
+# Component tests run in their own loop before the bot starts, so a session is bound to its loop
+def get_session() -> aiohttp.ClientSession:
+    global _session, _session_loop, _sessions_created
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and not _session.closed:
+            logging.warning("Shared HTTP session belonged to another event loop, creating a new one")
+        _session = _create_session()
+        _session_loop = loop
+        _sessions_created += 1
+        logging.debug(f"Shared HTTP session created (limit {CONNECTION_LIMIT}, {CONNECTION_LIMIT_PER_HOST} per host)")
+    return _session
+
+# Borrow the shared session; unlike aiohttp.ClientSession() it is not closed on exit
+@asynccontextmanager
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    yield get_session()
+
+# Create the session at startup so the first command does not pay for it
+async def start():
+    get_session()
+
+# Close the session and its connections (shutdown, restart, end of component tests)
+async def close():
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+        # Give SSL connections a moment to shut down cleanly
+        await asyncio.sleep(0.25)
+        logging.debug("Shared HTTP session closed")
+    _session = None
+    _session_loop = None
+
+def get_stats() -> dict[str, Any]:
+    connector = _session.connector if _session is not None and not _session.closed else None
+    return {
+        "open": connector is not None,
+        "sessions_created": _sessions_created,
+        "idle_connections": sum(len(conns) for conns in getattr(connector, "_conns", {}).values()) if connector else 0,
+    }
@@ -0,0 +1,76 @@
+import sys
+import time
+import logging
+import importlib
+import threading
+from types import ModuleType
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Lazy_import.py
+# Description: Deferred imports of heavy modules with an import-time report
+# sympy, yt-dlp and the command modules are loaded on first use instead of at startup
+# ================================================================
+
+# ----------------------------------------------------------------
+# Import Timing
+# ----------------------------------------------------------------
+
+IMPORT_TIMES: dict[str, float] = {}  # module name -> seconds the first import took
+SLOW_IMPORT_WARNING = 1.0  # Seconds; slower imports are logged as warnings
+
+_lock = threading.Lock()  # Guards IMPORT_TIMES only; importlib has its own per-module import locks
+
+# Import a module on first use and remember how long that took
+def load(name: str) -> ModuleType:
+    first = name not in sys.modules
+    started = time.perf_counter()
+    # Always through importlib: while the warm-up thread is still importing a module, sys.modules
+    # already holds the half-initialised module and import_module waits until it is complete
+    module = importlib.import_module(name)
+    if not first:
+        return module
+    duration = time.perf_counter() - started
+
+    with _lock:
+        if name in IMPORT_TIMES:
+            return module
+        IMPORT_TIMES[name] = duration
+    if duration >= SLOW_IMPORT_WARNING:
+        logging.warning(f"Slow import: {name} took {duration:.2f}s")
+    else:
+        logging.debug(f"Imported {name} in {duration:.2f}s")
+    return module
+
+def is_loaded(name: str) -> bool:
+    return name in sys.modules
+
+# Import a list of modules (used for the background warm-up after on_ready)
+def warm_up(names: list[str]):
+    for name in names:
+        try:
+            load(name)
+        except Exception as e:
+            logging.error(f"Warm-up import of {name} failed: {e}")
+
+# ----------------------------------------------------------------
+# Import Report
+# ----------------------------------------------------------------
+
+# Slowest imports first
+def get_import_report() -> list[tuple[str, float]]:
+    return sorted(IMPORT_TIMES.items(), key=lambda item: item[1], reverse=True)
+
+def format_import_report(limit: int = 10) -> str:
+    report = get_import_report()
+    if not report:
+        return "No deferred imports yet."
+    total = sum(duration for _, duration in report)
+    parts = [f"{name} {duration:.2f}s" for name, duration in report[:limit]]
+    return f"{len(report)} deferred import(s), {total:.2f}s total: " + ", ".join(parts)
+
+def log_import_report():
+    for name, duration in get_import_report():
+        logging.info(f"   • {name}: {duration:.2f}s")
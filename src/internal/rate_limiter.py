@@ -99,6 +99,29 @@ class CommandCooldown:
         return max(0.0, cooldown_seconds - elapsed)
 
 
+class UserCooldown:
+    # Per-user cooldown per command (used where a command does not spend API budget)
+    def __init__(self):
+        self.last_execution: Dict[Tuple[str, int], float] = {}  # (command, user_id) -> last execution
+
+    def is_on_cooldown(self, command: str, user_id: int, cooldown_seconds: int) -> Tuple[bool, float]:
+        # Returns: (on_cooldown: bool, remaining_seconds: float)
+        last = self.last_execution.get((command, user_id))
+        if last is not None:
+            elapsed = time.time() - last
+            if elapsed < cooldown_seconds:
+                return True, cooldown_seconds - elapsed
+        return False, 0.0
+
+    def set_cooldown(self, command: str, user_id: int):
+        now = time.time()
+        # Drop expired entries now and then so the dict does not grow with every user ever seen
+        if len(self.last_execution) > 1000:
+            longest = max(USER_COOLDOWNS.values(), default=0)
+            self.last_execution = {key: last for key, last in self.last_execution.items() if now - last < longest}
+        self.last_execution[(command, user_id)] = now
+
+
 class GlobalCooldown:
     # Global emergency cooldown for all commands
     def __init__(self):
@@ -168,6 +191,9 @@ api_limiter_nitrado = RateLimiter(max_requests=3, time_window=60)
 
 command_cooldown = CommandCooldown()
 
+# Per-user cooldown for answers served from cache
+user_cooldown = UserCooldown()
+
 # Global emergency cooldown (for spam/attack protection)
 global_cooldown = GlobalCooldown()
 
@@ -201,6 +227,14 @@ COMMAND_COOLDOWNS = {
     'catfact': 3,
 }
 
+# Per-user cooldowns (in seconds) for commands answered from cache
+# These use no API budget, so the global cooldowns above do not apply to them
+USER_COOLDOWNS = {
+    'weather': 3,
+    'city': 3,
+    'time': 3,
+}
+
 # ----------------------------------------------------------------
 # Helper Functions
 # ----------------------------------------------------------------
@@ -243,6 +277,24 @@ async def check_command_cooldown(command: str) -> Tuple[bool, Optional[str]]:
     command_cooldown.set_cooldown(command)
     return True, None
 
+async def check_user_cooldown(command: str, user_id: int) -> Tuple[bool, Optional[str]]:
+    # Check a user's cooldown for a command served from cache
+    # Returns: (allowed: bool, error_message: Optional[str])
+    cooldown_seconds = USER_COOLDOWNS.get(command, 0)
+
+    if cooldown_seconds <= 0:
+        return True, None
+
+    on_cooldown, remaining = user_cooldown.is_on_cooldown(command, user_id, cooldown_seconds)
+
+    if on_cooldown:
+        error_msg = f"Please wait {remaining:.0f} seconds before using this command again."
+        log_cooldown_hit(command, remaining)
+        return False, error_msg
+
+    user_cooldown.set_cooldown(command, user_id)
+    return True, None
+
 def get_cooldown_remaining(command: str) -> float:
     # Get remaining cooldown time for command
     cooldown_seconds = COMMAND_COOLDOWNS.get(command, 0)
@@ -0,0 +1,350 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Copyright (c) 2026 Dennis Plischke.
+# All rights reserved.
+
+# ================================================================
+# Module: Benchmark.py
+# Description: Latency and throughput benchmark for the calculator pipeline
+# Reports percentiles per stage, compares against a stored baseline and
+# flags inputs that exceed the time budget (for tuning the calculator limits)
+#
+# Usage (from the repository root, inside the bot's venv):
+#   python tools/calculator-benchmark/benchmark.py
+#   python tools/calculator-benchmark/benchmark.py --fuzz 200 --seed 7
+#   python tools/calculator-benchmark/benchmark.py --save-baseline
+#   python tools/calculator-benchmark/benchmark.py --compare
+#
+# The baseline holds timings of one machine and is not committed: save it locally
+# before a change and compare on the same machine afterwards (see README.md)
+# ================================================================
+
+TOOL_DIR = Path(__file__).resolve().parent
+SRC_DIR = TOOL_DIR.parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from internal.command_modules import calculator, calculator_sandbox  # noqa: E402
+
+CORPUS_FILE = TOOL_DIR / "corpus.json"
+BASELINE_FILE = TOOL_DIR / "baseline.json"
+
+# Stages that run on the event loop; a slow call here stalls the whole bot
+INLINE_STAGES = ("validate", "replace", "fast_path", "solve_pq", "solve_quadratic")
+# Stages that run in the calculator worker pool (bounded by CALCULATION_TIMEOUT)
+POOL_STAGES = ("calculate", "solve_equation", "solve_equation_system")
+
+# ----------------------------------------------------------------
+# Measurements
+# ----------------------------------------------------------------
+
+class StageResult:
+    # Latency samples and outcomes of one pipeline stage
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: List[float] = []  # Seconds per call
+        self.errors = 0
+        self.timeouts = 0
+        self.slowest: List[Tuple[float, str]] = []  # (seconds, input) of the worst calls
+
+    def add(self, seconds: float, label: str):
+        self.samples.append(seconds)
+        self.slowest.append((seconds, label))
+        self.slowest = sorted(self.slowest, reverse=True)[:5]
+
+    def percentile(self, share: float) -> float:
+        # Nearest-rank percentile
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0.0
+        rank = max(0, min(len(ordered) - 1, int(round(share * len(ordered) + 0.5)) - 1))
+        return ordered[rank]
+
+    def summary(self) -> Dict[str, float]:
+        total = sum(self.samples)
+        return {
+            "calls": len(self.samples),
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p90_ms": self.percentile(0.90) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+            "throughput": len(self.samples) / total if total > 0 else 0.0,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+        }
+
+class Benchmark:
+    def __init__(self, repeat: int, pool_repeat: int, inline_budget_ms: float, pool_budget: float):
+        self.repeat = max(1, repeat)
+        self.pool_repeat = max(1, pool_repeat)
+        self.inline_budget = inline_budget_ms / 1000
+        self.pool_budget = pool_budget * calculator.CALCULATION_TIMEOUT
+        self.stages: Dict[str, StageResult] = {name: StageResult(name) for name in INLINE_STAGES + POOL_STAGES}
+        self.pathological: List[Tuple[str, str, float, str]] = []  # (stage, input, seconds, reason)
+
+    # Time a synchronous stage; returns the last result (None if it raised)
+    def run_inline(self, stage: str, label: str, func: Callable[..., Any], *args: Any) -> Any:
+        result = None
+        worst = 0.0
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            try:
+                result = func(*args)
+                failed = False
+            except Exception:
+                result = None
+                failed = True
+            elapsed = time.perf_counter() - started
+            self.stages[stage].add(elapsed, label)
+            worst = max(worst, elapsed)
+        if failed:
+            self.stages[stage].errors += 1
+        if worst > self.inline_budget:
+            self.pathological.append((stage, label, worst, f"blocks the event loop > {self.inline_budget * 1000:g} ms"))
+        return result
+
+    # Time a worker-pool stage through calculate_with_timeout, like the bot does
+    async def run_pool(self, stage: str, label: str, expression: str, task: str = "evaluate_expression"):
+        for _ in range(self.pool_repeat):
+            started = time.perf_counter()
+            try:
+                await calculator.calculate_with_timeout(expression, task)
+                reason = None
+            except calculator.CalculatorError as e:
+                reason = str(e)
+            elapsed = time.perf_counter() - started
+            self.stages[stage].add(elapsed, label)
+
+            if reason and "timed out" in reason:
+                self.stages[stage].timeouts += 1
+                self.pathological.append((stage, label, elapsed, "timed out"))
+                return  # Every repetition would cost the full timeout again
+            if reason:
+                self.stages[stage].errors += 1
+                if "memory" in reason:
+                    self.pathological.append((stage, label, elapsed, "memory limit"))
+                return
+            if elapsed > self.pool_budget:
+                self.pathological.append((stage, label, elapsed, f"over {self.pool_budget:g}s budget"))
+                return
+
+    # Full !calc pipeline for one expression: validate -> replace -> fast path -> worker pool
+    async def expression(self, expr: str, pool_all: bool):
+        label = expr if len(expr) <= 60 else expr[:57] + "..."
+        safe = self.run_inline("validate", label, calculator.is_safe_expression, expr)
+        if not safe or not safe[0]:
+            return  # Rejected by validation, nothing else runs
+
+        replaced = self.run_inline("replace", label, calculator.replace_special_characters, expr)
+        if replaced is None:
+            return
+        fast = self.run_inline("fast_path", label, calculator.fast_evaluate, replaced)
+        if fast is None or pool_all:
+            await self.run_pool("calculate", label, replaced)
+
+# ----------------------------------------------------------------
+# Corpus & Fuzzing
+# ----------------------------------------------------------------
+
+def load_corpus(path: Path, tags: Optional[set]) -> Dict[str, list]:
+    with open(path, "r", encoding="utf-8") as fh:
+        corpus = json.load(fh)
+    if not tags:
+        return corpus
+    return {section: [item for item in items if tags & set(item.get("tags", []))] for section, items in corpus.items()}
+
+FUZZ_FUNCTIONS = ["sin", "cos", "tan", "sqrt", "ln", "log", "exp", "abs", "factorial", "floor", "cbrt", "gamma"]
+FUZZ_OPERATORS = ["+", "-", "*", "/", "^", "%", "**"]
+FUZZ_ATOMS = ["pi", "e", "x", "π", "√2", "0", "0.5", "1e10", "7", "12345678901234567890"]
+
+# Random expression from a small grammar; deliberately produces deep, long and invalid inputs too
+def fuzz_expression(rng: random.Random, depth: int = 0) -> str:
+    roll = rng.random()
+    if depth > 6 or roll < 0.3:
+        if rng.random() < 0.5:
+            return str(rng.choice([rng.randint(0, 99), rng.randint(0, 10 ** rng.randint(1, 30)), round(rng.uniform(-100, 100), 3)]))
+        return rng.choice(FUZZ_ATOMS)
+    if roll < 0.55:
+        return f"{fuzz_expression(rng, depth + 1)} {rng.choice(FUZZ_OPERATORS)} {fuzz_expression(rng, depth + 1)}"
+    if roll < 0.8:
+        return f"{rng.choice(FUZZ_FUNCTIONS)}({fuzz_expression(rng, depth + 1)})"
+    if roll < 0.9:
+        return f"({fuzz_expression(rng, depth + 1)})"
+    return f"{fuzz_expression(rng, depth + 1)}^{rng.randint(2, 5000)}"
+
+# ----------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------
+
+def print_limits():
+    print("Calculator limits:")
+    print(f"  MAX_EXPRESSION_LENGTH   = {calculator.MAX_EXPRESSION_LENGTH}")
+    print(f"  MAX_OPERATIONS          = {calculator.MAX_OPERATIONS}")
+    print(f"  MAX_NESTING_DEPTH       = {calculator.MAX_NESTING_DEPTH}")
+    print(f"  MAX_EQUATION_COMPLEXITY = {calculator.MAX_EQUATION_COMPLEXITY}")
+    print(f"  MAX_FAST_INT_BITS       = {calculator.MAX_FAST_INT_BITS}")
+    print(f"  CALCULATION_TIMEOUT     = {calculator.CALCULATION_TIMEOUT}s")
+    print(f"  Worker pool             = {calculator_sandbox.POOL_SIZE} x {calculator_sandbox.MEMORY_LIMIT_MB} MB, {calculator_sandbox.CPU_LIMIT}s CPU")
+    print()
+
+def print_report(bench: Benchmark) -> Dict[str, Dict[str, float]]:
+    summaries = {}
+    print(f"{'Stage':<22}{'calls':>7}{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'max ms':>11}{'ops/s':>11}{'errors':>8}{'t/o':>5}")
+    print("-" * 97)
+    for name, stage in bench.stages.items():
+        if not stage.samples:
+            continue
+        s = stage.summary()
+        summaries[name] = s
+        print(f"{name:<22}{s['calls']:>7}{s['p50_ms']:>11.3f}{s['p90_ms']:>11.3f}{s['p99_ms']:>11.3f}"
+              f"{s['max_ms']:>11.3f}{s['throughput']:>11.0f}{s['errors']:>8}{s['timeouts']:>5}")
+    print()
+
+    print("Slowest inputs per stage:")
+    for name, stage in bench.stages.items():
+        if stage.slowest:
+            seconds, label = stage.slowest[0]
+            print(f"  {name:<22}{seconds * 1000:>10.3f} ms  {label}")
+    print()
+
+    if bench.pathological:
+        print(f"⚠️ Pathological inputs ({len(bench.pathological)}):")
+        for stage, label, seconds, reason in sorted(bench.pathological, key=lambda item: item[2], reverse=True):
+            print(f"  [{stage}] {seconds * 1000:.1f} ms ({reason}): {label}")
+    else:
+        print("No pathological inputs found.")
+    print()
+    return summaries
+
+# Compare p50/p90/p99 against the baseline; returns the number of regressions
+def compare_baseline(summaries: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float) -> int:
+    regressions = 0
+    print(f"Compared to baseline from {baseline.get('created', 'unknown')} ({baseline.get('host', 'unknown host')}):")
+    for name, summary in summaries.items():
+        old = baseline.get("stages", {}).get(name)
+        if not old:
+            print(f"  {name:<22} (not in baseline)")
+            continue
+        parts = []
+        regressed = False
+        for key in ("p50_ms", "p90_ms", "p99_ms"):
+            before, after = old.get(key, 0.0), summary[key]
+            change = (after - before) / before if before > 0 else 0.0
+            parts.append(f"{key[:3]} {change:+.0%}")
+            # Sub-10µs differences are timer noise
+            if change > tolerance and after - before > 0.01:
+                regressed = True
+        regressions += regressed
+        print(f"  {name:<22} {'  '.join(parts)}{'  ⚠️ regression' if regressed else ''}")
+    print()
+    return regressions
+
+def save_baseline(path: Path, summaries: Dict[str, Dict[str, float]], args: argparse.Namespace):
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "host": os.uname().nodename if hasattr(os, "uname") else "unknown",
+        "python": sys.version.split()[0],
+        "settings": {"repeat": args.repeat, "pool_repeat": args.pool_repeat, "fuzz": args.fuzz, "seed": args.seed},
+        "stages": summaries,
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2)
+    print(f"Baseline saved to {path}")
+
+# ----------------------------------------------------------------
+# Main
+# ----------------------------------------------------------------
+
+async def run(args: argparse.Namespace) -> int:
+    corpus = load_corpus(Path(args.corpus), set(args.tag) if args.tag else None)
+    bench = Benchmark(args.repeat, args.pool_repeat, args.inline_budget_ms, args.pool_budget)
+
+    print_limits()
+    print("Starting calculator worker pool...")
+    # Wait for the workers (sympy import) so start-up is not measured
+    try:
+        await calculator.calculate_with_timeout("x + 1")
+    except calculator.CalculatorError as e:
+        print(f"⚠️ Warm-up calculation failed: {e}")
+    print("Running benchmark...\n")
+
+    for item in corpus.get("expressions", []):
+        await bench.expression(item["expr"], args.pool_all)
+
+    rng = random.Random(args.seed)
+    for _ in range(args.fuzz):
+        await bench.expression(fuzz_expression(rng), args.pool_all)
+
+    for item in corpus.get("pq", []):
+        bench.run_inline("solve_pq", f"pq{tuple(item['args'])}", calculator.solve_pq, *item["args"])
+    for item in corpus.get("quadratic", []):
+        bench.run_inline("solve_quadratic", f"quad{tuple(item['args'])}", calculator.solve_quadratic, *item["args"])
+
+    for item in corpus.get("equations", []):
+        # Same preparation as process_calculation does for solve(...)
+        equation = calculator.replace_special_characters(item["expr"])
+        await bench.run_pool("solve_equation", item["expr"], equation, task="solve_equation")
+    for item in corpus.get("systems", []):
+        expression = f"solve_system({item['equations']!r})"
+        await bench.run_pool("solve_equation_system", " ; ".join(item["equations"]), expression)
+
+    summaries = print_report(bench)
+
+    regressions = 0
+    missing_baseline = False
+    baseline_path = Path(args.baseline)
+    if args.compare:
+        if baseline_path.exists():
+            with open(baseline_path, "r", encoding="utf-8") as fh:
+                regressions = compare_baseline(summaries, json.load(fh), args.tolerance)
+        else:
+            print(f"No baseline found at {baseline_path}, run with --save-baseline first.\n")
+            missing_baseline = not args.save_baseline
+    if args.save_baseline:
+        save_baseline(baseline_path, summaries, args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"stages": summaries, "pathological": bench.pathological}, fh, indent=2)
+
+    if regressions:
+        return 1
+    # Nothing to compare against must not pass as "no regressions"
+    return 2 if missing_baseline else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calculator pipeline stages")
+    parser.add_argument("--corpus", default=str(CORPUS_FILE), help="Corpus JSON file")
+    parser.add_argument("--tag", action="append", help="Only run corpus entries with this tag (repeatable)")
+    parser.add_argument("--repeat", type=int, default=50, help="Repetitions per input for in-process stages")
+    parser.add_argument("--pool-repeat", type=int, default=3, help="Repetitions per input for worker-pool stages")
+    parser.add_argument("--pool-all", action="store_true", help="Also send fast-path expressions to the worker pool")
+    parser.add_argument("--fuzz", type=int, default=0, help="Number of random expressions to add")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the fuzzer")
+    parser.add_argument("--inline-budget-ms", type=float, default=5.0, help="Flag in-process calls slower than this")
+    parser.add_argument("--pool-budget", type=float, default=0.5, help="Flag pool calls slower than this share of the timeout")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline (exit code 1 on regressions, 2 without a baseline)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a stage counts as regressed")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show calculator log output")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR, force=True)
+
+    try:
+        exit_code = asyncio.run(run(args))
+    finally:
+        calculator_sandbox.shutdown_pool()
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()